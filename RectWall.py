@@ -1,25 +1,51 @@
 import pygame
 import math
+import sys
+from spatial import SpatialHash
+from touch_input import ActionInput
+from scaled_display import ScaledDisplay, anchored
 pygame.init()
 
-# Fenster (volle Bildschirmgröße in Pydroid)
-screen = pygame.display.set_mode((0, 0))
+# RectWall.py [--scale S] [--smooth]
+# Render-Skalierung: 1.0 zeichnet in logischen Pixeln, 0.5 mit einem Viertel davon (schneller);
+# --smooth glättet das Hochskalieren auf den Bildschirm
+args = sys.argv[1:]
+RENDER_SCALE = float(args[args.index("--scale") + 1]) if "--scale" in args else 1.0
+SMOOTH = "--smooth" in args
+
+# Fenster (Vollbild). Alles wird in logischen Pixeln auf mindestens 1080x1920
+# ausgelegt, in Render-Auflösung gezeichnet und von SDL auf die native
+# Auflösung hochskaliert, egal wie groß das Display ist
+display = ScaledDisplay.open((1080, 1920), RENDER_SCALE, SMOOTH)
+screen = display.display
 pygame.display.set_caption("Pygame Touch-Steuerung mit Multitouch & Wand")
 clock = pygame.time.Clock()
+canvas = display.surface
 
 # Spieler
 player = pygame.Rect(100, 100, 50, 50)
 SPEED = 5
 
-# Buttons
-btn_left  = pygame.Rect(50,  1500, 100, 100)
-btn_right = pygame.Rect(250, 1500, 100, 100)
-btn_up    = pygame.Rect(700, 1500, 100, 100)
-btn_down  = pygame.Rect(870, 1500, 100, 100)
+# Buttons und Tasten: beide halten dieselben Aktionen; Berührungen werden in
+# logische Pixel umgerechnet. Links/rechts unten links, hoch/runter unten rechts
+controls = ActionInput(display.size)
+BUTTON = (100, 100)
+buttons = [
+    controls.add_control(anchored(display.size, BUTTON, left=50, bottom=320), "left"),
+    controls.add_control(anchored(display.size, BUTTON, left=250, bottom=320), "right"),
+    controls.add_control(anchored(display.size, BUTTON, right=280, bottom=320), "up"),
+    controls.add_control(anchored(display.size, BUTTON, right=110, bottom=320), "down"),
+]
+controls.bind_key(pygame.K_LEFT, "left")
+controls.bind_key(pygame.K_RIGHT, "right")
+controls.bind_key(pygame.K_UP, "up")
+controls.bind_key(pygame.K_DOWN, "down")
 
 # Wand
 wall = pygame.Rect(500, 500, 200, 200) # For collision
-visual_wall = wall.copy() # For drawing
+visual_wall = wall.copy() # For drawing, pulses in place
+walls = SpatialHash()
+walls.insert(wall)
 
 
 # Coins
@@ -30,47 +56,27 @@ coins = [
     pygame.Rect(900, 600, 25, 25),
     pygame.Rect(500, 300, 25, 25)
 ]
+coin_index = SpatialHash()
+for coin in coins:
+    coin_index.insert(coin)
 
+# Ein Rect für alles, was gezeichnet wird; die Schleife legt keine neuen an
+shown = pygame.Rect(0, 0, 0, 0)
 
-# Aktive Finger (Richtung, ID)
-active_fingers = set()
 
 running = True
 while running:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
-
-        elif event.type == pygame.FINGERDOWN:
-            x = event.x * screen.get_width()
-            y = event.y * screen.get_height()
-
-            if btn_left.collidepoint(x, y):
-                active_fingers.add(("left", event.finger_id))
-            if btn_right.collidepoint(x, y):
-                active_fingers.add(("right", event.finger_id))
-            if btn_up.collidepoint(x, y):
-                active_fingers.add(("up", event.finger_id))
-            if btn_down.collidepoint(x, y):
-                active_fingers.add(("down", event.finger_id))
-
-        elif event.type == pygame.FINGERUP:
-            active_fingers = {f for f in active_fingers if f[1] != event.finger_id}
+        else:
+            # Finger drauf, runter, drüber gleiten und Tasten
+            controls.handle(event)
 
     # Bewegung
-    old_pos = player.copy()
+    old_x, old_y = player.x, player.y
 
-    directions = set(d for d, _ in active_fingers)
-    
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT]:
-        directions.add("left")
-    if keys[pygame.K_RIGHT]:
-        directions.add("right")
-    if keys[pygame.K_UP]:
-        directions.add("up")
-    if keys[pygame.K_DOWN]:
-        directions.add("down")
+    directions = controls.held
 
     if "left" in directions:
         player.x -= SPEED
@@ -82,13 +88,15 @@ while running:
         player.y += SPEED
 
     # Kollision
-    if player.colliderect(wall):
-        player = old_pos  # Zurücksetzen bei Kollision
+    if walls.query_rect(player):
+        # Zurücksetzen bei Kollision
+        player.x = old_x
+        player.y = old_y
 
     # Coin collision
-    for coin in coins[:]:
-        if player.colliderect(coin):
-            coins.remove(coin)
+    for coin in coin_index.query_rect(player):
+        coin_index.remove(coin)
+        coins.remove(coin)
 
     # Magical effect when all coins are collected
     if not coins:
@@ -99,23 +107,24 @@ while running:
         visual_wall.center = wall.center
         wall_color = (138, 43, 226) # Dark purple
     else:
-        visual_wall = wall.copy()
+        visual_wall.update(wall)
         wall_color = (150, 150, 150) # Grey
 
-    # Zeichnen
-    screen.fill((0, 0, 0))
-    pygame.draw.rect(screen, (0, 255, 0), player)   # Spieler
-    pygame.draw.rect(screen, wall_color, visual_wall) # Wand
+    # Zeichnen (in Render-Pixeln)
+    canvas.fill((0, 0, 0))
+    pygame.draw.rect(canvas, (0, 255, 0), display.rect(player, shown))   # Spieler
+    pygame.draw.rect(canvas, wall_color, display.rect(visual_wall, shown)) # Wand
     
     for coin in coins:
-        pygame.draw.rect(screen, (255, 255, 0), coin) # Coin
+        pygame.draw.rect(canvas, (255, 255, 0), display.rect(coin, shown)) # Coin
 
-    pygame.draw.rect(screen, (100, 100, 100), btn_left)
-    pygame.draw.rect(screen, (100, 100, 100), btn_right)
-    pygame.draw.rect(screen, (100, 100, 100), btn_up)
-    pygame.draw.rect(screen, (100, 100, 100), btn_down)
+    for button in buttons:
+        pygame.draw.rect(canvas, (100, 100, 100), display.rect(button.rect, shown))
 
+    display.present()
     pygame.display.flip()
+    controls.frame_presented()
     clock.tick(60)
 
+controls.report()
 pygame.quit()
\ No newline at end of file
@@ -0,0 +1,181 @@
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+import synth
+
+perf_counter = time.perf_counter
+
+
+def open_mixer(frequency=synth.SAMPLE_RATE, buffer=None, size=-16, channels=2):
+    """Make the mixer run at (frequency, size, channels) with buffer frames per chunk.
+
+    Call it before pygame.init(), which opens the mixer with the settings
+    it has by then; pre_init() and init() change nothing once it is open.
+    A mixer some earlier pygame.init() already opened in another format is
+    closed and opened again. Returns pygame.mixer.get_init().
+    """
+    pygame.mixer.pre_init(frequency, size, channels, buffer or 0)
+    current = pygame.mixer.get_init()
+    if current is not None and current != (frequency, size, channels):
+        pygame.mixer.quit()
+        pygame.mixer.init()
+    return pygame.mixer.get_init()
+
+
+class MusicStream:
+    """Plays a generator of float sample blocks on one channel without gaps.
+
+    One block plays while the next waits in the channel's queue; update()
+    renders a new block whenever the queue has been taken. Only two blocks
+    are ever held in memory, however long the music is.
+    """
+
+    def __init__(self, channel, blocks, volume=1.0):
+        self.channel = channel
+        self.blocks = iter(blocks)
+        self.channel.set_volume(volume)
+        self.underruns = 0
+        self.rendered = 0
+        self.finished = False
+        self.update()
+
+    def next_block(self):
+        samples = next(self.blocks, None)
+        if samples is None:
+            self.finished = True
+            return None
+        self.rendered += 1
+        return pygame.sndarray.make_sound(synth.to_pcm(samples))
+
+    def update(self):
+        if self.finished:
+            return
+        channel = self.channel
+        if not channel.get_busy():
+            # Nothing playing: the start, or the game stalled for longer than a block
+            if self.rendered:
+                self.underruns += 1
+            block = self.next_block()
+            if block is None:
+                return
+            channel.play(block)
+        if channel.get_queue() is None:
+            block = self.next_block()
+            if block is not None:
+                channel.queue(block)
+
+    def stop(self):
+        self.channel.stop()
+        self.finished = True
+
+
+class AudioEngine:
+    """Sound effects through a fixed pool of voices, plus streamed music.
+
+    Gameplay calls trigger(name) as often as it likes; update(), once per
+    frame, plays each sound triggered since the last update once, however
+    many times it was asked for. When every voice is busy the quietest
+    claim loses: the lowest-priority, longest-playing voice is stolen if its
+    priority is not above the new sound's, otherwise the new sound is dropped.
+
+    Trigger latency is the time from trigger() to the voice starting, plus
+    the mixer's output buffer, which is where the buffer size setting shows up.
+    buffer is the chunk size the mixer was opened with (see open_mixer());
+    the frequency is read from the open mixer.
+    """
+
+    MUSIC_CHANNEL = 0
+
+    def __init__(self, voices=8, buffer=None, latency_window=1000):
+        pygame.mixer.set_num_channels(voices + 1)
+        pygame.mixer.set_reserved(1)  # keeps Sound.play() elsewhere off the music channel
+        self.music_channel = pygame.mixer.Channel(self.MUSIC_CHANNEL)
+        self.voices = [pygame.mixer.Channel(i + 1) for i in range(voices)]
+        self.voice_priority = [0] * voices
+        self.voice_started = [0.0] * voices
+        self.bank = {}
+        self.pending = {}
+        self.music = None
+
+        self.frequency = pygame.mixer.get_init()[0]
+        self.buffer = buffer
+        self.output_latency = buffer / self.frequency if buffer else 0.0
+        self.latencies = deque(maxlen=latency_window)
+        self.triggers = 0
+        self.played = 0
+        self.coalesced = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def add(self, name, sound, priority=0):
+        self.bank[name] = (sound, priority)
+
+    def trigger(self, name):
+        """Ask for name to play at the next update(); unknown names are ignored"""
+        if name not in self.bank:
+            return
+        self.triggers += 1
+        if name in self.pending:
+            self.coalesced += 1
+        else:
+            self.pending[name] = perf_counter()
+
+    def update(self):
+        if self.music is not None:
+            self.music.update()
+        if not self.pending:
+            return
+        for name, triggered in self.pending.items():
+            sound, priority = self.bank[name]
+            voice = self.free_voice(priority)
+            if voice is None:
+                self.dropped += 1
+                continue
+            now = perf_counter()
+            self.voices[voice].play(sound)
+            self.voice_priority[voice] = priority
+            self.voice_started[voice] = now
+            self.played += 1
+            self.latencies.append(now - triggered)
+        self.pending.clear()
+
+    def free_voice(self, priority):
+        """Index of an idle voice, else of the voice to steal for priority, else None"""
+        victim = None
+        for i, channel in enumerate(self.voices):
+            if not channel.get_busy():
+                return i
+            if self.voice_priority[i] <= priority and (
+                    victim is None or (self.voice_priority[i], self.voice_started[i])
+                    < (self.voice_priority[victim], self.voice_started[victim])):
+                victim = i
+        if victim is not None:
+            self.stolen += 1
+        return victim
+
+    def play_music(self, blocks, volume=1.0):
+        """Stream music from an iterable of float sample blocks, e.g. synth.stream_melody()"""
+        if self.music is not None:
+            self.music.stop()
+        self.music = MusicStream(self.music_channel, blocks, volume)
+
+    def latency_stats(self):
+        """(mean, 95th percentile, max) trigger latency in seconds, output buffer included"""
+        if not self.latencies:
+            return (self.output_latency,) * 3
+        values = np.fromiter(self.latencies, dtype=np.float64) + self.output_latency
+        return float(values.mean()), float(np.percentile(values, 95)), float(values.max())
+
+    def report(self):
+        mean, p95, worst = self.latency_stats()
+        buffer = (f"buffer {self.buffer} frames at {self.frequency} Hz = {self.output_latency * 1000:.1f} ms"
+                  if self.buffer else f"{self.frequency} Hz, buffer unknown")
+        print(f"Audio: {self.triggers} triggers, {self.played} played, {self.coalesced} coalesced, "
+              f"{self.stolen} stolen, {self.dropped} dropped")
+        print(f"Audio latency ({buffer}): mean {mean * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms, "
+              f"max {worst * 1000:.2f} ms")
+        if self.music is not None:
+            print(f"Music: {self.music.rendered} blocks streamed, {self.music.underruns} underruns")
@@ -0,0 +1,90 @@
+"""Play many headless platformer_v2 episodes in parallel across CPU cores.
+
+Usage:  python batch_sim.py [episodes] [ticks] [workers]
+"""
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import platformer_v2
+
+EpisodeResult = namedtuple('EpisodeResult', ['seed', 'score', 'coins', 'deaths', 'ticks', 'ticks_to_win'])
+
+
+def random_policy(state, rng, previous):
+    """Hold a direction/jump combination for a while, then pick a new one"""
+    if rng.random() < 0.05:
+        return platformer_v2.Inputs(rng.random() < 0.4, rng.random() < 0.5, rng.random() < 0.3, False)
+    return previous
+
+
+def run_episode(seed, ticks, policy=random_policy, level_factory=None):
+    """Play one game for up to ticks ticks, stopping early on a win"""
+    rng = random.Random(seed)
+    level = level_factory(seed) if level_factory is not None else None
+    state = platformer_v2.new_game(level)
+    inputs = platformer_v2.NO_INPUT
+    deaths = 0
+    ticks_to_win = None
+
+    for tick in range(ticks):
+        inputs = policy(state, rng, inputs)
+        state, events = platformer_v2.step(state, inputs)
+        deaths += events.count("death") + events.count("fall")
+        if state.game_won:
+            ticks_to_win = tick + 1
+            break
+
+    return EpisodeResult(seed, state.score, state.coins.collected_count, deaths, state.tick, ticks_to_win)
+
+
+def run_chunk(seeds, ticks, policy, level_factory):
+    return [run_episode(seed, ticks, policy, level_factory) for seed in seeds]
+
+
+def run_batch(seeds, ticks, workers=None, policy=random_policy, level_factory=None):
+    """Run one episode per seed, spread over a process pool.
+
+    policy and level_factory must be module-level functions so they can be
+    pickled into the workers. Results come back in seed order.
+    """
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return run_chunk(seeds, ticks, policy, level_factory)
+
+    # A few chunks per worker keeps the pool busy without per-episode IPC
+    chunk_size = max(1, len(seeds) // (workers * 4))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_chunk, chunk, ticks, policy, level_factory) for chunk in chunks]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+def summarize(results, elapsed):
+    won = [r.ticks_to_win for r in results if r.ticks_to_win is not None]
+    print(f"{len(results)} episodes in {elapsed:.2f} s ({len(results) / elapsed:.1f} episodes/s)")
+    print(f"mean score {sum(r.score for r in results) / len(results):.1f}, "
+          f"mean coins {sum(r.coins for r in results) / len(results):.1f}, "
+          f"mean deaths {sum(r.deaths for r in results) / len(results):.1f}, "
+          f"won {len(won)}" + (f" (mean {sum(won) / len(won):.0f} ticks)" if won else ""))
+
+
+def main():
+    episodes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    start = time.perf_counter()
+    results = run_batch(range(episodes), ticks, workers)
+    summarize(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
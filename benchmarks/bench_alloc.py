@@ -0,0 +1,85 @@
+"""Steady-state allocations of platformer_v2's frame: physics ticks, interpolated drawing and the profiler.
+
+Run from the repository root:  python benchmarks/bench_alloc.py [frames]
+
+Play is random, with a 144 Hz display over the 60 Hz simulation as in
+the game. After a warm-up, in which background tiles, sprites and text get
+baked, everything alive is frozen as main() does, and profiler.AllocationMeter
+watches every frame: objects is how much the collector's generation 0 count
+grew, which is what triggers collections. A second run under tracemalloc
+gives the bytes a frame allocates at its peak, temporaries included.
+"""
+import gc
+import os
+import random
+import sys
+from collections import defaultdict
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import platformer_v2
+from profiler import AllocationMeter
+from timestep import FixedTimestep
+
+WARMUP = 600
+RATE = 144
+
+
+def play(frames, meter):
+    random.seed(0)
+    rng = random.Random(1)
+    state = platformer_v2.new_game()
+    background = platformer_v2.create_background(state)
+    screen = pygame.display.get_surface()
+    timestep = FixedTimestep(platformer_v2.FPS)
+    interpolation = platformer_v2.Interpolation(state)
+    # Stands in for pygame.key.get_pressed()
+    keys = defaultdict(bool)
+    profiler = platformer_v2.profiler
+    profiler.enabled = True
+
+    for frame in range(WARMUP + frames):
+        if frame == WARMUP:
+            gc.collect()
+            gc.freeze()
+            meter.start()
+        timestep.advance(1 / RATE)
+        for _ in range(timestep.steps()):
+            if rng.random() < 0.05:
+                keys[pygame.K_LEFT] = rng.random() < 0.3
+                keys[pygame.K_RIGHT] = rng.random() < 0.6
+                keys[pygame.K_SPACE] = rng.random() < 0.3
+            interpolation.capture(state)
+            state, _ = platformer_v2.step(state, platformer_v2.read_inputs(keys))
+        platformer_v2.draw_scene(screen, state, background, interpolation, timestep.alpha)
+        profiler.end_frame()
+        meter.end_frame()
+    meter.stop()
+    gc.unfreeze()
+    profiler.enabled = False
+    return state
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    pygame.init()
+    pygame.display.set_mode((platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT))
+    platformer_v2.bake_sprites()
+
+    meter = AllocationMeter(window=frames)
+    state = play(frames, meter)
+    traced = AllocationMeter(window=frames, trace=True)
+    play(frames, traced)
+
+    print(f"{frames} frames at {RATE} Hz after {WARMUP} warm-up frames, score {state.score}")
+    print(f"{'per frame':<16}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}")
+    for name, mean, p50, p95, worst in meter.report() + traced.report()[2:]:
+        print(f"{name:<16}{mean:>9.2f}{p50:>9.2f}{p95:>9.2f}{worst:>9.2f}")
+    print(f"collections: {meter.total_collections}, longest pause {meter.max_pause * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
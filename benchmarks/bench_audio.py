@@ -0,0 +1,93 @@
+"""Startup cost of the platformer_v2 sound effects: per-sample loops vs array math,
+and synthesis vs the on-disk sound cache. Music is streamed while the game
+runs (synth.stream_melody), so it costs nothing at startup.
+
+Run from the repository root:  python benchmarks/bench_audio.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import pygame
+import platformer_v2
+import synth
+from sound_cache import SoundCache
+
+SAMPLE_RATE = 22050
+
+# Reference implementations as they were before synth.py, one sample at a time
+
+def legacy_sweep(duration, start_freq, end_freq, fade):
+    frames = int(duration * SAMPLE_RATE)
+    data = np.zeros(frames)
+    for i in range(frames):
+        freq = start_freq + (end_freq - start_freq) * (i / frames)
+        data[i] = 1.5 * np.sin(2 * np.pi * freq * i / SAMPLE_RATE)
+        data[i] *= (1 - i / frames) * fade
+    return data
+
+
+def legacy_arpeggio(frequencies, amplitude, depth):
+    frames = int(0.4 * SAMPLE_RATE)
+    data = np.zeros(frames)
+    for i, freq in enumerate(frequencies):
+        start_frame = i * frames // len(frequencies)
+        end_frame = (i + 1) * frames // len(frequencies)
+        for j in range(start_frame, end_frame):
+            data[j] = amplitude * np.sin(2 * np.pi * freq * j / SAMPLE_RATE)
+            data[j] *= (1 - (j - start_frame) / (end_frame - start_frame) * depth)
+    return data
+
+
+LEGACY = {
+    "jump": lambda: legacy_sweep(0.2, 300, 600, 1.0),
+    "coin": lambda: legacy_arpeggio([659.25, 783.99, 1046.50], 1.2, 0.3),
+    "death": lambda: legacy_sweep(0.6, 500, 80, 0.9),
+    "enemy_defeat": lambda: legacy_arpeggio([523.25, 659.25, 783.99, 1046.50], 1.0, 0.2),
+}
+
+CURRENT = {
+    "jump": platformer_v2.create_jump_sound,
+    "coin": platformer_v2.create_coin_sound,
+    "death": platformer_v2.create_death_sound,
+    "enemy_defeat": platformer_v2.create_enemy_defeat_sound,
+}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    pygame.mixer.pre_init(frequency=SAMPLE_RATE, size=-16, channels=2, buffer=128)
+    pygame.init()
+    total_before = total_after = 0.0
+    print(f"{'sound':<14}{'before (ms)':>12}{'after (ms)':>12}{'speedup':>10}  match")
+    for name in CURRENT:
+        legacy, before = timed(lambda: synth.to_pcm(LEGACY[name]()))
+        sound, after = timed(CURRENT[name])
+        pcm = pygame.sndarray.array(sound)
+        match = np.abs(pcm.astype(np.int32) - legacy.astype(np.int32)).max() <= 1
+        total_before += before
+        total_after += after
+        print(f"{name:<14}{before * 1000:>12.1f}{after * 1000:>12.1f}{before / after:>9.0f}x  {match}")
+    print(f"{'total':<14}{total_before * 1000:>12.1f}{total_after * 1000:>12.1f}{total_before / total_after:>9.0f}x")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label in ("cold cache", "warm cache"):
+            cache = SoundCache(directory)
+            _, seconds = timed(lambda: [create(cache) for create in CURRENT.values()])
+            print(f"\n{label}: {seconds * 1000:.1f} ms")
+            cache.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Episodes per second of batch_sim.run_batch as the worker count grows.
+
+Run from the repository root:  python benchmarks/bench_batch.py [episodes] [ticks]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import batch_sim
+
+
+def main():
+    episodes = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+
+    baseline = None
+    print(f"{episodes} episodes x {ticks} ticks on {cores} cores")
+    for workers in counts:
+        start = time.perf_counter()
+        batch_sim.run_batch(range(episodes), ticks, workers)
+        rate = episodes / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{workers:>3} workers {rate:>10.1f} episodes/s  scaling {rate / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
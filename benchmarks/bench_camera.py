@@ -0,0 +1,67 @@
+"""Frame time of platformer_v2 on wide scrolling levels as the off-screen entity count grows.
+
+Run from the repository root:  python benchmarks/bench_camera.py [frames]
+
+Each level has the same density around the player; only the width (and so
+the number of platforms, enemies and coins outside the view) changes.
+With culling the per-frame cost should stay flat.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import platformer_v2
+from platformer_v2 import Coin, Enemy, Platform
+
+SEGMENT = 400  # world width holding one platform, one enemy and four coins
+
+
+def wide_level(width, seed=1):
+    rng = random.Random(seed)
+    ground_y = platformer_v2.SCREEN_HEIGHT - 40
+    platforms = [Platform(0, ground_y, width, 40, 0)]
+    enemies = []
+    coins = []
+    for i, left in enumerate(range(SEGMENT, width - SEGMENT, SEGMENT)):
+        y = rng.randrange(300, 500, 20)
+        platforms.append(Platform(left, y, 160, 20, i % 99 + 1))
+        enemies.append(Enemy(left + 40, y - 25, left, left + 160))
+        for j in range(4):
+            coins.append(Coin(left + 20 + j * 35, y - 30))
+    return platforms, enemies, coins
+
+
+def run(level, frames, screen):
+    state = platformer_v2.new_game(level)
+    background = platformer_v2.create_background(state)
+    # Run right, hopping, so the camera scrolls the whole time
+    inputs = [platformer_v2.Inputs(False, True, tick % 40 < 3, False) for tick in range(frames)]
+    start = time.perf_counter()
+    for tick_inputs in inputs:
+        state, _ = platformer_v2.step(state, tick_inputs)
+        platformer_v2.draw_scene(screen, state, background)
+    return (time.perf_counter() - start) / frames, state, background
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    pygame.init()
+    screen = pygame.display.set_mode((platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT))
+    platformer_v2.bake_sprites()
+
+    print(f"{'level width':>12}{'entities':>10}{'ms/frame':>10}{'camera x':>10}{'tiles baked':>12}")
+    for width in (4000, 40000, 400000, 4000000):
+        level = wide_level(width)
+        per_frame, state, background = run(level, frames, screen)
+        entities = len(level[0]) + len(level[1]) + len(level[2])
+        print(f"{width:>12,}{entities:>10,}{per_frame * 1000:>10.3f}{state.camera.rect.x:>10}{background.bakes:>12}")
+
+
+if __name__ == "__main__":
+    main()
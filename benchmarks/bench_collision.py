@@ -0,0 +1,53 @@
+"""Collision queries on large generated levels: linear colliderect scan vs SpatialHash.
+
+Run from the repository root:  python benchmarks/bench_collision.py [objects]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+from spatial import SpatialHash
+
+WORLD_WIDTH = 50000
+WORLD_HEIGHT = 600
+QUERIES = 2000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(1)
+    rects = [
+        pygame.Rect(rng.randrange(WORLD_WIDTH), rng.randrange(WORLD_HEIGHT), rng.randrange(20, 200), 20)
+        for _ in range(count)
+    ]
+    probes = [
+        pygame.Rect(rng.randrange(WORLD_WIDTH), rng.randrange(WORLD_HEIGHT), 30, 40)
+        for _ in range(QUERIES)
+    ]
+
+    start = time.perf_counter()
+    index = SpatialHash()
+    for rect in rects:
+        index.insert(rect)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    linear_hits = [[rect for rect in rects if probe.colliderect(rect)] for probe in probes]
+    linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed_hits = [index.query_rect(probe) for probe in probes]
+    indexed = time.perf_counter() - start
+
+    assert linear_hits == indexed_hits
+    print(f"{count} rects, {QUERIES} queries, index built in {build * 1000:.1f} ms")
+    print(f"linear scan  {linear / QUERIES * 1e6:>10.1f} us/query")
+    print(f"spatial hash {indexed / QUERIES * 1e6:>10.1f} us/query  ({linear / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
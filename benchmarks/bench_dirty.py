@@ -0,0 +1,104 @@
+"""Frame time and pixels pushed per frame: full redraw + flip vs dirty-rect rendering.
+
+Run from the repository root:  python benchmarks/bench_dirty.py [frames]
+
+Both games are driven by scripted input with the frame limiter removed.
+With the dummy video driver the copy to the display is free, so the
+pixels column is the number to look at for real framebuffers.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import platformer
+import snake_game
+
+
+class ScriptedKeys:
+    """pygame.key.get_pressed() stand-in: run right and left in turns, hopping"""
+
+    def __init__(self):
+        self.tick = 0
+
+    def __getitem__(self, key):
+        if key == pygame.K_RIGHT:
+            return (self.tick // 90) % 2 == 0
+        if key == pygame.K_LEFT:
+            return (self.tick // 90) % 2 == 1
+        if key == pygame.K_SPACE:
+            return self.tick % 30 < 2
+        return False
+
+
+class FrameLimit(Exception):
+    pass
+
+
+def run_platformer(dirty, frames):
+    keys = ScriptedKeys()
+    renderers = []
+
+    class Clock:
+        def tick(self, fps):
+            keys.tick += 1
+            if keys.tick >= frames:
+                raise FrameLimit
+            return 1000 / fps
+
+    class Renderer(platformer.DirtyRenderer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            renderers.append(self)
+
+    get_pressed, clock, renderer = pygame.key.get_pressed, pygame.time.Clock, platformer.DirtyRenderer
+    pygame.key.get_pressed, pygame.time.Clock, platformer.DirtyRenderer = lambda: keys, Clock, Renderer
+    start = time.perf_counter()
+    try:
+        # One physics tick per frame, as the scripted keys expect
+        platformer.main(dirty, render_fps=platformer.FPS)
+    except FrameLimit:
+        pass
+    finally:
+        pygame.key.get_pressed, pygame.time.Clock, platformer.DirtyRenderer = get_pressed, clock, renderer
+    return time.perf_counter() - start, renderers[0] if renderers else None
+
+
+def run_snake(dirty, frames):
+    random.seed(3)
+    rng = random.Random(5)
+    game = snake_game.Game(dirty=dirty)
+    start = time.perf_counter()
+    for tick in range(frames):
+        if tick % 7 == 0:
+            game.snake.change_direction(rng.choice([(0, 1), (0, -1), (1, 0), (-1, 0)]))
+        if game.game_over:
+            game.restart_game()
+        game.update()
+        game.draw()
+    return time.perf_counter() - start, game.renderer
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    pygame.init()
+    print(f"{'game':<12}{'mode':<8}{'ms/frame':>10}{'pixels/frame':>14}{'full flips':>12}")
+    for name, run in (("platformer", run_platformer), ("snake", run_snake)):
+        for dirty in (False, True):
+            elapsed, renderer = run(dirty, frames)
+            screen = pygame.display.get_surface()
+            if renderer:
+                pixels, flips = renderer.pixels / renderer.frames, renderer.full_updates
+            else:
+                pixels, flips = screen.get_width() * screen.get_height(), frames
+            print(f"{name:<12}{'dirty' if dirty else 'full':<8}{elapsed / frames * 1000:>10.3f}"
+                  f"{pixels:>14,.0f}{flips:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Enemy/coin tick cost: one Python object per entity vs the NumPy entity store.
+
+Run from the repository root:  python benchmarks/bench_entities.py [entities]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+from entity_store import CoinStore, EnemyStore
+
+TICKS = 200
+
+
+class LegacyEnemy:
+    """Per-object patrol as platformer_v2 did it before the entity store"""
+
+    def __init__(self, x, y, left, right):
+        self.x, self.y = x, y
+        self.width = self.height = 25
+        self.speed, self.direction = 2, 1
+        self.platform_left, self.platform_right = left, right
+        self.rect = pygame.Rect(x, y, 25, 25)
+
+    def update(self):
+        self.x += self.speed * self.direction
+        if self.x <= self.platform_left or self.x + self.width >= self.platform_right:
+            self.direction *= -1
+        self.rect.x = self.x
+        self.rect.y = self.y
+
+
+class LegacyCoin:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 20, 20)
+        self.collected = False
+
+
+def legacy_tick(player, enemies, coins):
+    hits = 0
+    for enemy in enemies:
+        enemy.update()
+        if player.colliderect(enemy.rect):
+            hits += 1
+    for coin in coins:
+        if not coin.collected and player.colliderect(coin.rect):
+            hits += 1
+    return hits + sum(1 for coin in coins if coin.collected)
+
+
+def store_tick(player, enemies, coins):
+    enemies.update()
+    return len(enemies.overlapping(player)) + len(coins.overlapping(player)) + coins.collected_count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = random.Random(1)
+    patrols = []
+    for _ in range(count):
+        left = rng.randrange(0, 100000, 10)
+        patrols.append((left + 20, rng.randrange(600), left, left + rng.randrange(80, 300)))
+    spots = [(rng.randrange(100000), rng.randrange(600)) for _ in range(count)]
+    player = pygame.Rect(5000, 300, 30, 40)
+
+    legacy_enemies = [LegacyEnemy(*patrol) for patrol in patrols]
+    legacy_coins = [LegacyCoin(*spot) for spot in spots]
+    enemies = EnemyStore.from_enemies(legacy_enemies)
+    coins = CoinStore([x for x, _ in spots], [y for _, y in spots], [20] * count, [20] * count)
+
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        legacy_tick(player, legacy_enemies, legacy_coins)
+    legacy = (time.perf_counter() - start) / TICKS
+
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        store_tick(player, enemies, coins)
+    store = (time.perf_counter() - start) / TICKS
+
+    assert [round(e.x) for e in legacy_enemies] == enemies.x.round().astype(int).tolist()
+    print(f"{count} enemies + {count} coins")
+    print(f"python objects {legacy * 1000:>8.3f} ms/tick")
+    print(f"entity store   {store * 1000:>8.3f} ms/tick  ({legacy / store:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
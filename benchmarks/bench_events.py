@@ -0,0 +1,87 @@
+"""Cost of logging gameplay events to a slow console: print() in the loop vs EventBus + AsyncSink.
+
+Run from the repository root:  python benchmarks/bench_events.py [ticks] [baud]
+
+The console is simulated as a stream whose writes take as long as the
+bytes would at the given baud rate on a serial line (10 bits per byte).
+Ticks run platformer_v2.step() with a scripted runner, so events come in
+the bursts real play produces; frame time here is simulation plus logging.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import platformer_v2
+from event_bus import AsyncSink, EventBus, GameEvent, stream_writer
+
+
+class SerialConsole:
+    def __init__(self, baud):
+        self.bytes_per_second = baud / 10
+        self.written = 0
+
+    def write(self, text):
+        time.sleep(len(text) / self.bytes_per_second)
+        self.written += len(text)
+
+    def flush(self):
+        pass
+
+
+def script(tick):
+    return platformer_v2.Inputs((tick // 120) % 2 == 1, (tick // 120) % 2 == 0, tick % 40 < 3, False)
+
+
+def run(ticks, log):
+    """Per-tick times in seconds, with log(state, events) called after every step"""
+    state = platformer_v2.new_game()
+    times = []
+    for tick in range(ticks):
+        start = time.perf_counter()
+        state, events = platformer_v2.step(state, script(tick))
+        log(state, events)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summary(label, times, console):
+    times = sorted(times)
+    print(f"{label:<14}{sum(times) / len(times) * 1000:>10.3f}{times[len(times) * 99 // 100] * 1000:>10.3f}"
+          f"{times[-1] * 1000:>10.3f}{sum(t > 1 / 60 for t in times):>10}{console.written:>10,}")
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 1200
+    baud = int(sys.argv[2]) if len(sys.argv) > 2 else 9600
+    print(f"{ticks} ticks, console at {baud} baud")
+    print(f"{'':<14}{'mean ms':>10}{'p99 ms':>10}{'max ms':>10}{'>16.7 ms':>10}{'bytes':>10}")
+
+    console = SerialConsole(baud)
+
+    def print_events(state, events):
+        for name in events:
+            print(f"{name.upper()} SOUND TRIGGERED!", file=console)
+
+    summary("print()", run(ticks, print_events), console)
+
+    console = SerialConsole(baud)
+    bus = EventBus()
+    sink = bus.subscribe(AsyncSink(stream_writer(console)))
+
+    def publish_events(state, events):
+        player = state.player
+        for name in events:
+            bus.publish(GameEvent(name, state.tick, player.x, player.y, state.score))
+
+    times = run(ticks, publish_events)
+    sink.close(timeout=60)
+    summary("bus + sink", times, console)
+    print(f"sink: {sink.written} events in {sink.batches} writes, {sink.lost} lost")
+
+
+if __name__ == "__main__":
+    main()
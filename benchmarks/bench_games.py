@@ -0,0 +1,391 @@
+"""Headless benchmark suite: each game's own main loop, driven by scripted input.
+
+Run from the repository root:
+    python benchmarks/bench_games.py [--frames N] [--games platformer,snake] [--out results.json]
+    python benchmarks/bench_games.py --compare baseline.json [--threshold 0.15]
+
+Every game runs in fresh processes under SDL's dummy video and audio
+drivers: one pass for time, one under tracemalloc for memory. The frame
+clock is replaced so nothing sleeps; input comes from a fixed script.
+
+Startup is the time from importing the game to its first frame. A frame's
+update is everything before its first drawing call, its render everything
+from there to the end of the frame. alloc KB is the most memory a frame
+holds on top of what it started with; net blocks is what it keeps.
+--compare exits with status 1 if any metric got worse than the baseline
+by more than the threshold.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import resource
+import runpy
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import pygame
+
+GAMES = ("platformer", "platformer_v2", "snake_game", "RectWall")
+
+# name, column label, smallest change worth reporting
+METRICS = (
+    ("startup_ms", "startup ms", 5.0),
+    ("update_ms", "update ms", 0.02),
+    ("render_ms", "render ms", 0.02),
+    ("frame_ms", "frame ms", 0.02),
+    ("frame_p95_ms", "p95 ms", 0.05),
+    ("peak_rss_mb", "RSS MB", 2.0),
+    ("peak_traced_mb", "traced MB", 0.5),
+    ("alloc_kb_per_frame", "alloc KB", 1.0),
+    ("net_blocks_per_frame", "net blocks", 1.0),
+    ("gc_collections", "GCs", 2.0),
+    ("gc_max_pause_ms", "GC max ms", 0.5),
+)
+
+
+class FramesDone(BaseException):
+    """Raised from the frame clock to leave a game's loop; not an Exception so games can't swallow it"""
+
+
+class Keys:
+    def __init__(self, pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+def platformer_script(frame):
+    """Run right and left in turns, hopping"""
+    pressed = {pygame.K_RIGHT if (frame // 90) % 2 == 0 else pygame.K_LEFT}
+    if frame % 30 < 2:
+        pressed.add(pygame.K_SPACE)
+    return pressed, []
+
+
+# (key, ticks until the next turn): a loop around the lower right of the board
+SNAKE_LOOP = ((pygame.K_RIGHT, 16), (pygame.K_DOWN, 12), (pygame.K_LEFT, 16), (pygame.K_UP, 12))
+
+
+def snake_script(frame):
+    """Drive round a fixed loop, and ask for a restart now and then in case the snake died"""
+    events = []
+    position = frame % sum(ticks for _, ticks in SNAKE_LOOP)
+    for key, ticks in SNAKE_LOOP:
+        if position == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+        position -= ticks
+    if frame % 30 == 29:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    return set(), events
+
+
+RECTWALL_KEYS = (pygame.K_DOWN, pygame.K_RIGHT, pygame.K_UP, pygame.K_LEFT)
+
+
+def rectwall_script(frame):
+    """Wander around with the arrow keys while a finger taps the screen"""
+    key = RECTWALL_KEYS[frame // 70 % 4]
+    events = []
+    # RectWall reads keys as events, not by polling
+    if frame % 70 == 0:
+        if frame:
+            events.append(pygame.event.Event(pygame.KEYUP, key=RECTWALL_KEYS[(frame // 70 - 1) % 4]))
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+    if frame % 20 == 0:
+        events.append(pygame.event.Event(pygame.FINGERDOWN, x=0.1, y=0.9, finger_id=frame % 3, touch_id=0))
+    elif frame % 20 == 10:
+        events.append(pygame.event.Event(pygame.FINGERUP, x=0.1, y=0.9, finger_id=(frame - 10) % 3, touch_id=0))
+    return {key}, events
+
+
+# The platformers draw at their own rate between physics ticks; one frame per tick
+# keeps the frame scripts and the numbers comparable with runs before that
+
+def start_platformer():
+    import platformer
+    platformer.main(render_fps=platformer.FPS)
+
+
+def start_platformer_v2():
+    import platformer_v2
+    platformer_v2.main(render_fps=platformer_v2.FPS)
+
+
+def start_snake_game():
+    import snake_game
+    snake_game.Game().run()
+
+
+def start_rectwall():
+    runpy.run_path(os.path.join(ROOT, "RectWall.py"), run_name="__main__")
+
+
+SCRIPTS = {
+    "platformer": (start_platformer, platformer_script),
+    "platformer_v2": (start_platformer_v2, platformer_script),
+    "snake_game": (start_snake_game, snake_script),
+    "RectWall": (start_rectwall, rectwall_script),
+}
+
+
+class Driver:
+    """Stands in for the clock, keyboard, event queue and screen while a game runs.
+
+    A frame starts when the game asks for events and ends at clock.tick().
+    The screen handed to the game is an off-screen copy of the display
+    whose drawing methods, like pygame.draw, note when rendering starts.
+    """
+
+    def __init__(self, frames, script, trace_memory=False):
+        self.frames = frames
+        self.script = script
+        self.trace_memory = trace_memory
+        self.frame = 0
+        self.started = None
+        self.first_frame = None
+        self.frame_start = None
+        self.render_start = None
+        self.pressed = set()
+        self.updates = []
+        self.renders = []
+        self.allocs = []
+        self.blocks = []
+        self.gc_pauses = []
+        self.gc_start = 0.0
+
+    def mark_render(self):
+        if self.render_start is None and self.frame_start is not None:
+            self.render_start = time.perf_counter()
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        if self.first_frame is None:
+            self.first_frame = now
+        self.frame_start = now
+        self.render_start = None
+        self.pressed, events = self.script(self.frame)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self.traced_start = tracemalloc.get_traced_memory()[0]
+        self.blocks_start = sys.getallocatedblocks()
+        return events
+
+    def end_frame(self):
+        now = time.perf_counter()
+        render_start = self.render_start or now
+        self.updates.append(render_start - self.frame_start)
+        self.renders.append(now - render_start)
+        self.blocks.append(sys.getallocatedblocks() - self.blocks_start)
+        if self.trace_memory:
+            self.allocs.append(tracemalloc.get_traced_memory()[1] - self.traced_start)
+        self.frame += 1
+        self.frame_start = None
+        if self.frame >= self.frames:
+            raise FramesDone
+
+    def on_gc(self, phase, info):
+        if phase == "start":
+            self.gc_start = time.perf_counter()
+        elif self.frame_start is not None:
+            self.gc_pauses.append(time.perf_counter() - self.gc_start)
+
+    @contextlib.contextmanager
+    def patched(self):
+        driver = self
+
+        class Clock:
+            def tick(self, framerate=0):
+                driver.end_frame()
+                return 1000 / framerate if framerate else 16
+
+            def get_fps(self):
+                return 0.0
+
+        def counting(fn):
+            def wrapper(*args, **kwargs):
+                driver.mark_render()
+                return fn(*args, **kwargs)
+            return wrapper
+
+        class Screen(pygame.Surface):
+            fill = counting(pygame.Surface.fill)
+            blit = counting(pygame.Surface.blit)
+            blits = counting(pygame.Surface.blits)
+
+        screen = None
+        set_mode = pygame.display.set_mode
+        get_surface = pygame.display.get_surface
+
+        def harness_set_mode(*args, **kwargs):
+            nonlocal screen
+            display = set_mode(*args, **kwargs)
+            screen = Screen(display.get_size(), 0, display)
+            return screen
+
+        def harness_get_surface():
+            return screen if screen is not None else get_surface()
+
+        def events(*args, **kwargs):
+            pygame.event.pump()
+            return driver.begin_frame()
+
+        saved = [(pygame.time, "Clock"), (pygame.key, "get_pressed"), (pygame.event, "get"),
+                 (pygame.display, "set_mode"), (pygame.display, "get_surface")]
+        saved += [(pygame.draw, name) for name in ("rect", "line", "lines", "circle", "ellipse", "polygon")]
+        originals = [getattr(module, name) for module, name in saved]
+        pygame.time.Clock = Clock
+        pygame.key.get_pressed = lambda: Keys(driver.pressed)
+        pygame.event.get = events
+        pygame.display.set_mode = harness_set_mode
+        pygame.display.get_surface = harness_get_surface
+        for module, name in saved[5:]:
+            setattr(module, name, counting(getattr(module, name)))
+        gc.callbacks.append(self.on_gc)
+        try:
+            yield
+        finally:
+            gc.callbacks.remove(self.on_gc)
+            for (module, name), original in zip(saved, originals):
+                setattr(module, name, original)
+
+    def run(self, start):
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), self.patched():
+            self.started = time.perf_counter()
+            try:
+                start()
+            except FramesDone:
+                pass
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def worker(game, frames, mode):
+    """Run one game in this process and print its metrics as a JSON line"""
+    start, script = SCRIPTS[game]
+    pygame.init()
+    if mode == "memory":
+        tracemalloc.start()
+        driver = Driver(frames, script, trace_memory=True)
+        driver.run(start)
+        result = {
+            "peak_traced_mb": tracemalloc.get_traced_memory()[1] / 2**20,
+            "alloc_kb_per_frame": statistics.mean(driver.allocs) / 1024,
+        }
+        tracemalloc.stop()
+    else:
+        driver = Driver(frames, script)
+        driver.run(start)
+        frame_times = [u + r for u, r in zip(driver.updates, driver.renders)]
+        result = {
+            "startup_ms": (driver.first_frame - driver.started) * 1000,
+            "update_ms": statistics.median(driver.updates) * 1000,
+            "render_ms": statistics.median(driver.renders) * 1000,
+            "frame_ms": statistics.median(frame_times) * 1000,
+            "frame_p95_ms": percentile(frame_times, 0.95) * 1000,
+            # Linux reports KB
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "net_blocks_per_frame": statistics.mean(driver.blocks),
+            "gc_collections": len(driver.gc_pauses),
+            "gc_max_pause_ms": max(driver.gc_pauses, default=0.0) * 1000,
+        }
+    result["frames"] = driver.frame
+    print(json.dumps(result))
+
+
+def run_game(game, frames):
+    metrics = {}
+    for mode in ("time", "memory"):
+        done = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", game, str(frames), mode],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if done.returncode != 0:
+            raise RuntimeError(f"{game} ({mode}) failed:\n{done.stderr}")
+        # Games may still be writing logs from other threads; the result is the last JSON line
+        lines = [line for line in done.stdout.splitlines() if line.startswith("{")]
+        metrics.update(json.loads(lines[-1]))
+    return metrics
+
+
+def run_suite(games, frames):
+    return {
+        "frames": frames,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "games": {game: run_game(game, frames) for game in games},
+    }
+
+
+def print_table(results):
+    print(f"{'game':<15}" + "".join(f"{label:>12}" for _, label, _ in METRICS))
+    for game, metrics in results["games"].items():
+        print(f"{game:<15}" + "".join(f"{metrics.get(name, float('nan')):>12.3f}" for name, _, _ in METRICS))
+
+
+def compare(results, baseline, threshold):
+    """Lines describing every metric that got worse than baseline; all metrics are lower-is-better"""
+    regressions = []
+    for game, metrics in results["games"].items():
+        old_metrics = baseline["games"].get(game, {})
+        for name, label, floor in METRICS:
+            if name not in metrics or name not in old_metrics:
+                continue
+            old, new = old_metrics[name], metrics[name]
+            if new - old > floor and new > old * (1 + threshold):
+                change = f"+{(new / old - 1) * 100:.0f}%" if old else "new"
+                regressions.append(f"{game}: {label} {old:.3f} -> {new:.3f} ({change})")
+    return regressions
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--worker":
+        worker(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+        return
+
+    parser = argparse.ArgumentParser(description="Headless benchmarks for every game in the repository")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--games", default=",".join(GAMES), help="comma-separated subset of " + ", ".join(GAMES))
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a results file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown, 0.15 = 15%%")
+    args = parser.parse_args()
+
+    games = [game for game in args.games.split(",") if game]
+    unknown = set(games) - set(GAMES)
+    if unknown:
+        parser.error(f"unknown games: {', '.join(sorted(unknown))}")
+
+    results = run_suite(games, args.frames)
+    print_table(results)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.compare} (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""platformer_v2 drawn at different display rates over a 60 Hz simulation, with and without interpolation.
+
+Run from the repository root:  python benchmarks/bench_interp.py [seconds]
+
+Frame times are simulated, so every rate plays the same game time with
+the same inputs. Physics ticks per game second should stay at 60 whatever
+the display does. "judder" is for a steady walk to the right: the spread,
+in px, of how far the player appears to move from one frame to the next.
+Even motion keeps it near 1 (rounding); a display faster than the physics
+shows 0 px and 5 px steps without interpolation.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import platformer_v2
+from timestep import FixedTimestep
+
+RATES = (30, 60, 120, 144, 240)
+
+
+def run(rate, seconds, interpolate):
+    """(ticks per game second, physics ms per game second, ms per drawn frame) for random play"""
+    random.seed(0)
+    rng = random.Random(1)
+    state = platformer_v2.new_game()
+    background = platformer_v2.create_background(state)
+    screen = pygame.Surface((platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT))
+    timestep = FixedTimestep(platformer_v2.FPS)
+    interpolation = platformer_v2.Interpolation(state)
+    inputs = platformer_v2.NO_INPUT
+
+    ticks = 0
+    physics = render = 0.0
+    frames = int(seconds * rate)
+    for _ in range(frames):
+        timestep.advance(1 / rate)
+        start = time.perf_counter()
+        for _ in range(timestep.steps()):
+            if rng.random() < 0.05:
+                inputs = platformer_v2.Inputs(rng.random() < 0.3, rng.random() < 0.6, rng.random() < 0.3, False)
+            interpolation.capture(state)
+            state, _ = platformer_v2.step(state, inputs)
+            ticks += 1
+        physics += time.perf_counter() - start
+
+        start = time.perf_counter()
+        if interpolate:
+            platformer_v2.draw_scene(screen, state, background, interpolation, timestep.alpha)
+        else:
+            platformer_v2.draw_scene(screen, state, background)
+        render += time.perf_counter() - start
+    return ticks / seconds, physics / seconds * 1000, render / frames * 1000
+
+
+def judder(rate, interpolate, seconds=1.5):
+    """Spread of the player's per-frame screen x steps while it walks right on the ground"""
+    state = platformer_v2.new_game()
+    player = state.player
+    player.x, player.y = 40, platformer_v2.SCREEN_HEIGHT - 40 - player.height
+    timestep = FixedTimestep(platformer_v2.FPS)
+    interpolation = platformer_v2.Interpolation(state)
+    walk = platformer_v2.Inputs(False, True, False, False)
+    steps = []
+    shown = None
+    for _ in range(int(seconds * rate)):
+        timestep.advance(1 / rate)
+        for _ in range(timestep.steps()):
+            interpolation.capture(state)
+            state, _ = platformer_v2.step(state, walk)
+        if interpolate:
+            x = round(interpolation.player_position(state, timestep.alpha)[0])
+        else:
+            x = round(player.x)
+        if shown is not None:
+            steps.append(x - shown)
+        shown = x
+    # Leave out the first tenth of a second, while the walk gets going
+    steps = steps[rate // 10:]
+    return max(steps) - min(steps)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    platformer_v2.bake_sprites()
+    print(f"{seconds:g} s of game time per display rate")
+    print(f"{'display':<10}{'mode':<14}{'ticks/s':>9}{'physics ms/s':>14}{'draw ms':>9}{'judder px':>11}")
+    for rate in RATES:
+        for label, interpolate in (("last tick", False), ("interpolated", True)):
+            ticks, physics, render = run(rate, seconds, interpolate)
+            print(f"{f'{rate} Hz':<10}{label:<14}{ticks:>9.1f}{physics:>14.2f}{render:>9.3f}"
+                  f"{judder(rate, interpolate):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Procedural level throughput: placing candidates, solving them, and the whole generate() loop.
+
+Run from the repository root:  python benchmarks/bench_level_gen.py [levels] [width]
+
+Candidates the solver rejects are redrawn, so generate() costs a little
+more than one place() and one solve() per level. The last line plays a
+few generated levels headless with batch_sim's random policy.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import batch_sim
+import level_gen
+import levels
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 2400
+
+    start = time.perf_counter()
+    table = level_gen.JumpTable.from_player()
+    print(f"jump table: {len(table.heights)} heights in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    candidates = [level_gen.place(rng, width, 30, 6, 30) for _ in range(count)]
+    place_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reaches = [level_gen.solve(level, table) for level in candidates]
+    solve_time = time.perf_counter() - start
+    accepted = sum(reach.coins.all() for reach in reaches)
+    platforms = sum(reach.platforms.mean() for reach in reaches) / count
+
+    start = time.perf_counter()
+    for seed in range(count):
+        level_gen.generate(seed, width, table=table)
+    generate_time = time.perf_counter() - start
+
+    builtin = levels.load_text(levels.level_path("platformer_v2.txt"))
+    reach = level_gen.solve(builtin, table)
+
+    print(f"{count} candidates {width} px wide")
+    print(f"place()     {place_time / count * 1e6:>8.0f} us/level")
+    print(f"solve()     {solve_time / count * 1e6:>8.0f} us/level   "
+          f"{accepted / count:.0%} accepted, {platforms:.1%} of platforms reachable")
+    print(f"generate()  {generate_time / count * 1e6:>8.0f} us/level   {count / generate_time:,.0f} levels/s")
+    print(f"built-in level: {reach.coins.sum()}/{len(reach.coins)} coins, "
+          f"{reach.platforms.sum()}/{len(reach.platforms)} platforms reachable")
+
+    results = batch_sim.run_batch(range(8), 3600, workers=1, level_factory=level_gen.build_level)
+    print("random policy on 8 generated levels: coins "
+          + " ".join(f"{result.coins}/{len(level_gen.generate(result.seed).coins)}" for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Level start-up cost: building every object from a text level vs streaming a compiled one.
+
+Run from the repository root:  python benchmarks/bench_levels.py [largest level width]
+
+For each level width the text form is parsed and turned into game objects,
+then the compiled form is opened and only its nearby chunks loaded. Time is
+wall clock; memory is the peak of Python allocations while starting.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import levels
+import platformer_v2
+
+SEGMENT = 400  # world width holding one platform, one enemy and four coins
+
+
+def wide_level(width, seed=1):
+    """Same layout as bench_camera.wide_level, built straight into record arrays"""
+    rng = np.random.default_rng(seed)
+    lefts = np.arange(SEGMENT, width - SEGMENT, SEGMENT)
+    count = len(lefts)
+    ys = rng.integers(15, 25, count) * 20
+    platforms = np.zeros(count + 1, dtype=levels.PLATFORM)
+    platforms[0] = (0, platformer_v2.SCREEN_HEIGHT - 40, width, 40, 0)
+    platforms['x'][1:], platforms['y'][1:] = lefts, ys
+    platforms['width'][1:], platforms['height'][1:] = 160, 20
+    platforms['number'][1:] = np.arange(count) % 99 + 1
+
+    enemies = np.zeros(count, dtype=levels.ENEMY)
+    enemies['x'], enemies['y'] = lefts + 40, ys - 25
+    enemies['left'], enemies['right'] = lefts, lefts + 160
+
+    coins = np.zeros(count * 4, dtype=levels.COIN)
+    coins['x'] = (lefts[:, None] + 20 + np.arange(4) * 35).ravel()
+    coins['y'] = np.repeat(ys - 30, 4)
+    return levels.Level(platforms, enemies, coins)
+
+
+def measure(start):
+    tracemalloc.start()
+    began = time.perf_counter()
+    state = start()
+    elapsed = time.perf_counter() - began
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return state, elapsed, peak
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 4000000
+    widths = [width for width in (4000, 40000, 400000, 4000000, 40000000) if width <= largest]
+    directory = tempfile.mkdtemp()
+
+    # First calls into NumPy's set routines are slow; keep that out of the first row
+    warm_up = os.path.join(directory, "warm-up.lvl")
+    levels.compile_level(wide_level(4000), warm_up)
+    with platformer_v2.load_level(warm_up) as level_file:
+        platformer_v2.new_game(level_file)
+    os.remove(warm_up)
+
+    print(f"{'level width':>12}{'objects':>10}{'text ms':>10}{'text MB':>10}{'lvl ms':>10}{'lvl MB':>10}{'lvl size':>12}")
+    for width in widths:
+        level = wide_level(width)
+        text_path = os.path.join(directory, f"level-{width}.txt")
+        compiled_path = os.path.join(directory, f"level-{width}.lvl")
+        with open(text_path, "w") as f:
+            f.write(levels.format_text(level))
+        levels.compile_level(level, compiled_path)
+
+        _, text_time, text_peak = measure(lambda: platformer_v2.new_game(platformer_v2.load_level(text_path)))
+        state, compiled_time, compiled_peak = measure(
+            lambda: platformer_v2.new_game(platformer_v2.load_level(compiled_path)))
+        objects = sum(len(records) for records in level)
+        print(f"{width:>12,}{objects:>10,}{text_time * 1000:>10.1f}{text_peak / 2**20:>10.1f}"
+              f"{compiled_time * 1000:>10.1f}{compiled_peak / 2**20:>10.2f}{os.path.getsize(compiled_path):>12,}")
+        platformer_v2.close_level(state.stream.level_file)
+        os.remove(text_path)
+        os.remove(compiled_path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Sound effect bursts through AudioEngine vs calling Sound.play() directly, for several mixer buffer sizes.
+
+Run from the repository root:  python benchmarks/bench_mixer.py [frames]
+
+Frames are paced in real time at 60 FPS so sounds finish the way they do in
+the game. Every half second a row of coins is collected in one frame. With
+the default dummy audio driver, latency is the time until the voice starts
+plus the length of the output buffer.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import platformer_v2
+import synth
+from audio import AudioEngine, open_mixer
+
+BUFFERS = (128, 256, 512, 1024, 2048)
+FRAME = 1 / 60
+
+
+def triggers(frame):
+    """Sounds asked for in one frame of busy play"""
+    names = []
+    if frame % 30 == 0:
+        names += ["coin"] * 12
+    if frame % 45 == 0:
+        names.append("jump")
+    if frame % 90 == 0:
+        names.append("stomp")
+    if frame % 150 == 0:
+        names.append("death")
+    return names
+
+
+def paced(frames, tick):
+    start = time.perf_counter()
+    for frame in range(frames):
+        tick(frame)
+        delay = start + (frame + 1) * FRAME - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def sounds():
+    return {
+        "jump": (platformer_v2.create_jump_sound(), 1),
+        "coin": (platformer_v2.create_coin_sound(), 0),
+        "stomp": (platformer_v2.create_enemy_defeat_sound(), 1),
+        "death": (platformer_v2.create_death_sound(), 2),
+    }
+
+
+def run_direct(frames):
+    """Every trigger straight to Sound.play(), as platformer_v2 did before AudioEngine"""
+    pygame.mixer.set_num_channels(platformer_v2.AUDIO_VOICES)
+    bank = sounds()
+    counts = {"played": 0, "dropped": 0}
+
+    def tick(frame):
+        for name in triggers(frame):
+            if bank[name][0].play() is None:
+                counts["dropped"] += 1
+            else:
+                counts["played"] += 1
+
+    paced(frames, tick)
+    pygame.mixer.stop()
+    return counts
+
+
+def run_engine(frames, buffer):
+    audio = AudioEngine(platformer_v2.AUDIO_VOICES, buffer)
+    for name, (sound, priority) in sounds().items():
+        audio.add(name, sound, priority)
+    audio.play_music(platformer_v2.stream_background_music())
+    update_time = [0.0]
+
+    def tick(frame):
+        for name in triggers(frame):
+            audio.trigger(name)
+        start = time.perf_counter()
+        audio.update()
+        update_time[0] += time.perf_counter() - start
+
+    paced(frames, tick)
+    audio.music.stop()
+    pygame.mixer.stop()
+    return audio, update_time[0] / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 180
+    open_mixer(synth.SAMPLE_RATE, platformer_v2.AUDIO_BUFFER)
+    pygame.init()
+    direct = run_direct(frames)
+    print(f"direct Sound.play(): {direct['played']} played, {direct['dropped']} dropped "
+          f"with {platformer_v2.AUDIO_VOICES} channels")
+    pygame.mixer.quit()
+
+    print(f"{'buffer':>8}{'buffer ms':>11}{'mean ms':>9}{'p95 ms':>8}{'update us':>11}"
+          f"{'played':>8}{'merged':>8}{'stolen':>8}{'dropped':>9}{'underruns':>11}")
+    for buffer in BUFFERS:
+        pygame.mixer.init(frequency=synth.SAMPLE_RATE, size=-16, channels=2, buffer=buffer)
+        audio, update = run_engine(frames, buffer)
+        mean, p95, _ = audio.latency_stats()
+        print(f"{buffer:>8}{audio.output_latency * 1000:>11.1f}{mean * 1000:>9.2f}{p95 * 1000:>8.2f}"
+              f"{update * 1e6:>11.1f}{audio.played:>8}{audio.coalesced:>8}{audio.stolen:>8}"
+              f"{audio.dropped:>9}{audio.music.underruns:>11}")
+        pygame.mixer.quit()
+
+
+if __name__ == "__main__":
+    main()
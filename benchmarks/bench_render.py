@@ -0,0 +1,85 @@
+"""Frame time of the platformer_v2 scene: immediate-mode sky and bricks vs the game's baked background tiles.
+
+Run from the repository root:  python benchmarks/bench_render.py [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import platformer_v2
+
+draw_calls = 0
+
+
+def counting(fn):
+    def wrapper(*args, **kwargs):
+        global draw_calls
+        draw_calls += 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+for name in ("rect", "line", "circle"):
+    setattr(pygame.draw, name, counting(getattr(pygame.draw, name)))
+
+
+class CountingSurface(pygame.Surface):
+    """Frame target that counts blits alongside the pygame.draw calls"""
+
+    blit = counting(pygame.Surface.blit)
+
+
+def draw_dynamic(screen, state):
+    platformer_v2.draw_coins(screen, state.coins)
+    platformer_v2.draw_enemies(screen, state.enemies)
+    state.player.draw(screen)
+
+
+def immediate_frame(screen, scene):
+    state, _ = scene
+    view = state.camera.rect
+    platformer_v2.draw_sky(screen, view.top, state.camera.world.bottom)
+    for platform in state.platforms:
+        platform.draw(screen, (-view.x, -view.y))
+    draw_dynamic(screen, state)
+
+
+def layered_frame(screen, scene):
+    state, background = scene
+    background.draw(screen, state.camera.rect)
+    draw_dynamic(screen, state)
+
+
+def measure(label, frame, screen, scene, frames):
+    global draw_calls
+    frame(screen, scene)  # warm up, and bake the background tiles outside the timing
+    draw_calls = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame(screen, scene)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10}{elapsed / frames * 1000:>10.3f} ms/frame{draw_calls / frames:>10.0f} draw calls/frame")
+    return elapsed
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+    display = pygame.display.set_mode((platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT))
+    screen = CountingSurface(display.get_size(), 0, display)
+    platformer_v2.bake_sprites()
+    state = platformer_v2.new_game()
+    scene = (state, platformer_v2.create_background(state))
+
+    before = measure("immediate", immediate_frame, screen, scene, frames)
+    after = measure("layered", layered_frame, screen, scene, frames)
+    print(f"speedup   {before / after:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""CPU cost of RectWall-style frames at the panel's native resolution vs through ScaledDisplay.
+
+Run from the repository root:  python benchmarks/bench_scaled.py [frames]
+
+Each frame clears the screen and draws the player, the wall, five coins
+and four buttons. Getting a frame out is modelled as one copy of the
+window surface, which is what a flip costs the CPU: native windows are
+panel-sized, while a SCALED window (ScaledDisplay.open) is render-sized
+and the stretch to the panel happens on the GPU, which is not measured.
+The software rows stretch on the CPU onto a panel-sized window instead,
+as ScaledDisplay does over a plain surface.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+from scaled_display import ScaledDisplay, anchored, layout
+
+PANELS = (("phone 1080x2340", (1080, 2340)), ("tablet 1600x2560", (1600, 2560)), ("4K tablet 2160x3840", (2160, 3840)))
+MODES = (("SCALED 1.0", 1.0, False, False), ("SCALED 0.75", 0.75, False, False), ("SCALED 0.5", 0.5, False, False),
+         ("software 1.0", 1.0, False, True), ("software 1.0 smooth", 1.0, True, True))
+
+COINS = [pygame.Rect(x, y, 25, 25) for x, y in ((800, 200), (300, 800), (100, 400), (900, 600), (500, 300))]
+
+
+def scene(size):
+    """Logical rects of a frame on a view of size"""
+    button = (100, 100)
+    buttons = [anchored(size, button, left=50, bottom=320), anchored(size, button, left=250, bottom=320),
+               anchored(size, button, right=280, bottom=320), anchored(size, button, right=110, bottom=320)]
+    return [((0, 255, 0), pygame.Rect(100, 100, 50, 50)), ((150, 150, 150), pygame.Rect(500, 500, 200, 200))] \
+        + [((255, 255, 0), coin) for coin in COINS] + [((100, 100, 100), rect) for rect in buttons]
+
+
+def draw(surface, rects, to_surface, frame):
+    surface.fill((0, 0, 0))
+    for color, rect in rects:
+        pygame.draw.rect(surface, color, to_surface(rect.move(frame % 7, 0)))
+
+
+def native(panel, frames):
+    screen = pygame.Surface(panel)
+    window = pygame.Surface(panel)
+    # The same logical scene, laid out for and drawn at the full panel resolution
+    view = ScaledDisplay(screen, render_scale=10)
+    rects = scene(view.size)
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw(screen, rects, view.rect, frame)
+        window.blit(screen, (0, 0))
+    return (time.perf_counter() - start) / frames
+
+
+def scaled(panel, frames, render_scale, smooth, software):
+    """ms per frame and render size; software stretches on the CPU, otherwise SDL is left to do it"""
+    if software:
+        display = ScaledDisplay(pygame.Surface(panel), render_scale=render_scale, smooth=smooth)
+    else:
+        _, _, size = layout(panel, (1080, 1920), render_scale)
+        display = ScaledDisplay(pygame.Surface(size), render_scale=render_scale, smooth=smooth, panel=panel)
+    window = pygame.Surface(display.display.get_size())
+    rects = scene(display.size)
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw(display.surface, rects, display.rect, frame)
+        display.present()
+        window.blit(display.display, (0, 0))
+    return (time.perf_counter() - start) / frames, display.surface.get_size()
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pygame.init()
+    print(f"{frames} frames each, CPU ms per frame (draw, stretch if in software, window copy)")
+    print(f"{'panel':<22}{'mode':<21}{'render size':>13}{'ms':>9}{'vs native':>11}")
+    for name, panel in PANELS:
+        base = native(panel, frames)
+        print(f"{name:<22}{'native':<21}{f'{panel[0]}x{panel[1]}':>13}{base * 1000:>9.2f}{'':>11}")
+        for label, render_scale, smooth, software in MODES:
+            cost, size = scaled(panel, frames, render_scale, smooth, software)
+            print(f"{'':<22}{label:<21}{f'{size[0]}x{size[1]}':>13}{cost * 1000:>9.2f}{base / cost:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
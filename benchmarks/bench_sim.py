@@ -0,0 +1,50 @@
+"""Headless tick rate of the platformer_v2 simulation, no window or mixer.
+
+Run from the repository root:  python benchmarks/bench_sim.py [ticks | replay file]
+
+Given a replay recorded with `platformer_v2.py --record FILE`, the real player
+trace is timed instead of the scripted inputs.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import platformer_v2
+import replay
+
+
+def scripted_inputs(ticks, seed=1):
+    """Held directions and jumps that change every few ticks, like a restless player"""
+    rng = random.Random(seed)
+    inputs = []
+    current = platformer_v2.NO_INPUT
+    for _ in range(ticks):
+        if rng.random() < 0.05:
+            current = platformer_v2.Inputs(rng.random() < 0.4, rng.random() < 0.5, rng.random() < 0.3, True)
+        inputs.append(current)
+    return inputs
+
+
+def main():
+    if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]):
+        recording = replay.load(sys.argv[1])
+        inputs = [platformer_v2.REPLAY_INPUTS[mask] for mask in replay.iter_masks(recording)]
+    else:
+        inputs = scripted_inputs(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+    ticks = len(inputs)
+    state = platformer_v2.new_game()
+
+    start = time.perf_counter()
+    for tick_inputs in inputs:
+        state, _ = platformer_v2.step(state, tick_inputs)
+    elapsed = time.perf_counter() - start
+
+    print(f"{ticks} ticks in {elapsed:.2f} s: {ticks / elapsed:,.0f} ticks/s "
+          f"({ticks / elapsed / platformer_v2.FPS:,.0f}x real time), final score {state.score}")
+
+
+if __name__ == "__main__":
+    main()
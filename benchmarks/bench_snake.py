@@ -0,0 +1,114 @@
+"""Snake tick and food placement cost on big grids: list body vs deque + occupancy board.
+
+Run from the repository root:  python benchmarks/bench_snake.py [ticks]
+
+The snake follows a cycle through every cell, so it never dies, with its
+body covering most of the board. Food placement is timed separately at
+the same fill level, with the original retry-until-free loop as the baseline.
+"""
+import os
+import random
+import sys
+import time
+from collections import deque
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from snake_game import Snake
+
+FILL = 0.9
+PLACEMENTS = 200
+
+
+class ListSnake:
+    """The original body: a list, head first, scanned for collisions"""
+
+    def __init__(self, width, height, positions):
+        self.width = width
+        self.height = height
+        self.positions = list(positions)
+        self.direction = (1, 0)
+
+    def move(self):
+        head = self.positions[0]
+        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+        if new_head[0] < 0 or new_head[0] >= self.width or new_head[1] < 0 or new_head[1] >= self.height:
+            return False
+        if new_head in self.positions:
+            return False
+        self.positions.insert(0, new_head)
+        self.positions.pop()
+        return True
+
+
+def cycle(width, height):
+    """Cells of a closed path through the whole grid (height must be even): rows snake
+    back and forth right of column 0, which leads back to the start"""
+    cells = []
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cells.extend((x, y) for x in xs)
+    cells.extend((0, y) for y in range(height - 1, -1, -1))
+    return cells
+
+
+def deque_snake(width, height, body):
+    snake = Snake(width, height)
+    snake.board.release(snake.positions[0])
+    snake.positions = deque(body)
+    for position in body:
+        snake.board.occupy(position)
+    return snake
+
+
+def run(snake, path, length, ticks):
+    """Move the snake on along path, whose first length cells (reversed) are its body"""
+    start = time.perf_counter()
+    for tick in range(ticks):
+        head = snake.positions[0]
+        target = path[(length + tick) % len(path)]
+        snake.direction = (target[0] - head[0], target[1] - head[1])
+        if not snake.move():
+            raise RuntimeError(f"snake died at tick {tick}")
+    return (time.perf_counter() - start) / ticks
+
+
+def place_retrying(width, height, positions):
+    start = time.perf_counter()
+    for _ in range(PLACEMENTS):
+        position = (random.randint(0, width - 1), random.randint(0, height - 1))
+        while position in positions:
+            position = (random.randint(0, width - 1), random.randint(0, height - 1))
+    return (time.perf_counter() - start) / PLACEMENTS
+
+
+def place_free(board):
+    start = time.perf_counter()
+    for _ in range(PLACEMENTS):
+        board.random_free()
+    return (time.perf_counter() - start) / PLACEMENTS
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    random.seed(1)
+    print(f"{'grid':>10}{'length':>9}{'list tick us':>14}{'deque tick us':>15}"
+          f"{'retry food us':>15}{'free food us':>14}")
+    for width, height in ((40, 30), (160, 120), (640, 480)):
+        path = cycle(width, height)
+        length = int(len(path) * FILL)
+        body = path[length - 1::-1]  # head first
+
+        old = run(ListSnake(width, height, body), path, length, ticks)
+        snake = deque_snake(width, height, body)
+        new = run(snake, path, length, ticks)
+        retry = place_retrying(width, height, list(snake.positions))
+        free = place_free(snake.board)
+        print(f"{width:>5}x{height:<4}{length:>9,}{old * 1e6:>14.1f}{new * 1e6:>15.2f}"
+              f"{retry * 1e6:>15.1f}{free * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Snake throughput in board-steps per second: one Snake object at a time vs SnakeEnv batches.
+
+Run from the repository root:  python benchmarks/bench_snake_env.py [steps]
+
+Agents mostly keep their heading and turn at random now and then, so
+episodes last a while and boards die and reset all through the run.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from snake_env import DX, DY, SnakeEnv
+from snake_game import Food, Snake
+
+TURN_CHANCE = 0.2
+
+
+def scalar(steps, seed=1):
+    """The snake_game.py objects, stepped in a Python loop like Game.update"""
+    rng = np.random.default_rng(seed)
+    turns = rng.random(steps) < TURN_CHANCE
+    actions = rng.integers(0, 4, steps).tolist()
+    snake = Snake()
+    food = Food(snake.board.random_free())
+    start = time.perf_counter()
+    for turn, action in zip(turns.tolist(), actions):
+        if turn:
+            snake.change_direction((DX[action], DY[action]))
+        if not snake.move():
+            snake = Snake()
+            food = Food(snake.board.random_free())
+        elif snake.positions[0] == food.position:
+            snake.grow_snake()
+            food.position = snake.board.random_free()
+    return steps / (time.perf_counter() - start)
+
+
+def batched(count, steps, seed=1):
+    env = SnakeEnv(count, seed=seed)
+    rng = np.random.default_rng(seed)
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        actions = np.where(rng.random(count) < TURN_CHANCE, rng.integers(0, 4, count), env.direction)
+        _, dones = env.step(actions)
+        episodes += int(np.count_nonzero(dones))
+    return count * steps / (time.perf_counter() - start), episodes
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'boards':>8}{'board-steps/s':>16}{'episodes':>10}")
+    print(f"{'scalar':>8}{scalar(steps * 100):>16,.0f}{'':>10}")
+    for count in (1, 16, 256, 4096):
+        rate, episodes = batched(count, steps)
+        print(f"{count:>8}{rate:>16,.0f}{episodes:>10,}")
+
+
+if __name__ == "__main__":
+    main()
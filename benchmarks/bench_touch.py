@@ -0,0 +1,108 @@
+"""Touch dispatch on a crowded panel: RectWall's original per-button tests vs touch_input.ActionInput.
+
+Run from the repository root:  python benchmarks/bench_touch.py [frames] [fingers]
+
+The panel is 1920x1080 with a grid of controls. Fingers land, slide and
+lift at random, and each frame the game asks which actions are held. The
+original way tests every control on FINGERDOWN, rebuilds the finger set on
+FINGERUP and rebuilds the held directions from all fingers every frame;
+a slide is handled as a lift and a new touch, since it had no FINGERMOTION.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+from touch_input import ActionInput
+
+SIZE = (1920, 1080)
+GRIDS = ((2, 2), (8, 6), (16, 12))
+
+
+def layout(columns, rows):
+    """(rect, action) for a grid of buttons with gaps between them"""
+    width, height = SIZE[0] // columns, SIZE[1] // rows
+    return [(pygame.Rect(c * width + 4, r * height + 4, width - 8, height - 8), f"b{c}_{r}")
+            for c in range(columns) for r in range(rows)]
+
+
+def script(frames, fingers, seed=1):
+    """Per-frame lists of finger events keeping about fingers fingers on the panel"""
+    rng = random.Random(seed)
+    down = set()
+    result = []
+    for _ in range(frames):
+        events = []
+        for _ in range(rng.randrange(1, 6)):
+            x, y = rng.random(), rng.random()
+            if len(down) < fingers and (not down or rng.random() < 0.4):
+                finger = rng.randrange(1 << 30)
+                down.add(finger)
+                events.append(pygame.event.Event(pygame.FINGERDOWN, x=x, y=y, finger_id=finger))
+            elif rng.random() < 0.7:
+                events.append(pygame.event.Event(pygame.FINGERMOTION, x=x, y=y, finger_id=rng.choice(tuple(down))))
+            else:
+                finger = rng.choice(tuple(down))
+                down.discard(finger)
+                events.append(pygame.event.Event(pygame.FINGERUP, x=x, y=y, finger_id=finger))
+        result.append(events)
+    return result
+
+
+def run_original(buttons, frames):
+    active_fingers = set()
+    events = 0
+    start = time.perf_counter()
+    for frame in frames:
+        for event in frame:
+            if event.type != pygame.FINGERDOWN:
+                active_fingers = {f for f in active_fingers if f[1] != event.finger_id}
+            if event.type != pygame.FINGERUP:
+                x = event.x * SIZE[0]
+                y = event.y * SIZE[1]
+                for rect, action in buttons:
+                    if rect.collidepoint(x, y):
+                        active_fingers.add((action, event.finger_id))
+            events += 1
+        directions = set(d for d, _ in active_fingers)
+    return time.perf_counter() - start, events, directions
+
+
+def run_indexed(buttons, frames):
+    controls = ActionInput(SIZE)
+    for rect, action in buttons:
+        controls.add_control(rect, action)
+    events = 0
+    start = time.perf_counter()
+    for frame in frames:
+        for event in frame:
+            controls.handle(event)
+            events += 1
+        directions = controls.held
+        controls.frame_presented()
+    return time.perf_counter() - start, events, set(directions), controls
+
+
+def main():
+    frame_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    fingers = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    frames = script(frame_count, fingers)
+    print(f"{frame_count} frames, up to {fingers} fingers on a {SIZE[0]}x{SIZE[1]} panel")
+    print(f"{'controls':>9}{'original us/event':>19}{'indexed us/event':>18}{'speedup':>9}{'same':>6}")
+    for columns, rows in GRIDS:
+        buttons = layout(columns, rows)
+        original, events, expected = run_original(buttons, frames)
+        indexed, _, held, controls = run_indexed(buttons, frames)
+        print(f"{len(buttons):>9}{original / events * 1e6:>19.2f}{indexed / events * 1e6:>18.2f}"
+              f"{original / indexed:>8.1f}x{'yes' if held == expected else 'NO':>6}")
+    mean, p95, worst = controls.latency_stats()
+    print(f"indexed, event to frame end: mean {mean * 1e6:.1f} us, p95 {p95 * 1e6:.1f} us, max {worst * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Falls onto a thin platform at coarse physics steps: end-position overlap test vs swept collision.
+
+Run from the repository root:  python benchmarks/bench_tunneling.py [ticks]
+
+A lower tick rate means bigger moves per tick. Step scale k stands for
+running physics at 60/k Hz: the player's speed and jump are scaled by k
+and gravity by k squared, so a fall covers the same distance in the same
+time in fewer, longer steps. The player is dropped from many heights onto
+a 20 px platform; tunneling is ending up below it. The last table is the
+cost of a platformer_v2 step() at the normal rate with each collision test.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import platformer_v2
+from camera import Camera
+from spatial import SpatialHash
+
+PLATFORM = pygame.Rect(300, 2000, 200, 20)
+HEIGHTS = range(0, 1950, 25)
+SCALES = (1, 2, 4, 8, 16)
+
+
+def overlap_check(self, platforms, previous_bottom=None):
+    """platformer_v2's collision test before it was swept: only where the player ended up counts"""
+    self.on_ground = False
+    for platform in platforms.query_rect(self.rect):
+        if self.rect.colliderect(platform):
+            if self.vel_y > 0 and self.rect.bottom > platform.top and self.y < platform.top:
+                self.y = platform.top - self.height
+                self.vel_y = 0
+                self.on_ground = True
+
+
+def drop(height, scale, platforms, camera):
+    """True if the player lands on PLATFORM after falling height px"""
+    player = platformer_v2.Player(PLATFORM.x + 50, PLATFORM.top - 40 - height)
+    player.speed *= scale
+    player.jump_power *= scale
+    player.gravity *= scale * scale
+    player.rect.x, player.rect.y = player.x, player.y
+    events = []
+    while player.y < PLATFORM.bottom:
+        player.update(platforms, platformer_v2.NO_INPUT, events, camera)
+        if player.on_ground:
+            return True
+    return False
+
+
+def tunneling(check):
+    platformer_v2.Player.check_collisions = check
+    platforms = SpatialHash()
+    platforms.insert(PLATFORM)
+    camera = Camera(platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT, pygame.Rect(0, 0, 800, 4000))
+    return [sum(not drop(height, scale, platforms, camera) for height in HEIGHTS) for scale in SCALES]
+
+
+def step_cost(check, ticks):
+    platformer_v2.Player.check_collisions = check
+    rng = random.Random(3)
+    state = platformer_v2.new_game()
+    inputs = platformer_v2.NO_INPUT
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if rng.random() < 0.05:
+            inputs = platformer_v2.Inputs(rng.random() < 0.4, rng.random() < 0.5, rng.random() < 0.3, False)
+        state, _ = platformer_v2.step(state, inputs)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    swept = platformer_v2.Player.check_collisions
+    print(f"player dropped from {len(HEIGHTS)} heights onto a {PLATFORM.height} px platform; falls through:")
+    print(f"{'step scale':<12}" + "".join(f"{f'{scale}x ({60 // scale} Hz)':>14}" for scale in SCALES))
+    for label, check in (("overlap", overlap_check), ("swept", swept)):
+        print(f"{label:<12}" + "".join(f"{count:>14}" for count in tunneling(check)))
+    print(f"step() at 60 Hz: overlap {step_cost(overlap_check, ticks) * 1e6:.1f} us/tick, "
+          f"swept {step_cost(swept, ticks) * 1e6:.1f} us/tick")
+    platformer_v2.Player.check_collisions = swept
+
+
+if __name__ == "__main__":
+    main()
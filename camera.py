@@ -0,0 +1,44 @@
+import pygame
+
+
+class Camera:
+    """Viewport onto a world that can be larger than the screen.
+
+    rect is the visible part of the world in world coordinates; subtracting
+    its top-left (or adding offset) turns world coordinates into screen ones.
+    The camera only moves once its target leaves the dead zone in the middle
+    of the view, and never shows anything outside the world bounds.
+    """
+
+    def __init__(self, width, height, world, deadzone=(0.2, 0.3)):
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.world = pygame.Rect(world)
+        self.deadzone = pygame.Rect(0, 0, int(width * deadzone[0]), int(height * deadzone[1]))
+        self.rect.clamp_ip(self.world)
+
+    @property
+    def offset(self):
+        return (-self.rect.x, -self.rect.y)
+
+    def to_screen(self, x, y):
+        return (x - self.rect.x, y - self.rect.y)
+
+    def to_world(self, x, y):
+        return (x + self.rect.x, y + self.rect.y)
+
+    def visible(self, margin=0):
+        """World rect of the view, grown by margin on every side"""
+        return self.rect.inflate(2 * margin, 2 * margin)
+
+    def follow(self, target):
+        """Scroll just enough to keep target inside the dead zone"""
+        self.deadzone.center = self.rect.center
+        if target.centerx < self.deadzone.left:
+            self.rect.x -= self.deadzone.left - target.centerx
+        elif target.centerx > self.deadzone.right:
+            self.rect.x += target.centerx - self.deadzone.right
+        if target.centery < self.deadzone.top:
+            self.rect.y -= self.deadzone.top - target.centery
+        elif target.centery > self.deadzone.bottom:
+            self.rect.y += target.centery - self.deadzone.bottom
+        self.rect.clamp_ip(self.world)
@@ -0,0 +1,64 @@
+"""Swept box collision: where along a move a box first touches another.
+
+Overlap tests only look at where a box ends up, so a fast box can pass
+through a thin platform between two ticks. These functions look at the
+whole path instead, so the result does not depend on how big a step is.
+Moving boxes are (left, top, width, height) tuples of floats; obstacles
+are anything with left/top/right/bottom, such as pygame.Rect.
+"""
+import math
+
+import pygame
+
+
+def time_of_impact(box, dx, dy, target):
+    """Fraction of the move (dx, dy), from 0 to 1, at which box first touches target.
+
+    None when the path misses target, only grazes an edge, or box already
+    overlaps target at the start (it is then moving out, not in).
+    """
+    left, top, width, height = box
+    entry = -math.inf
+    leave = math.inf
+    for start, size, delta, near, far in (
+            (left, width, dx, target.left, target.right),
+            (top, height, dy, target.top, target.bottom)):
+        if delta == 0:
+            # No motion on this axis: the box must already be inside the slab
+            if start + size <= near or start >= far:
+                return None
+            continue
+        if delta > 0:
+            enter, exit_ = (near - start - size) / delta, (far - start) / delta
+        else:
+            enter, exit_ = (far - start) / delta, (near - start - size) / delta
+        entry = max(entry, enter)
+        leave = min(leave, exit_)
+    if entry < 0 or entry > 1 or entry >= leave:
+        return None
+    return entry
+
+
+def first_hit(box, dx, dy, targets):
+    """(time of impact, target) of the earliest target along the move, or (1.0, None) if the way is clear.
+
+    Ties go to the target listed first.
+    """
+    best = 1.0
+    hit = None
+    for target in targets:
+        toi = time_of_impact(box, dx, dy, target)
+        if toi is not None and (hit is None or toi < best):
+            best = toi
+            hit = target
+    return best, hit
+
+
+def swept_rect(box, dx, dy):
+    """Smallest whole-pixel Rect holding box at both ends of the move, for broadphase queries"""
+    left, top, width, height = box
+    x0 = math.floor(min(left, left + dx))
+    y0 = math.floor(min(top, top + dy))
+    x1 = math.ceil(max(left, left + dx) + width)
+    y1 = math.ceil(max(top, top + dy) + height)
+    return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
@@ -0,0 +1,271 @@
+import numpy as np
+
+
+def pixel(values):
+    """Round float positions the way pygame.Rect does (half away from zero)"""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class RowGrid:
+    """Uniform grid over the static boxes of a store, for finding rows near a rect.
+
+    Each row is bucketed into every cell its (left, top, right, bottom) box
+    touches. Queries only visit the cells under the rect, so rows far away
+    cost nothing; they return candidate row numbers in ascending order and
+    the caller does the exact test on just those rows. The boxes never
+    move, so the rows under a cell range are remembered: a view or player
+    that stays in the same cells gets the same array back without
+    allocating. Callers must not change it.
+    """
+
+    EMPTY = np.empty(0, dtype=np.int64)
+    QUERY_CACHE = 64
+
+    def __init__(self, left, top, right, bottom, cell_size=256):
+        self.cell_size = cell_size
+        x0 = np.floor_divide(left, cell_size).astype(np.int64)
+        y0 = np.floor_divide(top, cell_size).astype(np.int64)
+        x1 = np.floor_divide(np.maximum(left, np.asarray(right) - 1), cell_size).astype(np.int64)
+        y1 = np.floor_divide(np.maximum(top, np.asarray(bottom) - 1), cell_size).astype(np.int64)
+
+        buckets = {}
+        for row, (cx0, cy0, cx1, cy1) in enumerate(zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist())):
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    bucket = buckets.get((cx, cy))
+                    if bucket is None:
+                        bucket = buckets[(cx, cy)] = []
+                    bucket.append(row)
+        self.cells = {cell: np.array(rows, dtype=np.int64) for cell, rows in buckets.items()}
+        self.queries = {}
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            max(rect.left, rect.right - 1) // size,
+            max(rect.top, rect.bottom - 1) // size,
+        )
+
+    def query(self, rect):
+        return self.query_cells(self.cell_range(rect))
+
+    def query_cells(self, cells):
+        rows = self.queries.get(cells)
+        if rows is None:
+            if len(self.queries) >= self.QUERY_CACHE:
+                self.queries.clear()
+            rows = self.queries[cells] = self.gather(cells)
+        return rows
+
+    def gather(self, cells):
+        x0, y0, x1, y1 = cells
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is not None:
+                    found.append(bucket)
+        if not found:
+            return self.EMPTY
+        if len(found) == 1:
+            return found[0]
+        return np.unique(np.concatenate(found))
+
+
+class EnemyStore:
+    """Patrolling enemies as NumPy columns, one row per enemy.
+
+    Rows are never reordered; removed enemies just stop being alive, so
+    indices stay stable for the lifetime of a store. ids are the enemies'
+    numbers in the level, which stay the same when a streamed level swaps
+    one store for another.
+    """
+
+    DEFEAT_TICKS = 60  # 1 second before disappearing
+
+    def __init__(self, x, y, width, height, speed, left, right, ids=None):
+        count = len(x)
+        self.ids = np.arange(count) if ids is None else np.asarray(ids, dtype=np.int64)
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.width = np.asarray(width, dtype=np.int64)
+        self.height = np.asarray(height, dtype=np.int64)
+        self.speed = np.asarray(speed, dtype=np.float64)
+        self.velocity = self.speed.copy()  # speed * direction, everyone starts walking right
+        self.left = np.asarray(left, dtype=np.float64)
+        self.right = np.asarray(right, dtype=np.float64)
+        self.defeated = np.zeros(count, dtype=bool)
+        self.defeat_timer = np.zeros(count, dtype=np.int64)
+        self.alive = np.ones(count, dtype=bool)
+        # alive and not defeated, kept up to date instead of recombined every tick
+        self.walking = np.ones(count, dtype=bool)
+        self.dying = 0
+
+        # Derived columns that never change
+        self.turn_right = self.right - self.width
+        self.top = pixel(self.y)
+        self.bottom = self.top + self.height
+        # Patrols never leave their span, so the span is what gets indexed
+        self.grid = RowGrid(self.left, self.top, self.right, self.bottom)
+
+    @classmethod
+    def from_enemies(cls, enemies):
+        return cls(
+            [e.x for e in enemies], [e.y for e in enemies],
+            [e.width for e in enemies], [e.height for e in enemies],
+            [e.speed for e in enemies],
+            [e.platform_left for e in enemies], [e.platform_right for e in enemies],
+        )
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def carry_over(self, old):
+        """Take the live state of the enemies this store shares with old"""
+        _, rows, old_rows = np.intersect1d(self.ids, old.ids, assume_unique=True, return_indices=True)
+        for name in ("x", "velocity", "defeated", "defeat_timer", "alive", "walking"):
+            getattr(self, name)[rows] = getattr(old, name)[old_rows]
+        self.dying = int(np.count_nonzero(self.alive & self.defeated))
+
+    def update(self, rows=None):
+        """Advance patrols and defeat timers; returns the rows removed this tick.
+
+        With rows, only those enemies move, e.g. the ones near the camera.
+        """
+        if rows is not None:
+            return self.update_rows(rows)
+        expired = np.empty(0, dtype=np.int64)
+        if self.dying:
+            dying = self.alive & self.defeated
+            self.defeat_timer -= dying
+            expired = (dying & (self.defeat_timer <= 0)).nonzero()[0]
+            self.alive[expired] = False
+            self.dying -= len(expired)
+
+        self.x += self.velocity * self.walking
+        turn = self.walking & ((self.x <= self.left) | (self.x >= self.turn_right))
+        self.velocity[turn] *= -1
+
+        return expired
+
+    def update_rows(self, rows):
+        expired = np.empty(0, dtype=np.int64)
+        if self.dying:
+            dying = rows[self.defeated[rows] & self.alive[rows]]
+            if len(dying):
+                self.defeat_timer[dying] -= 1
+                expired = dying[self.defeat_timer[dying] <= 0]
+                self.alive[expired] = False
+                self.dying -= len(expired)
+
+        walking = rows[self.walking[rows]]
+        x = self.x[walking] + self.velocity[walking]
+        self.x[walking] = x
+        turn = (x <= self.left[walking]) | (x >= self.turn_right[walking])
+        self.velocity[walking[turn]] *= -1
+
+        return expired
+
+    def overlapping(self, rect, rows=None):
+        """Rows of live, undefeated enemies touching rect, out of rows if given"""
+        if rows is not None:
+            left = pixel(self.x[rows])
+            mask = self.walking[rows] & (left < rect.right) & (left + self.width[rows] > rect.left)
+            mask &= (self.top[rows] < rect.bottom) & (self.bottom[rows] > rect.top)
+            return rows[mask]
+        left = pixel(self.x)
+        mask = self.walking & (left < rect.right) & (left + self.width > rect.left)
+        mask &= (self.top < rect.bottom) & (self.bottom > rect.top)
+        return mask.nonzero()[0]
+
+    def visible(self, rect, rows=None):
+        """Rows (out of rows if given) that are still shown and currently inside rect"""
+        rows = self.alive.nonzero()[0] if rows is None else rows[self.alive[rows]]
+        left = pixel(self.x[rows])
+        mask = (left < rect.right) & (left + self.width[rows] > rect.left)
+        mask &= (self.top[rows] < rect.bottom) & (self.bottom[rows] > rect.top)
+        return rows[mask]
+
+    def defeat(self, i):
+        self.defeated[i] = True
+        self.walking[i] = False
+        self.defeat_timer[i] = self.DEFEAT_TICKS
+        self.dying += 1
+
+
+class CoinStore:
+    """Collectibles as NumPy columns with a running collected count"""
+
+    SCALAR_ROWS = 16
+
+    def __init__(self, x, y, width, height, ids=None, total=None):
+        self.x = np.asarray(x, dtype=np.int64)
+        self.y = np.asarray(y, dtype=np.int64)
+        self.width = np.asarray(width, dtype=np.int64)
+        self.height = np.asarray(height, dtype=np.int64)
+        self.right = self.x + self.width
+        self.bottom = self.y + self.height
+        self.collected = np.zeros(len(self.x), dtype=bool)
+        self.remaining = np.ones(len(self.x), dtype=bool)
+        self.collected_count = 0
+        # Level-wide numbering and count, for stores that hold only the streamed-in part of a level
+        self.ids = np.arange(len(self.x)) if ids is None else np.asarray(ids, dtype=np.int64)
+        self.total = len(self.x) if total is None else total
+        self.collected_ids = set()
+        self.grid = RowGrid(self.x, self.y, self.right, self.bottom)
+        # Coins never move, so their boxes are also kept as Python ints for small queries
+        self.boxes = list(zip(self.x.tolist(), self.y.tolist(), self.right.tolist(), self.bottom.tolist()))
+
+    @classmethod
+    def from_coins(cls, coins):
+        return cls(
+            [c.x for c in coins], [c.y for c in coins],
+            [c.width for c in coins], [c.height for c in coins],
+        )
+
+    def __len__(self):
+        return self.total
+
+    def carry_over(self, old):
+        """Keep what was collected in old, including coins this store does not hold"""
+        self.collected_ids = old.collected_ids | set(old.ids[old.collected].tolist())
+        if self.collected_ids:
+            self.collected[:] = np.isin(self.ids, np.fromiter(self.collected_ids, dtype=np.int64))
+            self.remaining[:] = ~self.collected
+        self.collected_count = old.collected_count
+
+    def overlapping(self, rect):
+        """Rows of uncollected coins touching rect; only rows in the grid cells under rect are tested"""
+        rows = self.grid.query(rect)
+        if len(rows) <= self.SCALAR_ROWS:
+            # A handful of candidates is quicker to test one by one than with array ops
+            left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+            boxes = self.boxes
+            remaining = self.remaining
+            hits = []
+            for row in rows.tolist():
+                x, y, box_right, box_bottom = boxes[row]
+                if x < right and box_right > left and y < bottom and box_bottom > top and remaining[row]:
+                    hits.append(row)
+            return np.array(hits, dtype=np.int64)
+
+        rows = rows[self.remaining[rows]]
+        mask = (self.x[rows] < rect.right) & (self.right[rows] > rect.left)
+        mask &= (self.y[rows] < rect.bottom) & (self.bottom[rows] > rect.top)
+        return rows[mask]
+
+    def collect(self, rows):
+        self.collected[rows] = True
+        self.remaining[rows] = False
+        self.collected_count += len(rows)
+
+    def all_collected(self):
+        return self.collected_count == self.total
+
+    def reset(self):
+        self.collected[:] = False
+        self.remaining[:] = True
+        self.collected_count = 0
+        self.collected_ids.clear()
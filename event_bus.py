@@ -0,0 +1,147 @@
+"""Gameplay events for whoever wants them: audio, scoring, telemetry, logs.
+
+The game loop publishes one GameEvent per thing that happened in a tick.
+Subscribers are called on the spot, so they must be quick; anything that
+does I/O goes behind an AsyncSink, which only queues the event and leaves
+the writing to a background thread.
+"""
+import queue
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+
+JUMP = "jump"
+COIN = "coin"
+STOMP = "stomp"
+DEATH = "death"
+FALL = "fall"
+RESPAWN = "respawn"
+WIN = "win"
+
+KINDS = (JUMP, COIN, STOMP, DEATH, FALL, RESPAWN, WIN)
+
+# What happened, on which simulation tick, where the player was and the score after it
+GameEvent = namedtuple('GameEvent', ['kind', 'tick', 'x', 'y', 'score'])
+
+
+class EventBus:
+    def __init__(self):
+        self.handlers = {kind: [] for kind in KINDS}
+        self.published = 0
+
+    def subscribe(self, handler, kinds=KINDS):
+        """Call handler(event) for every published event of kinds"""
+        for kind in kinds:
+            self.handlers[kind].append(handler)
+        return handler
+
+    def unsubscribe(self, handler):
+        for handlers in self.handlers.values():
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def publish(self, event):
+        self.published += 1
+        for handler in self.handlers[event.kind]:
+            handler(event)
+
+
+class EventCounter:
+    """Subscriber that tallies events by kind, e.g. for end-of-game telemetry"""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def __call__(self, event):
+        self.counts[event.kind] += 1
+
+
+class AsyncSink:
+    """Subscriber that hands events to write(batch) on a background thread.
+
+    Publishing never waits: the event goes on a bounded queue, and if the
+    writer has fallen that far behind it is counted as lost instead. The
+    thread collects up to batch_size events, or whatever arrived within
+    flush_interval seconds, per write() call. sample maps a kind to n to
+    keep only every n-th event of that kind.
+    """
+
+    def __init__(self, write, batch_size=64, flush_interval=0.25, sample=None, capacity=4096):
+        self.write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample = dict(sample or {})
+        self.seen = Counter()
+        self.queue = queue.Queue(capacity)
+        self.lost = 0
+        self.written = 0
+        self.batches = 0
+        self.thread = threading.Thread(target=self.run, name="event-sink", daemon=True)
+        self.thread.start()
+
+    def __call__(self, event):
+        every = self.sample.get(event.kind)
+        if every:
+            self.seen[event.kind] += 1
+            if (self.seen[event.kind] - 1) % every:
+                return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.lost += 1
+
+    def run(self):
+        get = self.queue.get
+        while True:
+            event = get()
+            if event is None:
+                return
+            batch = [event]
+            deadline = time.monotonic() + self.flush_interval
+            closing = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    event = get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if event is None:
+                    closing = True
+                    break
+                batch.append(event)
+            self.flush(batch)
+            if closing:
+                return
+
+    def flush(self, batch):
+        try:
+            self.write(batch)
+        except Exception as e:
+            # A broken log must not take the game down with it
+            print(f"Event sink write failed: {e}", file=sys.stderr)
+        self.written += len(batch)
+        self.batches += 1
+
+    def close(self, timeout=2.0):
+        """Write out what is queued and stop the thread"""
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+
+def format_event(event):
+    return f"[tick {event.tick}] {event.kind} at ({event.x:.0f}, {event.y:.0f}), score {event.score}"
+
+
+def stream_writer(stream=None):
+    """write(batch) for AsyncSink: one line per event, one write and flush per batch.
+
+    Without a stream, whatever sys.stdout is at the time of writing is used.
+    """
+    def write(batch):
+        out = stream or sys.stdout
+        out.write("".join(format_event(event) + "\n" for event in batch))
+        out.flush()
+    return write
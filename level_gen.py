@@ -0,0 +1,291 @@
+"""Seeded procedural levels for platformer_v2, checked by a reachability solver.
+
+The generator grows platforms off the ones already placed, so most land
+within jumping distance, then puts enemy patrols on some platforms and
+coins over others. Any level where the solver cannot reach every coin is
+thrown away and the next candidate is drawn from the same seed, so a seed
+always gives the same level.
+
+The solver works on the player's own physics. Jump and fall arcs are
+stepped once from Player.jump_power, gravity and speed, tick by tick as
+Player.update moves, into tables indexed by height difference: the last tick a
+jump or a walk off an edge can land at that height, and the ticks the
+player's body overlaps a coin there. The player steers freely in the air,
+so by tick t it can be up to speed * t px sideways from where it left;
+comparing that with the horizontal gap between two platforms decides an
+edge of the platform graph for every pair at once. A search from the
+platform the player spawns onto gives the reachable platforms, and a coin
+is reachable if some jump or fall from one of them passes through it.
+
+The solver is optimistic about what is in the way: platforms a jump would
+land on early and enemies on the path are assumed to be steered around.
+
+Usage:  python level_gen.py COUNT [FIRST SEED] [OUT DIR]
+"""
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+import pygame
+
+import levels
+import platformer_v2
+
+# Where GameState puts the player
+SPAWN = (100, 100)
+
+# Ticks for a height that is never reached; negative, so no gap is ever within speed * NEVER
+NEVER = -1
+
+Reach = namedtuple('Reach', ['start', 'platforms', 'coins'])
+
+
+class JumpTable:
+    """When the player's arcs reach each height, for every whole-pixel height difference.
+
+    Heights are measured down from the feet at take-off, like screen y, over
+    [low, depth]. landing gives the last tick at which a jump or a walk off
+    an edge can still land on a platform top that much lower, for a player
+    that only gets over it late; touch the last tick of a jump, and the first
+    of a fall, at which the body overlaps a coin whose top is that much lower.
+    """
+
+    def __init__(self, speed, jump_power, gravity, width, height, coin_size, depth=1024):
+        self.speed = speed
+        self.width = width
+        self.height = height
+        self.coin_size = coin_size
+        jump = arc(jump_power, gravity, depth)
+        drop = arc(0, gravity, depth)
+        self.low = int(np.floor(jump[0].min())) - height - coin_size
+        self.heights = np.arange(self.low, depth + 1)
+
+        self.jump_landing = self.landing_ticks(*jump)
+        self.drop_landing = self.landing_ticks(*drop)
+        # A jump is over once it lands back on the platform it left, the first time it can
+        back = int(self.landing_ticks(*jump, last=False)[-self.low])
+        self.jump_touch = self.touch_ticks(jump[0][:back + 1], last=True)
+        self.drop_touch = self.touch_ticks(drop[0][1:], last=False, first=1)
+
+    @classmethod
+    def from_player(cls, depth=1024):
+        """Table for platformer_v2's Player and Coin as they are now"""
+        player = platformer_v2.Player(0, 0)
+        coin = platformer_v2.Coin(0, 0)
+        return cls(player.speed, player.jump_power, player.gravity, player.width, player.height,
+                   coin.width, depth)
+
+    def landing_ticks(self, feet, vel, last=True):
+        """Last (or first) tick of the arc that lands on a top at each height"""
+        ticks = np.full(len(self.heights), NEVER, dtype=np.int64)
+        dh = self.heights
+        # Whichever tick is written last is the one left standing
+        order = range(1, len(feet)) if last else range(len(feet) - 1, 0, -1)
+        for t in order:
+            if vel[t] <= 0:
+                continue
+            # Falling into a top (Player.check_collisions), or past it since the last tick
+            hit = ((dh > feet[t] - self.height) & (dh < feet[t])) | ((dh >= feet[t - 1]) & (dh < feet[t]))
+            ticks[hit] = t
+        return ticks
+
+    def touch_ticks(self, feet, last, first=0):
+        """Last (or first) tick at which the body overlaps a coin at each height; feet start at tick first"""
+        ticks = np.full(len(self.heights), NEVER, dtype=np.int64)
+        dh = self.heights
+        order = range(len(feet)) if last else range(len(feet) - 1, -1, -1)
+        for i in order:
+            hit = (dh < feet[i]) & (dh + self.coin_size > feet[i] - self.height)
+            ticks[hit] = i + first
+        return ticks
+
+    def lookup(self, table, dh):
+        """table at each height difference in dh, NEVER outside the table"""
+        index = dh - self.low
+        inside = (index >= 0) & (index < len(table))
+        return np.where(inside, table[np.clip(index, 0, len(table) - 1)], NEVER)
+
+
+def arc(vel, gravity, depth):
+    """(feet, vel) per tick, from 0 at take-off until the feet are depth px below it"""
+    feet = [0.0]
+    vels = [vel]
+    y = 0.0
+    while y <= depth:
+        vel += gravity
+        y += vel
+        feet.append(y)
+        vels.append(vel)
+    return np.array(feet), np.array(vels)
+
+
+_default_table = None
+
+
+def default_table():
+    global _default_table
+    if _default_table is None:
+        _default_table = JumpTable.from_player()
+    return _default_table
+
+
+def gap(lo_a, hi_a, lo_b, hi_b):
+    """Distance between the ranges [lo_a, hi_a] and [lo_b, hi_b], 0 if they meet"""
+    return np.maximum(0, np.maximum(lo_b - hi_a, lo_a - hi_b))
+
+
+def solve(level, table=None, spawn=SPAWN):
+    """Reach(start, platforms, coins) for a levels.Level.
+
+    start is the platform the player first lands on (-1 if it falls out of
+    the world), platforms and coins are boolean masks of what can be reached.
+    """
+    table = table or default_table()
+    platforms, coins = level.platforms, level.coins
+    width, height, speed = table.width, table.height, table.speed
+
+    left = platforms['x'].astype(np.int64)
+    right = left + platforms['width']
+    top = platforms['y'].astype(np.int64)
+    # The world is the platforms and the screen, as platformer_v2.level_bounds makes it
+    world_left = min(0, int(left.min(initial=0)))
+    world_right = max(platformer_v2.SCREEN_WIDTH, int(right.max(initial=0)))
+
+    # Player x positions that stand on each platform
+    lo = np.maximum(left - width + 1, world_left)
+    hi = np.minimum(right - 1, world_right - width)
+    # Walking off an edge starts just clear of it, if the world goes on there
+    off_left = np.where(left - width >= world_left, left - width, np.iinfo(np.int32).min)
+    off_right = np.where(right <= world_right - width, right, np.iinfo(np.int32).max)
+
+    def edge_reach(ticks, lo_b, hi_b):
+        """True where a fall starting off either edge of a platform steers into [lo_b, hi_b] in time"""
+        distance = np.minimum(gap(off_left[:, None], off_left[:, None], lo_b, hi_b),
+                              gap(off_right[:, None], off_right[:, None], lo_b, hi_b))
+        return distance <= speed * ticks
+
+    # Platform graph: a jump or a fall from row to column lands in time to be there
+    dh = top[None, :] - top[:, None]
+    jump = table.lookup(table.jump_landing, dh)
+    drop = table.lookup(table.drop_landing, dh)
+    edges = gap(lo[:, None], hi[:, None], lo[None, :], hi[None, :]) <= speed * jump
+    edges |= edge_reach(drop, lo[None, :], hi[None, :])
+
+    x, y = spawn
+    under = (lo <= x) & (x <= hi) & (top > y)
+    start = int(np.flatnonzero(under)[np.argmin(top[under])]) if under.any() else -1
+
+    reached = np.zeros(len(platforms), dtype=bool)
+    if start >= 0:
+        reached[start] = True
+        frontier = reached.copy()
+        while frontier.any():
+            frontier = edges[frontier].any(axis=0) & ~reached
+            reached |= frontier
+
+    # Coins: some jump or fall from a reached platform overlaps them in time
+    sources = np.flatnonzero(reached)
+    coin_lo = coins['x'].astype(np.int64)[None, :] - width + 1
+    coin_hi = coin_lo + width + table.coin_size - 2
+    dc = coins['y'].astype(np.int64)[None, :] - top[sources, None]
+    jump = table.lookup(table.jump_touch, dc)
+    drop = table.lookup(table.drop_touch, dc)
+    hit = gap(lo[sources, None], hi[sources, None], coin_lo, coin_hi) <= speed * jump
+    distance = np.minimum(gap(off_left[sources, None], off_left[sources, None], coin_lo, coin_hi),
+                          gap(off_right[sources, None], off_right[sources, None], coin_lo, coin_hi))
+    hit |= distance <= speed * drop
+    return Reach(start, reached, hit.any(axis=0))
+
+
+def reachable(level, table=None):
+    """True if every coin of level can be collected"""
+    return bool(solve(level, table).coins.all())
+
+
+def place(rng, width, platform_count, enemy_count, coin_count):
+    """One candidate Level: ground with pits, platforms, patrols and coins; not checked"""
+    ground_y = platformer_v2.SCREEN_HEIGHT - 40
+    placed = []
+    x = 0
+    while x < width:
+        # The first stretch of ground is under the spawn point
+        length = min(rng.randrange(240, 640, 40), width - x)
+        if length < 20 and placed:
+            # Clipped by the level's end to less than a coin is wide; nothing could go on it
+            break
+        placed.append(pygame.Rect(x, ground_y, length, 40))
+        x += length + rng.randrange(60, 141, 20)
+    ground = len(placed)
+
+    for _ in range(platform_count):
+        for _ in range(8):
+            anchor = rng.choice(placed)
+            w = rng.randrange(60, 181, 20)
+            y = min(max(anchor.top + rng.randrange(-180, 61, 20), 60), ground_y - 40)
+            x = min(max(anchor.left + rng.randrange(-w - 120, anchor.width + 121), 0), width - w)
+            rect = pygame.Rect(x, y, w, 20)
+            # Room to stand between platforms, above and below
+            if rect.inflate(40, 100).collidelist(placed) < 0:
+                placed.append(rect)
+                break
+
+    enemies = []
+    patrols = [rect for rect in placed[1:] if rect.width >= 80]
+    for rect in rng.sample(patrols, min(enemy_count, len(patrols))):
+        enemies.append((rng.randrange(rect.left, rect.right - 25), rect.top - 25, rect.left, rect.right))
+
+    coins = []
+    for _ in range(coin_count):
+        rect = rng.choice(placed[1:] or placed)
+        coin = pygame.Rect(rng.randrange(rect.left, rect.right - 19), rect.top - 20 - rng.randrange(0, 141, 10), 20, 20)
+        if coin.collidelist(placed) < 0:
+            coins.append((coin.x, coin.y))
+
+    records = [(rect.x, rect.y, rect.width, rect.height, 0 if i < ground else i - ground + 1)
+               for i, rect in enumerate(placed)]
+    return levels.Level(np.array(records, dtype=levels.PLATFORM), np.array(enemies, dtype=levels.ENEMY),
+                        np.array(coins, dtype=levels.COIN))
+
+
+def generate(seed, width=platformer_v2.SCREEN_WIDTH * 3, platforms=30, enemies=6, coins=30,
+             table=None, attempts=100):
+    """Level drawn from seed whose every coin the solver can reach.
+
+    Raises levels.LevelError if no candidate in attempts passes.
+    """
+    rng = random.Random(seed)
+    for _ in range(attempts):
+        level = place(rng, width, platforms, enemies, coins)
+        if len(level.coins) and reachable(level, table):
+            return level
+    raise levels.LevelError(f"no reachable level for seed {seed} in {attempts} attempts")
+
+
+def build_level(seed):
+    """Game objects of generate(seed), as a batch_sim level_factory"""
+    return levels.build(generate(seed), platformer_v2.Platform, platformer_v2.Enemy, platformer_v2.Coin)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    first = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    out = sys.argv[3] if len(sys.argv) > 3 else None
+    if out:
+        os.makedirs(out, exist_ok=True)
+
+    start = time.perf_counter()
+    for seed in range(first, first + count):
+        level = generate(seed)
+        if out:
+            with open(os.path.join(out, f"level_{seed}.txt"), "w") as f:
+                f.write(f"# level_gen.py seed {seed}\n")
+                f.write(levels.format_text(level))
+    elapsed = time.perf_counter() - start
+    print(f"{count} levels in {elapsed:.2f} s ({count / elapsed:.0f} levels/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Level files: an editable text form and a compiled, memory-mapped binary form.
+
+Text levels have one object per line; '#' starts a comment:
+
+    platform X Y WIDTH HEIGHT [NUMBER]
+    enemy X Y PATROL_LEFT PATROL_RIGHT
+    coin X Y
+
+Compiled levels keep the same records as fixed-size little-endian arrays,
+plus a table of which records touch each vertical chunk of the world.
+Opening one maps the file and reads the header, whatever the level size;
+ChunkStream then follows a view and hands out only the nearby records.
+
+Usage:  python levels.py compile LEVEL.txt LEVEL.lvl [chunk width]
+        python levels.py text LEVEL.lvl
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from collections import namedtuple
+
+import numpy as np
+import pygame
+
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
+
+PLATFORM = np.dtype([('x', '<i4'), ('y', '<i4'), ('width', '<i4'), ('height', '<i4'), ('number', '<i4')])
+ENEMY = np.dtype([('x', '<i4'), ('y', '<i4'), ('left', '<i4'), ('right', '<i4')])
+COIN = np.dtype([('x', '<i4'), ('y', '<i4')])
+
+FIELDS = {'platform': PLATFORM, 'enemy': ENEMY, 'coin': COIN}
+
+MAGIC = b"MLVL"
+VERSION = 1
+
+# magic, version, chunk width, world bounds (x, y, w, h), record counts, reference counts,
+# number of chunks, level digest
+HEADER = struct.Struct("<4sB3xI4i3I3II20s")
+
+Level = namedtuple('Level', ['platforms', 'enemies', 'coins'])
+
+
+class LevelError(Exception):
+    pass
+
+
+def parse(text, name="<level>"):
+    """Text level -> Level of structured arrays"""
+    records = {kind: [] for kind in FIELDS}
+    for lineno, line in enumerate(text.splitlines(), 1):
+        words = line.split("#", 1)[0].split()
+        if not words:
+            continue
+        kind, values = words[0], words[1:]
+        dtype = FIELDS.get(kind)
+        if dtype is None:
+            raise LevelError(f"{name}:{lineno}: unknown object '{kind}'")
+        expected = len(dtype.names)
+        if kind == 'platform' and len(values) == expected - 1:
+            values.append("0")
+        if len(values) != expected:
+            raise LevelError(f"{name}:{lineno}: {kind} takes {expected} numbers, got {len(values)}")
+        try:
+            records[kind].append(tuple(int(value) for value in values))
+        except ValueError:
+            raise LevelError(f"{name}:{lineno}: {kind} coordinates must be whole numbers") from None
+    return Level(*(np.array(records[kind], dtype=FIELDS[kind]) for kind in FIELDS))
+
+
+def format_text(level):
+    lines = []
+    for platform in level.platforms.tolist():
+        lines.append("platform %d %d %d %d %d" % platform)
+    for enemy in level.enemies.tolist():
+        lines.append("enemy %d %d %d %d" % enemy)
+    for coin in level.coins.tolist():
+        lines.append("coin %d %d" % coin)
+    return "\n".join(lines) + "\n"
+
+
+def load_text(path):
+    with open(path) as f:
+        return parse(f.read(), path)
+
+
+def is_compiled(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load(path):
+    """Level from a text or compiled file, fully in memory"""
+    if not is_compiled(path):
+        return load_text(path)
+    with LevelFile(path) as level_file:
+        return Level(*(np.array(records) for records in level_file.records))
+
+
+def level_path(name):
+    """Path of a level shipped in the levels directory"""
+    return os.path.join(LEVEL_DIR, name)
+
+
+def build(level, make_platform, make_enemy, make_coin):
+    """Game objects for every record: make_platform(x, y, width, height, number) and so on"""
+    return (
+        [make_platform(*record) for record in level.platforms.tolist()],
+        [make_enemy(*record) for record in level.enemies.tolist()],
+        [make_coin(*record) for record in level.coins.tolist()],
+    )
+
+
+def digest(level):
+    """Identity of the level contents, independent of how it is chunked"""
+    sha = hashlib.sha1()
+    for records in level:
+        sha.update(np.ascontiguousarray(records).tobytes())
+    return sha.digest()
+
+
+def bounds(level):
+    """Smallest rect holding every platform, patrol and coin position"""
+    platforms, enemies, coins = level
+    lefts, rights = zip(*extents(level))
+    tops = (platforms['y'], enemies['y'], coins['y'])
+    bottoms = (platforms['y'] + platforms['height'], enemies['y'] + 1, coins['y'] + 1)
+    if not any(len(values) for values in lefts):
+        return pygame.Rect(0, 0, 0, 0)
+    left = min(int(values.min()) for values in lefts if len(values))
+    right = max(int(values.max()) for values in rights if len(values))
+    top = min(int(values.min()) for values in tops if len(values))
+    bottom = max(int(values.max()) for values in bottoms if len(values))
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def extents(level):
+    """(left, right) world x range of every record of each kind; enemies span their patrol"""
+    platforms, enemies, coins = level
+    return (
+        (platforms['x'], platforms['x'] + platforms['width']),
+        (enemies['left'], enemies['right']),
+        (coins['x'], coins['x'] + 1),
+    )
+
+
+def chunk_table(left, right, origin, chunk_width, chunk_count):
+    """(starts, refs): the rows touching chunk i are refs[starts[i]:starts[i + 1]]"""
+    first = (np.asarray(left, dtype=np.int64) - origin) // chunk_width
+    last = (np.maximum(left, np.asarray(right) - 1).astype(np.int64) - origin) // chunk_width
+    spans = last - first + 1
+    rows = np.repeat(np.arange(len(first), dtype=np.uint32), spans)
+    # Chunk of each (row, chunk) pair: first chunk of the row plus its position within the span
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(spans) - spans, spans)
+    chunks = np.repeat(first, spans) + offsets
+    order = np.argsort(chunks, kind="stable")
+    counts = np.bincount(chunks, minlength=chunk_count)
+    starts = np.zeros(chunk_count + 1, dtype=np.uint32)
+    np.cumsum(counts, out=starts[1:])
+    return starts, rows[order]
+
+
+def compile_level(level, path, chunk_width=1024):
+    """Write level in the binary form, split into chunks chunk_width pixels wide"""
+    world = bounds(level)
+    chunk_count = max(1, -(-world.width // chunk_width))
+    tables = [chunk_table(left, right, world.x, chunk_width, chunk_count) for left, right in extents(level)]
+
+    header = HEADER.pack(
+        MAGIC, VERSION, chunk_width, world.x, world.y, world.width, world.height,
+        *(len(records) for records in level), *(len(refs) for _, refs in tables),
+        chunk_count, digest(level),
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for records in level:
+            f.write(np.ascontiguousarray(records).tobytes())
+        for starts, refs in tables:
+            f.write(starts.tobytes())
+            f.write(refs.tobytes())
+    os.replace(tmp_path, path)
+
+
+class LevelFile:
+    """A compiled level mapped into memory; records are read-only views of the file.
+
+    The OS pages in only the parts that are touched, so opening a level
+    costs the same however many objects it has. close() it, or use it as a
+    context manager, once nothing reads the records any more.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < HEADER.size:
+            raise LevelError(f"{path} is too short to be a compiled level")
+        (magic, version, self.chunk_width, x, y, width, height, *counts,
+         self.chunk_count, self.digest) = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise LevelError(f"{path} is not a compiled level")
+        if version != VERSION:
+            raise LevelError(f"{path} has unsupported level version {version}")
+        self.bounds = pygame.Rect(x, y, width, height)
+
+        record_counts, ref_counts = counts[:3], counts[3:]
+        offset = HEADER.size
+        self.records = []
+        for dtype, count in zip(FIELDS.values(), record_counts):
+            self.records.append(self.view(dtype, count, offset))
+            offset += dtype.itemsize * count
+        self.tables = []
+        for count in ref_counts:
+            starts = self.view(np.uint32, self.chunk_count + 1, offset)
+            offset += starts.nbytes
+            refs = self.view(np.uint32, count, offset)
+            offset += refs.nbytes
+            self.tables.append((starts, refs))
+        self.platforms, self.enemies, self.coins = self.records
+
+    def close(self):
+        """Unmap the file; its records and tables can no longer be read"""
+        # The map refuses to close while numpy views still export its buffer
+        self.records = self.tables = []
+        self.platforms = self.enemies = self.coins = None
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def view(self, dtype, count, offset):
+        try:
+            return np.frombuffer(self.map, dtype=dtype, count=count, offset=offset)
+        except ValueError:
+            raise LevelError(f"{self.path} is truncated") from None
+
+    def chunk_range(self, left, right):
+        """First and last chunk overlapping world x in [left, right), clamped to the level"""
+        first = (left - self.bounds.x) // self.chunk_width
+        last = (right - 1 - self.bounds.x) // self.chunk_width
+        return max(0, first), min(self.chunk_count - 1, last)
+
+    def rows(self, kind, first, last):
+        """Sorted, unique rows of records of kind (0 platforms, 1 enemies, 2 coins) in chunks first..last"""
+        if first > last:
+            return np.empty(0, dtype=np.int64)
+        starts, refs = self.tables[kind]
+        found = refs[starts[first]:starts[last + 1]]
+        if first == last:
+            return found.astype(np.int64)
+        return np.unique(found).astype(np.int64)
+
+
+class ChunkStream:
+    """Keeps the chunks around a view loaded and lists the records they hold.
+
+    update() is called with the view every tick; it only does work when the
+    view crosses into another chunk, and then reports that the rows changed.
+    Only the rows of the loaded chunks are ever materialised, so memory is
+    bounded by the view size rather than the level size.
+    """
+
+    def __init__(self, level_file, margin):
+        self.level_file = level_file
+        self.margin = margin
+        self.loaded = None
+        self.area = (0, 0)  # world x range of the loaded chunks
+        self.platform_rows = self.enemy_rows = self.coin_rows = np.empty(0, dtype=np.int64)
+        self.loads = 0
+
+    def update(self, view):
+        loaded = self.level_file.chunk_range(view.left - self.margin, view.right + self.margin)
+        if loaded == self.loaded:
+            return False
+        self.loaded = loaded
+        level_file = self.level_file
+        first, last = loaded
+        origin = level_file.bounds.x
+        self.area = (origin + first * level_file.chunk_width, origin + (last + 1) * level_file.chunk_width)
+        self.platform_rows = level_file.rows(0, *loaded)
+        self.enemy_rows = level_file.rows(1, *loaded)
+        self.coin_rows = level_file.rows(2, *loaded)
+        self.loads += 1
+        return True
+
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == "compile":
+        chunk_width = int(sys.argv[4]) if len(sys.argv) > 4 else 1024
+        level = load(sys.argv[2])
+        compile_level(level, sys.argv[3], chunk_width)
+        print(f"{sys.argv[3]}: {len(level.platforms)} platforms, {len(level.enemies)} enemies, "
+              f"{len(level.coins)} coins, {os.path.getsize(sys.argv[3]):,} bytes")
+    elif len(sys.argv) == 3 and sys.argv[1] == "text":
+        sys.stdout.write(format_text(load(sys.argv[2])))
+    else:
+        print(__doc__.strip().split("\n\n")[-1])
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
 import pygame
 import sys
 import random
+from spatial import SpatialHash
+import collision
+from render_layers import DirtyRenderer
+from timestep import FixedTimestep, lerp
+import levels
 
 pygame.init()
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+# Frames are drawn between physics ticks, so the display can run faster (or slower) than FPS
+RENDER_FPS = 144
+# Per-tick moves longer than this are teleports, drawn without blending
+TELEPORT = 64
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -18,6 +27,9 @@ YELLOW = (255, 255, 0)
 PURPLE = (128, 0, 128)
 
 class Player:
+    __slots__ = ("x", "y", "width", "height", "vel_x", "vel_y", "speed", "jump_power", "gravity", "on_ground",
+                 "rect", "previous_x", "previous_y", "shown")
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -30,6 +42,13 @@ class Player:
         self.gravity = 0.8
         self.on_ground = False
         self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.remember()
+        self.shown = self.rect.copy()
+    
+    def remember(self):
+        """Keep the position at the start of a tick, to draw frames in between from"""
+        self.previous_x = self.x
+        self.previous_y = self.y
     
     def update(self, platforms):
         keys = pygame.key.get_pressed()
@@ -46,8 +65,7 @@ class Player:
         
         self.vel_y += self.gravity
         
-        self.x += self.vel_x
-        self.y += self.vel_y
+        self.check_collisions(platforms)
         
         self.rect.x = self.x
         self.rect.y = self.y
@@ -55,8 +73,6 @@ class Player:
         if self.y > SCREEN_HEIGHT:
             return "respawn"
         
-        self.check_collisions(platforms)
-        
         if self.x < 0:
             self.x = 0
         elif self.x + self.width > SCREEN_WIDTH:
@@ -66,22 +82,43 @@ class Player:
         self.rect.y = self.y
     
     def check_collisions(self, platforms):
+        """Move by the velocity, sideways then vertically, stopping at the first platform in the way.
+        
+        Each move is swept, so no speed is fast enough to pass through a platform.
+        """
         self.on_ground = False
         
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.vel_y > 0:
-                    self.y = platform.top - self.height
-                    self.vel_y = 0
-                    self.on_ground = True
-                elif self.vel_y < 0:
-                    self.y = platform.bottom
-                    self.vel_y = 0
+        if self.vel_x:
+            box = (self.x, self.y, self.width, self.height)
+            _, platform = collision.first_hit(
+                box, self.vel_x, 0, platforms.query_rect(collision.swept_rect(box, self.vel_x, 0)))
+            if platform is None:
+                self.x += self.vel_x
+            elif self.vel_x > 0:
+                self.x = platform.left - self.width
+            else:
+                self.x = platform.right
+        
+        if self.vel_y:
+            box = (self.x, self.y, self.width, self.height)
+            _, platform = collision.first_hit(
+                box, 0, self.vel_y, platforms.query_rect(collision.swept_rect(box, 0, self.vel_y)))
+            if platform is None:
+                self.y += self.vel_y
+            elif self.vel_y > 0:
+                self.y = platform.top - self.height
+                self.vel_y = 0
+                self.on_ground = True
+            else:
+                self.y = platform.bottom
+                self.vel_y = 0
     
-    def draw(self, screen):
-        pygame.draw.rect(screen, BLUE, self.rect)
+    def draw(self, screen, rect=None):
+        return pygame.draw.rect(screen, BLUE, rect or self.rect)
 
 class Platform:
+    __slots__ = ("rect",)
+    
     def __init__(self, x, y, width, height):
         self.rect = pygame.Rect(x, y, width, height)
     
@@ -89,6 +126,9 @@ class Platform:
         pygame.draw.rect(screen, BROWN, self.rect)
 
 class Enemy:
+    __slots__ = ("x", "y", "width", "height", "speed", "direction", "platform_left", "platform_right", "rect",
+                 "previous_x", "previous_y", "shown")
+    
     def __init__(self, x, y, platform_left, platform_right):
         self.x = x
         self.y = y
@@ -99,6 +139,12 @@ class Enemy:
         self.platform_left = platform_left
         self.platform_right = platform_right
         self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.remember()
+        self.shown = self.rect.copy()
+    
+    def remember(self):
+        self.previous_x = self.x
+        self.previous_y = self.y
     
     def update(self):
         self.x += self.speed * self.direction
@@ -109,24 +155,34 @@ class Enemy:
         self.rect.x = self.x
         self.rect.y = self.y
     
-    def draw(self, screen):
-        pygame.draw.rect(screen, RED, self.rect)
+    def draw(self, screen, rect=None):
+        return pygame.draw.rect(screen, RED, rect or self.rect)
 
 class Coin:
+    __slots__ = ("x", "y", "width", "height", "rect", "center", "collected")
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.width = 20
         self.height = 20
         self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.center = self.rect.center
         self.collected = False
     
     def draw(self, screen):
         if not self.collected:
-            pygame.draw.circle(screen, YELLOW, (self.x + self.width//2, self.y + self.height//2), self.width//2)
-            pygame.draw.circle(screen, BLACK, (self.x + self.width//2, self.y + self.height//2), self.width//2, 2)
+            pygame.draw.circle(screen, YELLOW, self.center, self.width//2)
+            pygame.draw.circle(screen, BLACK, self.center, self.width//2, 2)
+
+def blend(obj, alpha):
+    """obj.shown moved alpha of the way from obj's remembered position to where it is now"""
+    shown = obj.shown
+    shown.x = round(lerp(obj.previous_x, obj.x, alpha, TELEPORT))
+    shown.y = round(lerp(obj.previous_y, obj.y, alpha, TELEPORT))
+    return shown
 
-def main():
+def main(dirty=False, render_fps=RENDER_FPS):
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Simple Platformer")
     clock = pygame.time.Clock()
@@ -135,35 +191,39 @@ def main():
     player = Player(100, 100)
     score = 0
     
-    platforms = [
-        Platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40),
-        Platform(200, 500, 200, 20),
-        Platform(500, 400, 200, 20),
-        Platform(100, 350, 150, 20),
-        Platform(600, 250, 150, 20),
-        Platform(300, 180, 100, 20),
-    ]
-    
-    enemies = [
-        Enemy(220, 475, 200, 400),
-        Enemy(520, 375, 500, 700),
-        Enemy(120, 325, 100, 250),
-        Enemy(620, 225, 600, 750),
-    ]
-    
-    coins = [
-        Coin(250, 470),
-        Coin(350, 470),
-        Coin(550, 370),
-        Coin(650, 370),
-        Coin(150, 320),
-        Coin(200, 320),
-        Coin(650, 220),
-        Coin(700, 220),
-        Coin(350, 150),
-        Coin(50, 540),
-        Coin(750, 540),
-    ]
+    platforms, enemies, coins = levels.build(
+        levels.load_text(levels.level_path("platformer.txt")),
+        lambda x, y, width, height, number: Platform(x, y, width, height), Enemy, Coin,
+    )
+    
+    platform_index = SpatialHash()
+    for platform in platforms:
+        platform_index.insert(platform.rect)
+    coin_index = SpatialHash()
+    for coin in coins:
+        coin_index.insert(coin)
+    enemy_index = SpatialHash()
+    for enemy in enemies:
+        enemy_index.insert(enemy)
+    
+    def paint_background(surface):
+        surface.fill(WHITE)
+        for platform in platforms:
+            platform.draw(surface)
+        for coin in coins:
+            coin.draw(surface)
+    
+    # Platforms and coins only change when a coin is taken, so they can stay on the
+    # canvas while just the moving sprites and the score are redrawn and pushed
+    renderer = DirtyRenderer(screen, paint_background) if dirty else None
+    
+    # Physics runs at a fixed rate; frames show the player and enemies part of
+    # the way from where the last tick started to where it ended
+    timestep = FixedTimestep(FPS)
+    movers = [player] + enemies
+    
+    # Re-rendered only when the score changes
+    shown_score = score_text = None
     
     running = True
     while running:
@@ -174,47 +234,81 @@ def main():
                 if event.key == pygame.K_ESCAPE:
                     running = False
         
-        result = player.update([platform.rect for platform in platforms])
-        if result == "respawn":
-            player.x = 100
-            player.y = 100
-            player.vel_y = 0
-            score = max(0, score - 5)
-        
-        for enemy in enemies:
-            enemy.update()
-            if player.rect.colliderect(enemy.rect):
+        for _ in range(timestep.steps()):
+            for mover in movers:
+                mover.remember()
+            
+            result = player.update(platform_index)
+            if result == "respawn":
+                player.x = 100
+                player.y = 100
+                player.vel_y = 0
+                score = max(0, score - 5)
+            
+            for enemy in enemies:
+                enemy.update()
+                enemy_index.move(enemy)
+            
+            for enemy in enemy_index.query_rect(player.rect):
                 player.x = 100
                 player.y = 100
                 player.vel_y = 0
                 score = max(0, score - 10)
+            
+            for coin in coin_index.query_rect(player.rect):
+                if not coin.collected:
+                    coin.collected = True
+                    score += 10
+                    if renderer:
+                        renderer.repaint(coin.rect)
         
-        for coin in coins:
-            if not coin.collected and player.rect.colliderect(coin.rect):
-                coin.collected = True
-                score += 10
-        
-        screen.fill(WHITE)
-        
-        for platform in platforms:
-            platform.draw(screen)
-        
-        for enemy in enemies:
-            enemy.draw(screen)
-        
-        for coin in coins:
-            coin.draw(screen)
-        
-        player.draw(screen)
+        alpha = timestep.alpha
+        for mover in movers:
+            blend(mover, alpha)
         
-        score_text = font.render(f"Score: {score}", True, BLACK)
-        screen.blit(score_text, (10, 10))
+        if score != shown_score:
+            shown_score = score
+            score_text = font.render(f"Score: {score}", True, BLACK)
         
-        pygame.display.flip()
-        clock.tick(FPS)
+        if renderer:
+            renderer.begin()
+            for enemy in enemies:
+                renderer.add(enemy.draw(screen, enemy.shown))
+            # Coins sit above enemies in the full redraw
+            for enemy in enemies:
+                for coin in coin_index.query_rect(enemy.shown):
+                    if not coin.collected:
+                        coin.draw(screen)
+                        renderer.add(coin.rect)
+            renderer.add(player.draw(screen, player.shown))
+            renderer.blit(score_text, (10, 10))
+            renderer.present()
+        else:
+            screen.fill(WHITE)
+            
+            for platform in platforms:
+                platform.draw(screen)
+            
+            for enemy in enemies:
+                enemy.draw(screen, enemy.shown)
+            
+            for coin in coins:
+                coin.draw(screen)
+            
+            player.draw(screen, player.shown)
+            
+            screen.blit(score_text, (10, 10))
+            
+            pygame.display.flip()
+        timestep.advance(clock.tick(render_fps) / 1000)
     
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # platformer.py [--dirty] [--fps N]
+    # --dirty redraws and pushes only the regions that changed; --fps caps the
+    # drawing rate (0 for none) while physics stays at FPS ticks per second
+    args = sys.argv[1:]
+    render_fps = int(args[args.index("--fps") + 1]) if "--fps" in args else RENDER_FPS
+    main(dirty="--dirty" in args, render_fps=render_fps)
\ No newline at end of file
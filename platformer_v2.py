@@ -1,15 +1,40 @@
 import pygame
+import gc
 import sys
 import random
+import hashlib
+import struct
+import time
+from collections import namedtuple
 import numpy as np
-
-pygame.init()
-pygame.mixer.pre_init(frequency=22050, size=-16, channels=2, buffer=128)
-pygame.mixer.init()
+import synth
+from sound_cache import SoundCache, cached_sound
+from audio import AudioEngine, open_mixer
+from event_bus import AsyncSink, EventBus, EventCounter, GameEvent, stream_writer
+from render_layers import TiledLayer
+from sprites import PaintedSprite, PixelSprite, SpriteCache
+from spatial import SpatialHash
+from camera import Camera
+import collision
+from entity_store import CoinStore, EnemyStore
+from timestep import FixedTimestep, lerp
+import replay
+import levels
+from profiler import AllocationMeter, Profiler, ProfilerOverlay
+from text_cache import FontRegistry, TextCache
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+# Frames are drawn between physics ticks, so the display can run faster (or slower) than FPS
+RENDER_FPS = 144
+# Per-tick moves longer than this are teleports, drawn without blending
+TELEPORT = 64
+
+# Mixer output buffer in sample frames: smaller is snappier but underruns sooner (128 = 5.8 ms at 22050 Hz)
+AUDIO_BUFFER = 128
+AUDIO_VOICES = 8
+MUSIC_BLOCK = 0.5  # seconds of music rendered at a time
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -24,157 +49,198 @@ LIGHT_BROWN = (205, 133, 63)
 ORANGE = (255, 165, 0)
 PINK = (255, 192, 203)
 
-def generate_tone(frequency, duration, sample_rate=22050):
-    """Generate a simple tone for retro-style music"""
-    frames = int(duration * sample_rate)
-    arr = np.zeros(frames)
-    
-    for i in range(frames):
-        # Square wave for retro sound
-        arr[i] = 0.15 * np.sign(np.sin(2 * np.pi * frequency * i / sample_rate))
-    
-    # Fade in/out to prevent clicks
-    fade_frames = frames // 20
-    for i in range(fade_frames):
-        arr[i] *= i / fade_frames
-        arr[frames - 1 - i] *= i / fade_frames
-    
-    return arr
+# One tick of player input; the simulation never polls pygame itself
+Inputs = namedtuple('Inputs', ['left', 'right', 'jump', 'restart'])
+NO_INPUT = Inputs(False, False, False, False)
 
-def create_background_music():
-    """Create retro-style background music"""
-    sample_rate = 22050
-    
+# Synthesis parameters, also used as the sound cache keys
+MUSIC = {
     # Simple melody notes (frequencies in Hz)
-    notes = {
+    'notes': {
         'C4': 261.63, 'D4': 293.66, 'E4': 329.63, 'F4': 349.23,
         'G4': 392.00, 'A4': 440.00, 'B4': 493.88, 'C5': 523.25,
         'D5': 587.33, 'E5': 659.25, 'F5': 698.46, 'G5': 783.99
-    }
-    
+    },
     # Simple Mario-inspired melody pattern (slower tempo)
-    melody = [
+    'melody': [
         ('E5', 0.3), ('E5', 0.3), ('E5', 0.6), ('C5', 0.3), ('E5', 0.6),
         ('G5', 0.9), ('G4', 0.9),
         ('C5', 0.6), ('G4', 0.6), ('E4', 0.9),
         ('A4', 0.6), ('B4', 0.6), ('A4', 0.6), ('G4', 0.9),
         ('E5', 0.6), ('G5', 0.6), ('A5', 0.9), ('F5', 0.3), ('G5', 0.6),
         ('E5', 0.6), ('C5', 0.3), ('D5', 0.3), ('B4', 0.9)
-    ]
-    
-    # Generate the music
-    music_data = np.array([])
-    for note, duration in melody:
-        if note in notes:
-            tone = generate_tone(notes[note], duration)
-            music_data = np.concatenate([music_data, tone])
-    
-    # Convert to pygame sound format
-    music_data = (music_data * 32767).astype(np.int16)
-    stereo_data = np.column_stack((music_data, music_data))
-    
-    return pygame.sndarray.make_sound(stereo_data)
+    ],
+}
 
-def create_jump_sound():
+# Rising pitch for jump effect
+JUMP_SOUND = {'start_freq': 300, 'end_freq': 600, 'duration': 0.2, 'amplitude': 1.5, 'fade': 1.0}
+
+# Descending pitch for death effect, fading out slowly
+DEATH_SOUND = {'start_freq': 500, 'end_freq': 80, 'duration': 0.6, 'amplitude': 1.5, 'fade': 0.9}
+
+# Bright, happy sound for coin collection: E5, G5, C6 with a less aggressive fade
+COIN_SOUND = {'frequencies': [659.25, 783.99, 1046.50], 'duration': 0.4, 'amplitude': 1.2, 'fade_depth': 0.3}
+
+# Ascending notes for success feeling: C5, E5, G5, C6 with a gentle fade
+ENEMY_DEFEAT_SOUND = {'frequencies': [523.25, 659.25, 783.99, 1046.50], 'duration': 0.4, 'amplitude': 1.0, 'fade_depth': 0.2}
+
+def render_sweep(params):
+    """Render a fading frequency sweep"""
+    frames = int(params['duration'] * synth.SAMPLE_RATE)
+    sweep = synth.sweep(params['start_freq'], params['end_freq'], frames, params['amplitude'])
+    return synth.to_pcm(sweep * (synth.fade_out(frames) * params['fade']))
+
+def render_arpeggio(params):
+    """Render a short run of notes, each with its own fade"""
+    return synth.to_pcm(synth.arpeggio(
+        params['frequencies'], params['duration'], params['amplitude'], params['fade_depth']
+    ))
+
+def stream_background_music(block_seconds=MUSIC_BLOCK):
+    """The background melody as an endless stream of blocks, rendered as it plays"""
+    return synth.stream_melody(MUSIC['melody'], MUSIC['notes'], int(block_seconds * synth.SAMPLE_RATE))
+
+def create_jump_sound(cache=None):
     """Create a jump sound effect"""
-    sample_rate = 22050
-    duration = 0.2
-    
-    # Rising pitch for jump effect
-    start_freq = 300
-    end_freq = 600
-    
-    frames = int(duration * sample_rate)
-    sound_data = np.zeros(frames)
-    
-    for i in range(frames):
-        # Frequency sweeps upward
-        freq = start_freq + (end_freq - start_freq) * (i / frames)
-        sound_data[i] = 1.5 * np.sin(2 * np.pi * freq * i / sample_rate)
-        
-        # Fade out
-        sound_data[i] *= (1 - i / frames)
-    
-    sound_data = (sound_data * 32767).astype(np.int16)
-    stereo_data = np.column_stack((sound_data, sound_data))
-    return pygame.sndarray.make_sound(stereo_data)
+    return cached_sound(cache, 'jump', JUMP_SOUND, render_sweep)
 
-def create_coin_sound():
+def create_coin_sound(cache=None):
     """Create a coin collection sound effect"""
-    sample_rate = 22050
-    duration = 0.4
-    
-    # Bright, happy sound for coin collection
-    frequencies = [659.25, 783.99, 1046.50]  # E5, G5, C6
-    
-    frames = int(duration * sample_rate)
-    sound_data = np.zeros(frames)
-    
-    for i, freq in enumerate(frequencies):
-        start_frame = i * frames // len(frequencies)
-        end_frame = (i + 1) * frames // len(frequencies)
-        
-        for j in range(start_frame, end_frame):
-            sound_data[j] = 1.2 * np.sin(2 * np.pi * freq * j / sample_rate)
-            # Fade each note
-            note_progress = (j - start_frame) / (end_frame - start_frame)
-            sound_data[j] *= (1 - note_progress * 0.3)  # Less aggressive fade
-    
-    sound_data = (sound_data * 32767).astype(np.int16)
-    stereo_data = np.column_stack((sound_data, sound_data))
-    return pygame.sndarray.make_sound(stereo_data)
+    return cached_sound(cache, 'coin', COIN_SOUND, render_arpeggio)
 
-def create_death_sound():
+def create_death_sound(cache=None):
     """Create a death sound effect"""
-    sample_rate = 22050
-    duration = 0.6
-    
-    # Descending pitch for death effect
-    start_freq = 500
-    end_freq = 80
-    
-    frames = int(duration * sample_rate)
-    sound_data = np.zeros(frames)
-    
-    for i in range(frames):
-        # Frequency sweeps downward
-        freq = start_freq + (end_freq - start_freq) * (i / frames)
-        sound_data[i] = 1.5 * np.sin(2 * np.pi * freq * i / sample_rate)
-        
-        # Fade out slowly
-        sound_data[i] *= (1 - i / frames) * 0.9
-    
-    sound_data = (sound_data * 32767).astype(np.int16)
-    stereo_data = np.column_stack((sound_data, sound_data))
-    return pygame.sndarray.make_sound(stereo_data)
+    return cached_sound(cache, 'death', DEATH_SOUND, render_sweep)
 
-def create_enemy_defeat_sound():
+def create_enemy_defeat_sound(cache=None):
     """Create a success sound for defeating enemies"""
-    sample_rate = 22050
-    duration = 0.4
+    return cached_sound(cache, 'enemy_defeat', ENEMY_DEFEAT_SOUND, render_arpeggio)
+
+# Fonts are loaded once per size and rendered strings are reused across frames
+text_cache = TextCache(FontRegistry())
+HUD_FONT_SIZE = 36
+
+# Sprites are baked into surfaces once and blitted; palette swaps share the cache
+sprite_cache = SpriteCache()
+
+PLAYER_SPRITE = PixelSprite([
+    ('hat', [
+        (4, 0), (5, 0), (6, 0), (7, 0), (8, 0), (9, 0), (10, 0),
+        (3, 1), (4, 1), (5, 1), (6, 1), (7, 1), (8, 1), (9, 1), (10, 1), (11, 1),
+    ]),
+    ('face', [
+        (4, 2), (5, 2), (6, 2), (7, 2), (8, 2), (9, 2), (10, 2),
+        (4, 3), (5, 3), (6, 3), (7, 3), (8, 3), (9, 3), (10, 3),
+        (4, 4), (5, 4), (6, 4), (7, 4), (8, 4), (9, 4), (10, 4),
+    ]),
+    ('shirt', [
+        (4, 5), (5, 5), (6, 5), (7, 5), (8, 5), (9, 5), (10, 5),
+        (4, 6), (5, 6), (6, 6), (7, 6), (8, 6), (9, 6), (10, 6),
+        (4, 7), (5, 7), (6, 7), (7, 7), (8, 7), (9, 7), (10, 7),
+        (4, 8), (5, 8), (6, 8), (7, 8), (8, 8), (9, 8), (10, 8),
+    ]),
+    ('pants', [
+        (4, 9), (5, 9), (6, 9), (7, 9), (8, 9), (9, 9), (10, 9),
+        (4, 10), (5, 10), (6, 10), (7, 10), (8, 10), (9, 10), (10, 10),
+        (4, 11), (5, 11), (6, 11), (7, 11), (8, 11), (9, 11), (10, 11),
+        (4, 12), (5, 12), (6, 12), (7, 12), (8, 12), (9, 12), (10, 12),
+    ]),
+    ('shoe', [
+        (4, 13), (5, 13), (6, 13), (7, 13), (8, 13), (9, 13), (10, 13),
+        (3, 14), (4, 14), (5, 14), (6, 14), (7, 14), (8, 14), (9, 14), (10, 14), (11, 14),
+        (3, 15), (4, 15), (5, 15), (6, 15), (7, 15), (8, 15), (9, 15), (10, 15), (11, 15),
+    ]),
+    ('eye', [(5, 3), (9, 3)]),
+    ('mustache', [(5, 4), (6, 4), (8, 4), (9, 4)]),
+    ('button', [(7, 6), (7, 7)]),
+], pixel_size=2, offset=(0, 8))
+
+PLAYER_PALETTE = {
+    'hat': RED, 'face': PINK, 'shirt': RED, 'pants': BLUE, 'shoe': BLACK,
+    'eye': BLACK, 'mustache': BLACK, 'button': YELLOW,
+}
+
+PLAYER_FLASH_PALETTE = dict(
+    PLAYER_PALETTE,
+    hat=(200, 0, 0),        # Darker red for flashing
+    face=(255, 100, 100),   # Light red for flashing
+    shirt=(200, 0, 0),      # Darker red for flashing
+    pants=(150, 0, 0),      # Dark red for flashing
+    shoe=(100, 0, 0),       # Very dark red for flashing
+)
+
+# Normal turtle sprite
+ENEMY_SPRITE = PixelSprite([
+    ('shell', [
+        (3, 2), (4, 2), (5, 2), (6, 2), (7, 2), (8, 2), (9, 2),
+        (2, 3), (3, 3), (4, 3), (5, 3), (6, 3), (7, 3), (8, 3), (9, 3), (10, 3),
+        (2, 4), (3, 4), (4, 4), (5, 4), (6, 4), (7, 4), (8, 4), (9, 4), (10, 4),
+        (2, 5), (3, 5), (4, 5), (5, 5), (6, 5), (7, 5), (8, 5), (9, 5), (10, 5),
+        (2, 6), (3, 6), (4, 6), (5, 6), (6, 6), (7, 6), (8, 6), (9, 6), (10, 6),
+        (3, 7), (4, 7), (5, 7), (6, 7), (7, 7), (8, 7), (9, 7),
+    ]),
+    ('head', [
+        (4, 0), (5, 0), (6, 0), (7, 0), (8, 0),
+        (3, 1), (4, 1), (5, 1), (6, 1), (7, 1), (8, 1), (9, 1),
+    ]),
+    ('legs', [
+        (3, 8), (4, 8), (5, 8), (6, 8), (7, 8), (8, 8), (9, 8),
+        (3, 9), (4, 9), (8, 9), (9, 9),
+        (3, 10), (4, 10), (8, 10), (9, 10),
+    ]),
+    ('eye', [(4, 1), (8, 1)]),
+    ('pattern', [
+        (4, 3), (6, 3), (8, 3),
+        (3, 4), (5, 4), (7, 4), (9, 4),
+        (4, 5), (6, 5), (8, 5),
+    ]),
+], pixel_size=2, offset=(0, 3))
+
+# Collapsed/flattened turtle sprite
+ENEMY_DEFEATED_SPRITE = PixelSprite([
+    ('shell', [
+        (2, 8), (3, 8), (4, 8), (5, 8), (6, 8), (7, 8), (8, 8), (9, 8), (10, 8),
+        (2, 9), (3, 9), (4, 9), (5, 9), (6, 9), (7, 9), (8, 9), (9, 9), (10, 9),
+    ]),
+    ('pattern', [
+        (3, 8), (5, 8), (7, 8), (9, 8),
+        (4, 9), (6, 9), (8, 9),
+    ]),
+], pixel_size=2, offset=(0, 3))
+
+ENEMY_PALETTE = {'shell': DARK_GREEN, 'head': GREEN, 'legs': GREEN, 'eye': BLACK, 'pattern': YELLOW}
+
+def paint_coin(surface, palette):
+    center_x, center_y = 10, 10
+    radius = 10
     
-    # Ascending notes for success feeling
-    frequencies = [523.25, 659.25, 783.99, 1046.50]  # C5, E5, G5, C6
+    # Main coin body (golden gradient effect)
+    pygame.draw.circle(surface, (255, 215, 0), (center_x, center_y), radius)
     
-    frames = int(duration * sample_rate)
-    sound_data = np.zeros(frames)
+    # Inner bright highlight
+    pygame.draw.circle(surface, (255, 255, 150), (center_x - 2, center_y - 2), radius//2)
     
-    for i, freq in enumerate(frequencies):
-        start_frame = i * frames // len(frequencies)
-        end_frame = (i + 1) * frames // len(frequencies)
-        
-        for j in range(start_frame, end_frame):
-            sound_data[j] = 1.0 * np.sin(2 * np.pi * freq * j / sample_rate)
-            # Fade each note
-            note_progress = (j - start_frame) / (end_frame - start_frame)
-            sound_data[j] *= (1 - note_progress * 0.2)  # Gentle fade
+    # Outer dark edge
+    pygame.draw.circle(surface, (180, 140, 0), (center_x, center_y), radius, 2)
     
-    sound_data = (sound_data * 32767).astype(np.int16)
-    stereo_data = np.column_stack((sound_data, sound_data))
-    return pygame.sndarray.make_sound(stereo_data)
+    # Add a sparkle effect
+    pygame.draw.circle(surface, (255, 255, 255), (center_x - 3, center_y - 3), 2)
+    pygame.draw.circle(surface, (255, 255, 255), (center_x + 2, center_y + 4), 1)
+
+COIN_SPRITE = PaintedSprite((20, 20), paint_coin)
+
+def bake_sprites():
+    """Render every sprite state once, after the display mode is set"""
+    sprite_cache.preload(PLAYER_SPRITE, [PLAYER_PALETTE, PLAYER_FLASH_PALETTE])
+    sprite_cache.preload(ENEMY_SPRITE, [ENEMY_PALETTE])
+    sprite_cache.preload(ENEMY_DEFEATED_SPRITE, [ENEMY_PALETTE])
+    sprite_cache.preload(COIN_SPRITE, [None])
 
 class Player:
-    def __init__(self, x, y, jump_sound=None):
+    __slots__ = ("x", "y", "width", "height", "vel_x", "vel_y", "speed", "jump_power", "gravity", "on_ground",
+                 "rect", "jump_key_pressed", "respawn_timer", "is_dead", "flash_timer", "flash_red")
+    
+    def __init__(self, x, y):
         self.x = x
         self.y = y
         self.width = 30
@@ -186,14 +252,13 @@ class Player:
         self.gravity = 0.8
         self.on_ground = False
         self.rect = pygame.Rect(x, y, self.width, self.height)
-        self.jump_sound = jump_sound
         self.jump_key_pressed = False
         self.respawn_timer = 0
         self.is_dead = False
         self.flash_timer = 0
         self.flash_red = False
     
-    def update(self, platforms):
+    def update(self, platforms, inputs, events, camera):
         # Handle respawn timer and flashing
         if self.is_dead:
             self.respawn_timer -= 1
@@ -208,27 +273,22 @@ class Player:
                 self.is_dead = False
                 self.flash_red = False
                 self.flash_timer = 0
-                self.x = 100
-                self.y = 100
-                self.vel_x = 0
-                self.vel_y = 0
+                # Back in at the same spot of the current view, not the start of the level
+                self.teleport(camera.rect.x + 100, camera.rect.y + 100)
+                events.append("respawn")
             return None
         
-        keys = pygame.key.get_pressed()
-        
         self.vel_x = 0
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if inputs.left:
             self.vel_x = -self.speed
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if inputs.right:
             self.vel_x = self.speed
         
-        jump_key_down = keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w]
+        jump_key_down = inputs.jump
         
         if jump_key_down and not self.jump_key_pressed and self.on_ground:
-            # Play sound IMMEDIATELY when key is pressed
-            if self.jump_sound:
-                print("JUMP SOUND TRIGGERED!")
-                self.jump_sound.play()
+            # Reported in the same tick so the jump sound plays immediately
+            events.append("jump")
             self.vel_y = self.jump_power
             self.on_ground = False
         
@@ -236,25 +296,37 @@ class Player:
         
         self.vel_y += self.gravity
         
+        # Platforms can be jumped through and walked past, so only the fall is swept;
+        # moving sideways first means the fall is checked against where the player now is
+        previous_bottom = self.rect.bottom
         self.x += self.vel_x
         self.y += self.vel_y
         
         self.rect.x = self.x
         self.rect.y = self.y
         
-        if self.y > SCREEN_HEIGHT:
-            return "respawn"
+        self.check_collisions(platforms, previous_bottom)
         
-        self.check_collisions(platforms)
+        if self.y > camera.world.bottom:
+            return "fall"
         
-        if self.x < 0:
-            self.x = 0
-        elif self.x + self.width > SCREEN_WIDTH:
-            self.x = SCREEN_WIDTH - self.width
+        if self.x < camera.world.left:
+            self.x = camera.world.left
+        elif self.x + self.width > camera.world.right:
+            self.x = camera.world.right - self.width
         
         self.rect.x = self.x
         self.rect.y = self.y
     
+    def teleport(self, x, y):
+        """Put the player at rest at (x, y), rect included, so the next fall is swept from there"""
+        self.x = x
+        self.y = y
+        self.vel_x = 0
+        self.vel_y = 0
+        self.rect.x = x
+        self.rect.y = y
+    
     def die(self):
         """Trigger death with flashing red effect and respawn delay"""
         if not self.is_dead:  # Only trigger if not already dead
@@ -263,459 +335,660 @@ class Player:
             self.flash_timer = 30  # Flash for 0.5 seconds before disappearing
             self.flash_red = True
     
-    def check_collisions(self, platforms):
+    def check_collisions(self, platforms, previous_bottom=None):
+        """Land on a platform the player is falling into, or fell past since previous_bottom"""
         self.on_ground = False
+        if self.vel_y <= 0:
+            return
         
-        for platform in platforms:
+        # Only platforms in the cells around the player are considered
+        landing = None
+        for platform in platforms.query_rect(self.rect):
             if self.rect.colliderect(platform):
-                if self.vel_y > 0 and self.rect.bottom > platform.top and self.y < platform.top:
-                    self.y = platform.top - self.height
-                    self.vel_y = 0
-                    self.on_ground = True
-    
-    def draw(self, screen):
-        pixel_size = 2
-        y_offset = 4
-        
-        # Color selection based on flash state
-        if self.flash_red:
-            hat_color = (200, 0, 0)      # Darker red for flashing
-            face_color = (255, 100, 100) # Light red for flashing
-            shirt_color = (200, 0, 0)    # Darker red for flashing
-            pants_color = (150, 0, 0)    # Dark red for flashing
-            shoe_color = (100, 0, 0)     # Very dark red for flashing
-        else:
-            hat_color = RED
-            face_color = PINK
-            shirt_color = RED
-            pants_color = BLUE
-            shoe_color = BLACK
-        
-        hat_pixels = [
-            (4, 0), (5, 0), (6, 0), (7, 0), (8, 0), (9, 0), (10, 0),
-            (3, 1), (4, 1), (5, 1), (6, 1), (7, 1), (8, 1), (9, 1), (10, 1), (11, 1),
-        ]
-        
-        face_pixels = [
-            (4, 2), (5, 2), (6, 2), (7, 2), (8, 2), (9, 2), (10, 2),
-            (4, 3), (5, 3), (6, 3), (7, 3), (8, 3), (9, 3), (10, 3),
-            (4, 4), (5, 4), (6, 4), (7, 4), (8, 4), (9, 4), (10, 4),
-        ]
-        
-        shirt_pixels = [
-            (4, 5), (5, 5), (6, 5), (7, 5), (8, 5), (9, 5), (10, 5),
-            (4, 6), (5, 6), (6, 6), (7, 6), (8, 6), (9, 6), (10, 6),
-            (4, 7), (5, 7), (6, 7), (7, 7), (8, 7), (9, 7), (10, 7),
-            (4, 8), (5, 8), (6, 8), (7, 8), (8, 8), (9, 8), (10, 8),
-        ]
-        
-        pants_pixels = [
-            (4, 9), (5, 9), (6, 9), (7, 9), (8, 9), (9, 9), (10, 9),
-            (4, 10), (5, 10), (6, 10), (7, 10), (8, 10), (9, 10), (10, 10),
-            (4, 11), (5, 11), (6, 11), (7, 11), (8, 11), (9, 11), (10, 11),
-            (4, 12), (5, 12), (6, 12), (7, 12), (8, 12), (9, 12), (10, 12),
-        ]
-        
-        shoe_pixels = [
-            (4, 13), (5, 13), (6, 13), (7, 13), (8, 13), (9, 13), (10, 13),
-            (3, 14), (4, 14), (5, 14), (6, 14), (7, 14), (8, 14), (9, 14), (10, 14), (11, 14),
-            (3, 15), (4, 15), (5, 15), (6, 15), (7, 15), (8, 15), (9, 15), (10, 15), (11, 15),
-        ]
-        
-        eye_pixels = [
-            (5, 3), (9, 3)
-        ]
-        
-        mustache_pixels = [
-            (5, 4), (6, 4), (8, 4), (9, 4)
-        ]
-        
-        button_pixels = [
-            (7, 6), (7, 7)
-        ]
-        
-        for px, py in hat_pixels:
-            pygame.draw.rect(screen, hat_color, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in face_pixels:
-            pygame.draw.rect(screen, face_color, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in shirt_pixels:
-            pygame.draw.rect(screen, shirt_color, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in pants_pixels:
-            pygame.draw.rect(screen, pants_color, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in shoe_pixels:
-            pygame.draw.rect(screen, shoe_color, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in eye_pixels:
-            pygame.draw.rect(screen, BLACK, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in mustache_pixels:
-            pygame.draw.rect(screen, BLACK, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in button_pixels:
-            pygame.draw.rect(screen, YELLOW, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
+                if self.rect.bottom > platform.top and self.y < platform.top:
+                    landing = platform.top
+        
+        # A fall longer than the player is tall can cross a platform entirely between
+        # two ticks; the first top crossed is where it should have stopped
+        if previous_bottom is not None and self.rect.bottom - previous_bottom > 0:
+            box = (self.rect.x, previous_bottom - self.height, self.width, self.height)
+            fall = self.rect.bottom - previous_bottom
+            _, hit = collision.first_hit(box, 0, fall, platforms.query_rect(collision.swept_rect(box, 0, fall)))
+            if hit is not None and (landing is None or hit.top < landing):
+                landing = hit.top
+        
+        if landing is not None:
+            self.y = landing - self.height
+            self.vel_y = 0
+            self.on_ground = True
+    
+    def draw(self, screen, offset=(0, 0), position=None):
+        """Blit at position (world x, y), the current position by default, shifted by offset"""
+        x, y = position if position is not None else (self.x, self.y)
+        palette = PLAYER_FLASH_PALETTE if self.flash_red else PLAYER_PALETTE
+        screen.blit(sprite_cache.get(PLAYER_SPRITE, palette), (x + offset[0], y + offset[1]))
+
+def draw_outline(screen, color, rect, width=1):
+    """Same pixels as pygame.draw.rect(..., width), but cut off cleanly at the surface edge.
+    
+    Outlines (and fills) that cross the surface edge get smeared along it by
+    pygame, which shows up as seams between background tiles, so every edge
+    is clipped here first.
+    """
+    left, top, w, h = rect
+    clip = screen.get_clip()
+    for edge in ((left, top, w, width), (left, top + h - width, w, width),
+                 (left, top, width, h), (left + w - width, top, width, h)):
+        edge = clip.clip(edge)
+        if edge:
+            screen.fill(color, edge)
 
 class Platform:
+    __slots__ = ("rect", "number")
+    
     def __init__(self, x, y, width, height, number=0):
         self.rect = pygame.Rect(x, y, width, height)
         self.number = number
     
-    def draw(self, screen):
+    def draw(self, screen, offset=(0, 0)):
+        rect = self.rect.move(offset)
+        
         # Main platform color
-        pygame.draw.rect(screen, BROWN, self.rect)
+        pygame.draw.rect(screen, BROWN, rect)
         
         # Add brick pattern
         brick_width = 20
         brick_height = 10
         
-        for y in range(self.rect.top, self.rect.bottom, brick_height):
-            for x in range(self.rect.left, self.rect.right, brick_width):
+        # Only bricks inside the target surface are drawn, so a level-wide ground costs one tile's worth
+        area = rect.clip(screen.get_clip())
+        first_x = rect.left + max(0, (area.left - rect.left) // brick_width - 1) * brick_width
+        first_y = rect.top + (area.top - rect.top) // brick_height * brick_height
+        
+        for y in range(first_y, area.bottom, brick_height):
+            for x in range(first_x, area.right, brick_width):
                 # Alternate brick pattern
-                offset = (brick_width // 2) if ((y - self.rect.top) // brick_height) % 2 else 0
-                brick_x = x + offset
+                stagger = (brick_width // 2) if ((y - rect.top) // brick_height) % 2 else 0
+                brick_x = x + stagger
                 
-                if brick_x + brick_width <= self.rect.right:
+                if brick_x + brick_width <= rect.right:
                     # Draw brick outline
-                    pygame.draw.rect(screen, (101, 67, 33), (brick_x, y, brick_width, brick_height), 1)
+                    draw_outline(screen, (101, 67, 33), (brick_x, y, brick_width, brick_height))
                     
                     # Add highlight on top and left
                     pygame.draw.line(screen, (160, 120, 80), (brick_x, y), (brick_x + brick_width - 1, y))
                     pygame.draw.line(screen, (160, 120, 80), (brick_x, y), (brick_x, y + brick_height - 1))
         
         # Platform border
-        pygame.draw.rect(screen, (101, 67, 33), self.rect, 2)
+        draw_outline(screen, (101, 67, 33), rect, 2)
         
         # Draw platform number
         if self.number > 0:  # Don't show number 0 (ground platform)
-            font = pygame.font.Font(None, 24)
-            number_text = font.render(str(self.number), True, WHITE)
-            text_x = self.rect.centerx - number_text.get_width() // 2
-            text_y = self.rect.centery - number_text.get_height() // 2
+            number_text = text_cache.render(str(self.number), 24, WHITE)
+            text_x = rect.centerx - number_text.get_width() // 2
+            text_y = rect.centery - number_text.get_height() // 2
             screen.blit(number_text, (text_x, text_y))
 
 class Enemy:
+    """Level definition of a patrolling enemy; live state is kept in an EnemyStore"""
+    
+    __slots__ = ("x", "y", "width", "height", "speed", "platform_left", "platform_right", "rect")
+    
     def __init__(self, x, y, platform_left, platform_right):
         self.x = x
         self.y = y
         self.width = 25
         self.height = 25
         self.speed = 2
-        self.direction = 1
         self.platform_left = platform_left
         self.platform_right = platform_right
         self.rect = pygame.Rect(x, y, self.width, self.height)
-        self.is_defeated = False
-        self.defeat_timer = 0
-    
-    def update(self):
-        if self.is_defeated:
-            self.defeat_timer -= 1
-            return self.defeat_timer <= 0  # Return True when should be removed
-        
-        self.x += self.speed * self.direction
-        
-        if self.x <= self.platform_left or self.x + self.width >= self.platform_right:
-            self.direction *= -1
-        
-        self.rect.x = self.x
-        self.rect.y = self.y
-        return False
-    
-    def defeat(self):
-        """Mark enemy as defeated"""
-        self.is_defeated = True
-        self.defeat_timer = 60  # 1 second before disappearing
-    
-    def draw(self, screen):
-        pixel_size = 2
-        y_offset = 1.5
-        
-        if self.is_defeated:
-            # Draw collapsed/flattened turtle sprite
-            collapsed_shell_pixels = [
-                (2, 8), (3, 8), (4, 8), (5, 8), (6, 8), (7, 8), (8, 8), (9, 8), (10, 8),
-                (2, 9), (3, 9), (4, 9), (5, 9), (6, 9), (7, 9), (8, 9), (9, 9), (10, 9),
-            ]
-            
-            collapsed_pattern_pixels = [
-                (3, 8), (5, 8), (7, 8), (9, 8),
-                (4, 9), (6, 9), (8, 9),
-            ]
-            
-            for px, py in collapsed_shell_pixels:
-                pygame.draw.rect(screen, DARK_GREEN, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-            
-            for px, py in collapsed_pattern_pixels:
-                pygame.draw.rect(screen, YELLOW, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-            
-            return
-        
-        # Normal turtle sprite
-        shell_pixels = [
-            (3, 2), (4, 2), (5, 2), (6, 2), (7, 2), (8, 2), (9, 2),
-            (2, 3), (3, 3), (4, 3), (5, 3), (6, 3), (7, 3), (8, 3), (9, 3), (10, 3),
-            (2, 4), (3, 4), (4, 4), (5, 4), (6, 4), (7, 4), (8, 4), (9, 4), (10, 4),
-            (2, 5), (3, 5), (4, 5), (5, 5), (6, 5), (7, 5), (8, 5), (9, 5), (10, 5),
-            (2, 6), (3, 6), (4, 6), (5, 6), (6, 6), (7, 6), (8, 6), (9, 6), (10, 6),
-            (3, 7), (4, 7), (5, 7), (6, 7), (7, 7), (8, 7), (9, 7),
-        ]
-        
-        head_pixels = [
-            (4, 0), (5, 0), (6, 0), (7, 0), (8, 0),
-            (3, 1), (4, 1), (5, 1), (6, 1), (7, 1), (8, 1), (9, 1),
-        ]
-        
-        legs_pixels = [
-            (3, 8), (4, 8), (5, 8), (6, 8), (7, 8), (8, 8), (9, 8),
-            (3, 9), (4, 9), (8, 9), (9, 9),
-            (3, 10), (4, 10), (8, 10), (9, 10),
-        ]
-        
-        eye_pixels = [
-            (4, 1), (8, 1)
-        ]
-        
-        shell_pattern_pixels = [
-            (4, 3), (6, 3), (8, 3),
-            (3, 4), (5, 4), (7, 4), (9, 4),
-            (4, 5), (6, 5), (8, 5),
-        ]
-        
-        for px, py in shell_pixels:
-            pygame.draw.rect(screen, DARK_GREEN, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in head_pixels:
-            pygame.draw.rect(screen, GREEN, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in legs_pixels:
-            pygame.draw.rect(screen, GREEN, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in eye_pixels:
-            pygame.draw.rect(screen, BLACK, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
-        
-        for px, py in shell_pattern_pixels:
-            pygame.draw.rect(screen, YELLOW, (self.x + px * pixel_size, self.y + (py + y_offset) * pixel_size, pixel_size, pixel_size))
 
 class Coin:
+    """Level definition of a coin; live state is kept in a CoinStore"""
+    
+    __slots__ = ("x", "y", "width", "height", "rect")
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.width = 20
         self.height = 20
         self.rect = pygame.Rect(x, y, self.width, self.height)
-        self.collected = False
-    
-    def draw(self, screen):
-        if not self.collected:
-            center_x = self.x + self.width//2
-            center_y = self.y + self.height//2
-            radius = self.width//2
-            
-            # Main coin body (golden gradient effect)
-            pygame.draw.circle(screen, (255, 215, 0), (center_x, center_y), radius)
-            
-            # Inner bright highlight
-            pygame.draw.circle(screen, (255, 255, 150), (center_x - 2, center_y - 2), radius//2)
-            
-            # Outer dark edge
-            pygame.draw.circle(screen, (180, 140, 0), (center_x, center_y), radius, 2)
-            
-            # Add a sparkle effect
-            pygame.draw.circle(screen, (255, 255, 255), (center_x - 3, center_y - 3), 2)
-            pygame.draw.circle(screen, (255, 255, 255), (center_x + 2, center_y + 4), 1)
 
-def main():
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Simple Platformer")
-    clock = pygame.time.Clock()
-    font = pygame.font.Font(None, 36)
-    
-    # Initialize background music and sound effects
-    try:
-        print("Initializing audio...")
-        jump_sound = create_jump_sound()
-        coin_sound = create_coin_sound()
-        death_sound = create_death_sound()
-        enemy_defeat_sound = create_enemy_defeat_sound()
-        print("Sound effects created")
-        
-        background_music = create_background_music()
-        background_music.play(-1)  # Loop indefinitely
-        print("Background music started")
-    except Exception as e:
-        print(f"Could not initialize audio: {e}")
-        background_music = None
-        jump_sound = None
-        coin_sound = None
-        death_sound = None
-        enemy_defeat_sound = None
-    
-    player = Player(100, 100, jump_sound)
-    score = 0
-    
-    platforms = [
-        Platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, 0),  # Ground - no number
-        Platform(150, 520, 100, 20, 1),
-        Platform(280, 480, 160, 20, 2),
-        Platform(50, 440, 80, 20, 3),
-        Platform(480, 420, 100, 20, 4),
-        Platform(630, 380, 160, 20, 5),
-        Platform(200, 360, 80, 20, 6),
-        Platform(430, 340, 60, 20, 7),
-        Platform(100, 280, 100, 20, 8),
-        Platform(550, 280, 80, 20, 9),
-        Platform(330, 220, 160, 20, 10),
-        Platform(700, 200, 80, 20, 11),
-        Platform(150, 190, 100, 20, 12),
-        Platform(450, 140, 80, 20, 13),
-        Platform(600, 100, 100, 20, 14),
-        Platform(250, 80, 60, 20, 15),
-    ]
-    
-    enemies = [
-        Enemy(25, 535, 0, 800),
-        Enemy(320, 455, 280, 440),
-        Enemy(670, 355, 630, 790),
-        Enemy(370, 195, 330, 490),
-    ]
-    
-    coins = [
-        Coin(175, 490),
-        Coin(225, 490),
-        Coin(330, 450),
-        Coin(380, 450),
-        Coin(70, 410),
-        Coin(100, 410),
-        Coin(510, 390),
-        Coin(560, 390),
-        Coin(680, 350),
-        Coin(730, 350),
-        Coin(230, 330),
-        Coin(450, 310),  # Adjusted for platform 7 (moved from x=400 to x=430)
-        Coin(130, 250),
-        Coin(180, 250),
-        Coin(580, 250),  # Adjusted for platform 9 (moved from y=260 to y=280)
-        Coin(380, 190),
-        Coin(430, 190),
-        Coin(730, 170),
-        Coin(180, 160),  # Adjusted for platform 12 (moved from y=160 to y=190)
-        Coin(480, 110),
-        Coin(630, 70),
-        Coin(680, 70),
-        Coin(280, 50),
-        Coin(50, 530),
-        Coin(750, 530),
-    ]
-    
-    game_won = False
-    
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    running = False
-                elif event.key == pygame.K_r and game_won:
-                    player.x = 100
-                    player.y = 100
-                    player.vel_y = 0
-                    score = 0
-                    for coin in coins:
-                        coin.collected = False
-                    game_won = False
-        
-        if not game_won:
-            result = player.update([platform.rect for platform in platforms])
-            if result == "respawn":
+def draw_enemies(screen, enemies, rows=None, offset=(0, 0), x=None):
+    """Blit the given enemy rows (every live enemy by default) shifted by offset.
+    
+    x is the column of positions to draw at, enemies.x by default.
+    """
+    normal = sprite_cache.get(ENEMY_SPRITE, ENEMY_PALETTE)
+    defeated = sprite_cache.get(ENEMY_DEFEATED_SPRITE, ENEMY_PALETTE)
+    if rows is None:
+        rows = enemies.alive.nonzero()[0]
+    if x is None:
+        x = enemies.x
+    dx, dy = offset
+    for x, y, is_defeated in zip(x[rows].tolist(), enemies.y[rows].tolist(), enemies.defeated[rows].tolist()):
+        screen.blit(defeated if is_defeated else normal, (x + dx, y + dy))
+
+def draw_coins(screen, coins, rows=None, offset=(0, 0)):
+    """Blit the given coin rows (every uncollected coin by default) shifted by offset"""
+    sprite = sprite_cache.get(COIN_SPRITE)
+    if rows is None:
+        rows = coins.remaining.nonzero()[0]
+    dx, dy = offset
+    for x, y in zip(coins.x[rows].tolist(), coins.y[rows].tolist()):
+        screen.blit(sprite, (x + dx, y + dy))
+
+def draw_sky(screen, top=0, height=SCREEN_HEIGHT):
+    """Sky gradient background; top is the world y of the surface's first row"""
+    width = screen.get_width()
+    for y in range(screen.get_height()):
+        color_ratio = min(1.0, max(0.0, (top + y) / height))
+        r = int(135 + (255 - 135) * color_ratio)  # Light blue to white
+        g = int(206 + (255 - 206) * color_ratio)
+        b = int(235 + (255 - 235) * color_ratio)
+        pygame.draw.line(screen, (r, g, b), (0, y), (width, y))
+
+def create_level():
+    """Build the platforms, enemies and coins of the built-in level"""
+    return levels.build(levels.load_text(levels.level_path("platformer_v2.txt")), Platform, Enemy, Coin)
+
+def load_level(path):
+    """Level from a file: compiled levels are streamed in chunks, text ones are built up front"""
+    if levels.is_compiled(path):
+        return levels.LevelFile(path)
+    return levels.build(levels.load_text(path), Platform, Enemy, Coin)
+
+def close_level(level):
+    """Release a level from load_level() once the game is done with it"""
+    if isinstance(level, levels.LevelFile):
+        level.close()
+
+def level_bounds(platforms):
+    """World rect of a level: from x = 0 to its rightmost platform, at least one screen in size"""
+    bounds = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    return bounds.unionall([platform.rect for platform in platforms])
+
+# Enemies this far outside the view keep patrolling; further ones wait until the camera gets close
+ACTIVE_MARGIN = SCREEN_WIDTH // 2
+
+# Compiled levels keep the chunks within this distance of the view loaded
+STREAM_MARGIN = SCREEN_WIDTH
+
+# Phase timers for the whole game; disabled (and nearly free) unless the frontend turns it on
+profiler = Profiler(enabled=False)
+
+class GameState:
+    """Everything the simulation needs; no window, mixer or clock involved"""
+    
+    def __init__(self, platforms, enemies, coins):
+        self.player = Player(100, 100)
+        self.platforms = platforms
+        # Enemies and coins live in NumPy columns so they update as whole arrays
+        self.enemies = EnemyStore.from_enemies(enemies)
+        self.coins = CoinStore.from_coins(coins)
+        self.score = 0
+        self.game_won = False
+        self.tick = 0
+        self.level_hash = level_hash(platforms, enemies, coins)
+        
+        # Broadphase index for the static platforms
+        self.platform_index = SpatialHash()
+        for platform in platforms:
+            self.platform_index.insert(platform.rect)
+        
+        # Follows the player through step(), so respawns are deterministic in replays
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, level_bounds(platforms))
+        self.active_cells = None
+        self.active_rows = None
+        
+        # Set for compiled levels, whose objects are loaded chunk by chunk
+        self.stream = None
+    
+    def active_enemies(self):
+        """Rows of the enemies near the camera, or None when that is all of them.
+        
+        Only refreshed when the view crosses grid cells.
+        """
+        cells = self.enemies.grid.cell_range(self.camera.visible(ACTIVE_MARGIN))
+        if cells != self.active_cells:
+            self.active_cells = cells
+            rows = self.enemies.grid.query_cells(cells)
+            # Whole-column updates are cheaper than gathering every row
+            self.active_rows = None if len(rows) == len(self.enemies.x) else rows
+        return self.active_rows
+
+def level_hash(platforms, enemies, coins):
+    """Digest of a level definition, stored in replays to catch level mismatches.
+    
+    It is levels.digest() of the level's records, the digest compiled levels
+    carry, so a replay verifies on both the text and compiled form of a level.
+    """
+    return levels.digest(levels.Level(
+        np.array([(*platform.rect, platform.number) for platform in platforms], dtype=levels.PLATFORM),
+        np.array([(enemy.x, enemy.y, enemy.platform_left, enemy.platform_right) for enemy in enemies],
+                 dtype=levels.ENEMY),
+        np.array([(coin.x, coin.y) for coin in coins], dtype=levels.COIN),
+    ))
+
+def state_checksum(state):
+    """Digest of everything the simulation evolves, used to verify replays"""
+    player = state.player
+    digest = hashlib.sha1(struct.pack(
+        "<4d4i5?", player.x, player.y, player.vel_x, player.vel_y,
+        player.respawn_timer, player.flash_timer, state.score, state.tick,
+        player.on_ground, player.is_dead, player.flash_red, player.jump_key_pressed, state.game_won,
+    ))
+    enemies = state.enemies
+    for column in (enemies.x, enemies.velocity, enemies.defeat_timer, enemies.alive, enemies.defeated,
+                   state.coins.collected):
+        digest.update(column.tobytes())
+    return digest.digest()
+
+def new_game(level=None):
+    """Fresh state for level (platforms, enemies, coins) or a levels.LevelFile, the built-in level by default"""
+    if isinstance(level, levels.LevelFile):
+        return new_streamed_game(level)
+    platforms, enemies, coins = level if level is not None else create_level()
+    return GameState(platforms, enemies, coins)
+
+def new_streamed_game(level_file):
+    """Fresh state for a compiled level, holding only the chunks around the camera"""
+    state = GameState([], [], [])
+    state.level_hash = level_file.digest
+    world = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT).union(level_file.bounds)
+    state.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, world)
+    state.stream = levels.ChunkStream(level_file, STREAM_MARGIN)
+    stream_level(state)
+    return state
+
+def stream_level(state):
+    """Swap in the objects of the chunks around the camera once it crosses into another chunk"""
+    stream = state.stream
+    if not stream.update(state.camera.rect):
+        return
+    level_file = stream.level_file
+    
+    # Platforms are indexed only where they cross the loaded chunks, so a level-wide
+    # ground costs a few cells instead of one per 64 pixels of level
+    left, right = stream.area
+    state.platforms = [Platform(*record) for record in level_file.platforms[stream.platform_rows].tolist()]
+    state.platform_index.clear()
+    for platform in state.platforms:
+        rect = platform.rect
+        clipped_left, clipped_right = max(rect.left, left), min(rect.right, right)
+        state.platform_index.insert(pygame.Rect(clipped_left, rect.top, clipped_right - clipped_left, rect.height))
+    
+    # Fresh stores for the loaded rows, keeping the state of the enemies and coins seen before
+    records = level_file.enemies[stream.enemy_rows]
+    count = len(records)
+    enemies = EnemyStore(records['x'], records['y'], [25] * count, [25] * count, [2] * count,
+                         records['left'], records['right'], ids=stream.enemy_rows)
+    enemies.carry_over(state.enemies)
+    state.enemies = enemies
+    state.active_cells = None
+    
+    records = level_file.coins[stream.coin_rows]
+    count = len(records)
+    coins = CoinStore(records['x'], records['y'], [20] * count, [20] * count,
+                      ids=stream.coin_rows, total=len(level_file.coins))
+    coins.carry_over(state.coins)
+    state.coins = coins
+
+def step(state, inputs):
+    """Advance the simulation by one fixed tick.
+    
+    Mutates and returns state, together with the gameplay events of the tick:
+    "jump", "coin", "stomp", "death", "fall", "respawn" and "win".
+    """
+    events = []
+    player = state.player
+    
+    if inputs.restart and state.game_won:
+        player.teleport(100, 100)
+        state.score = 0
+        state.coins.reset()
+        state.game_won = False
+    
+    if not state.game_won:
+        with profiler.scope("player update"):
+            result = player.update(state.platform_index, inputs, events, state.camera)
+            if result == "fall":
                 player.die()
-                score = max(0, score - 5)
+                state.score = max(0, state.score - 5)
+                events.append("fall")
+        
+        with profiler.scope("enemy update"):
+            # Patrols and defeat timers for the enemies near the view at once; timed-out ones drop out
+            enemies = state.enemies
+            active = state.active_enemies()
+            enemies.update(active)
             
-            enemies_to_remove = []
-            for i, enemy in enumerate(enemies):
-                should_remove = enemy.update()
-                if should_remove:
-                    enemies_to_remove.append(i)
-                    continue
-                
-                if not player.is_dead and not enemy.is_defeated and player.rect.colliderect(enemy.rect):
+            for i in enemies.overlapping(player.rect, active).tolist():
+                if not player.is_dead and not enemies.defeated[i]:
                     # Check if player is jumping on enemy (from above)
-                    if player.vel_y > 0 and player.y < enemy.y:
+                    if player.vel_y > 0 and player.y < enemies.y[i]:
                         # Player stomps on enemy
-                        if enemy_defeat_sound:
-                            print("ENEMY DEFEAT SOUND TRIGGERED!")
-                            enemy_defeat_sound.play()
-                        enemy.defeat()
+                        events.append("stomp")
+                        enemies.defeat(i)
                         player.vel_y = -8  # Small bounce
-                        score += 50  # Bonus points for defeating enemy
+                        state.score += 50  # Bonus points for defeating enemy
                     else:
                         # Enemy defeats player
-                        if death_sound:
-                            print("DEATH SOUND TRIGGERED!")
-                            death_sound.play()
+                        events.append("death")
                         player.die()
-                        score = max(0, score - 10)
-            
-            # Remove defeated enemies that have timed out
-            for i in reversed(enemies_to_remove):
-                enemies.pop(i)
-            
-            for coin in coins:
-                if not player.is_dead and not coin.collected and player.rect.colliderect(coin.rect):
-                    coin.collected = True
-                    score += 10
-                    if coin_sound:
-                        print("COIN SOUND TRIGGERED!")
-                        coin_sound.play()
-            
-            if all(coin.collected for coin in coins):
-                game_won = True
-        
-        # Sky gradient background
-        for y in range(SCREEN_HEIGHT):
-            color_ratio = y / SCREEN_HEIGHT
-            r = int(135 + (255 - 135) * color_ratio)  # Light blue to white
-            g = int(206 + (255 - 206) * color_ratio)
-            b = int(235 + (255 - 235) * color_ratio)
-            pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-        
-        for platform in platforms:
-            platform.draw(screen)
-        
-        for coin in coins:
-            coin.draw(screen)
-        
-        for enemy in enemies:
-            enemy.draw(screen)
-        
-        if not game_won and (not player.is_dead or player.flash_timer > 0):
-            player.draw(screen)
-        
-        score_text = font.render(f"Score: {score}", True, BLACK)
+                        state.score = max(0, state.score - 10)
+        
+        with profiler.scope("coin checks"):
+            if not player.is_dead:
+                collected = state.coins.overlapping(player.rect)
+                state.coins.collect(collected)
+                state.score += 10 * len(collected)
+                events.extend(["coin"] * len(collected))
+        
+        if state.coins.all_collected():
+            state.game_won = True
+            events.append("win")
+    
+    state.camera.follow(player.rect)
+    if state.stream is not None:
+        stream_level(state)
+    state.tick += 1
+    return state, events
+
+# Every possible tick input, indexed by its replay bitmask
+REPLAY_INPUTS = [Inputs._make(replay.mask_flags(mask)) for mask in range(16)]
+
+def play_replay(path, level=None):
+    """Run a recorded game through step() as fast as possible.
+    
+    Returns the final state and whether it matches the recorded checksum.
+    """
+    recording = replay.load(path)
+    state = new_game(level)
+    if recording.level_hash != state.level_hash:
+        raise replay.ReplayError(f"{path} was recorded on a different level")
+    
+    random.seed(recording.seed)
+    for mask in replay.iter_masks(recording):
+        state, _ = step(state, REPLAY_INPUTS[mask])
+    
+    return state, state_checksum(state) == recording.checksum
+
+def replay_main(path, level_path=None):
+    start = time.perf_counter()
+    level = load_level(level_path) if level_path else None
+    try:
+        state, ok = play_replay(path, level)
+    finally:
+        close_level(level)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {state.tick} ticks in {elapsed:.3f} s ({state.tick / elapsed:,.0f} ticks/s), "
+          f"score {state.score}: {'checksum OK' if ok else 'CHECKSUM MISMATCH'}")
+    return ok
+
+def read_inputs(keys, restart=False):
+    """Map the keyboard state to simulation inputs, one of the shared REPLAY_INPUTS"""
+    return REPLAY_INPUTS[
+        (replay.LEFT if keys[pygame.K_LEFT] or keys[pygame.K_a] else 0)
+        | (replay.RIGHT if keys[pygame.K_RIGHT] or keys[pygame.K_d] else 0)
+        | (replay.JUMP if keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w] else 0)
+        | (replay.RESTART if restart else 0)
+    ]
+
+def create_background(state):
+    """Sky and platforms pre-rendered in screen-sized world tiles, baked as the camera reaches them"""
+    world_height = state.camera.world.bottom
+    if state.stream is not None:
+        level_file = state.stream.level_file
+        
+        def platforms_in(area):
+            rows = level_file.rows(0, *level_file.chunk_range(area.left, area.right))
+            platforms = [Platform(*record) for record in level_file.platforms[rows].tolist()]
+            return [platform for platform in platforms if platform.rect.colliderect(area)]
+    else:
+        platforms = SpatialHash(cell_size=256)
+        for platform in state.platforms:
+            platforms.insert(platform)
+        platforms_in = platforms.query_rect
+    
+    def paint(surface, area):
+        draw_sky(surface, area.top, world_height)
+        for platform in platforms_in(area):
+            platform.draw(surface, (-area.x, -area.y))
+    
+    return TiledLayer((SCREEN_WIDTH, SCREEN_HEIGHT), paint)
+
+class Interpolation:
+    """Positions at the start of the last physics tick, for drawing frames in between ticks.
+    
+    capture() runs before every step(); a frame then shows the player, the
+    enemies and the camera alpha of the way from there to where the tick
+    left them, so motion stays smooth at any frame rate, one tick behind
+    the simulation. Coins never move and are drawn as they are. Enemy
+    positions are copied and blended in buffers kept for the store.
+    """
+    
+    def __init__(self, state):
+        self.enemies = None
+        self.capture(state)
+    
+    def capture(self, state):
+        player = state.player
+        self.player_x = player.x
+        self.player_y = player.y
+        camera = state.camera.rect
+        self.camera_x = camera.x
+        self.camera_y = camera.y
+        enemies = state.enemies
+        if enemies is not self.enemies:
+            self.enemies = enemies
+            self.previous_x = enemies.x.copy()
+            self.blended_x = np.empty_like(enemies.x)
+        else:
+            np.copyto(self.previous_x, enemies.x)
+    
+    def player_position(self, state, alpha):
+        player = state.player
+        return lerp(self.player_x, player.x, alpha, TELEPORT), lerp(self.player_y, player.y, alpha, TELEPORT)
+    
+    def view(self, state, alpha):
+        current = state.camera.rect
+        return pygame.Rect(round(lerp(self.camera_x, current.x, alpha, TELEPORT)),
+                           round(lerp(self.camera_y, current.y, alpha, TELEPORT)),
+                           current.width, current.height)
+    
+    def enemy_x(self, state, alpha):
+        # Streaming swaps in a new store with different rows; that tick is drawn as it is
+        if state.enemies is not self.enemies:
+            return state.enemies.x
+        blended = self.blended_x
+        np.subtract(state.enemies.x, self.previous_x, out=blended)
+        blended *= alpha
+        blended += self.previous_x
+        return blended
+
+def draw_scene(screen, state, background, interpolation=None, alpha=1.0):
+    """Draw the world through the camera; with an Interpolation, alpha of the way through the last tick"""
+    if interpolation is not None:
+        view = interpolation.view(state, alpha)
+        player_position = interpolation.player_position(state, alpha)
+        enemy_x = interpolation.enemy_x(state, alpha)
+        # Anything in view at either end of the tick may be on screen
+        cull = view.union(state.camera.rect)
+    else:
+        view = cull = state.camera.rect
+        player_position = enemy_x = None
+    offset = (-view.x, -view.y)
+    
+    with profiler.scope("background"):
+        # Sky and platforms never move, so they come pre-rendered, one blit per tile in view
+        background.draw(screen, view)
+    
+    with profiler.scope("sprites"):
+        # Only what is inside the view is drawn; the grids skip everything else
+        draw_coins(screen, state.coins, state.coins.overlapping(cull), offset)
+        draw_enemies(screen, state.enemies, state.enemies.visible(cull, state.active_enemies()), offset, enemy_x)
+        
+        player = state.player
+        if not state.game_won and (not player.is_dead or player.flash_timer > 0):
+            player.draw(screen, offset, player_position)
+    
+    with profiler.scope("HUD"):
+        # Score and coin count only change on pickups, so these are cache hits almost every frame
+        score_text = text_cache.render(f"Score: {state.score}", HUD_FONT_SIZE, BLACK)
         screen.blit(score_text, (10, 10))
         
-        coins_collected = sum(1 for coin in coins if coin.collected)
-        coins_text = font.render(f"Coins: {coins_collected}/{len(coins)}", True, BLACK)
+        coins_text = text_cache.render(f"Coins: {state.coins.collected_count}/{len(state.coins)}", HUD_FONT_SIZE, BLACK)
         screen.blit(coins_text, (10, 50))
         
-        if game_won:
-            win_text = font.render("CONGRATULATIONS! YOU WON!", True, GREEN)
+        if state.game_won:
+            win_text = text_cache.render("CONGRATULATIONS! YOU WON!", HUD_FONT_SIZE, GREEN)
             win_rect = win_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
             screen.blit(win_text, win_rect)
             
-            restart_text = font.render("Press R to restart", True, BLACK)
+            restart_text = text_cache.render("Press R to restart", HUD_FONT_SIZE, BLACK)
             restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
             screen.blit(restart_text, restart_rect)
+
+def main(record_path=None, seed=0, level_path=None, render_fps=RENDER_FPS):
+    # Sounds are rendered at synth.SAMPLE_RATE; the mixer has to run at it too
+    open_mixer(synth.SAMPLE_RATE, AUDIO_BUFFER)
+    pygame.init()
+    
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Simple Platformer")
+    clock = pygame.time.Clock()
+    
+    # Initialize background music and sound effects; a death outranks the rest
+    audio = None
+    try:
+        print("Initializing audio...")
+        sound_cache = SoundCache()
+        audio = AudioEngine(AUDIO_VOICES, AUDIO_BUFFER)
+        audio.add("jump", create_jump_sound(sound_cache), priority=1)
+        audio.add("coin", create_coin_sound(sound_cache), priority=0)
+        audio.add("death", create_death_sound(sound_cache), priority=2)
+        audio.add("stomp", create_enemy_defeat_sound(sound_cache), priority=1)
+        print("Sound effects created")
+        sound_cache.report()
         
-        pygame.display.flip()
-        clock.tick(FPS)
+        audio.play_music(stream_background_music())
+        print("Background music started")
+    except Exception as e:
+        print(f"Could not initialize audio: {e}")
+        audio = None
+    
+    random.seed(seed)
+    level = load_level(level_path) if level_path else None
+    state = new_game(level)
+    recorder = replay.Recorder(state.level_hash, seed) if record_path else None
+    background = create_background(state)
+    bake_sprites()
+    
+    # Physics runs at a fixed rate no matter how fast frames are drawn
+    timestep = FixedTimestep(FPS)
+    interpolation = Interpolation(state)
+    restart_requested = False
+    
+    # Gameplay events go out on a bus; the log is written off the main thread
+    bus = EventBus()
+    if audio:
+        bus.subscribe(lambda event: audio.trigger(event.kind))
+    event_log = bus.subscribe(AsyncSink(stream_writer()))
+    event_counts = bus.subscribe(EventCounter())
+    
+    # F3 shows phase timings and allocations, F4 starts/stops a Chrome trace capture
+    profiler.enabled = True
+    meter = AllocationMeter()
+    overlay = ProfilerOverlay(profiler, pygame.font.SysFont("monospace", 14), meter=meter)
+    
+    # Everything loaded so far lives for the whole game, including the background tiles and
+    # HUD text the first frame bakes; frozen, collections never scan it again
+    draw_scene(screen, state, background)
+    gc.collect()
+    gc.freeze()
+    meter.start()
+    
+    running = True
+    while running:
+        with profiler.scope("input"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif event.key == pygame.K_r:
+                        restart_requested = True
+                    elif event.key == pygame.K_F3:
+                        overlay.toggle()
+                    elif event.key == pygame.K_F4:
+                        if profiler.tracing:
+                            trace_path = time.strftime("platformer_trace_%Y%m%d_%H%M%S.json")
+                            count = profiler.stop_trace(trace_path)
+                            print(f"Wrote {count} trace events to {trace_path}")
+                        else:
+                            profiler.start_trace()
+            
+            keys = pygame.key.get_pressed()
+        
+        for _ in range(timestep.steps()):
+            inputs = read_inputs(keys, restart_requested)
+            if recorder:
+                recorder.record(inputs)
+            interpolation.capture(state)
+            state, events = step(state, inputs)
+            restart_requested = False
+            if events:
+                with profiler.scope("events"):
+                    player = state.player
+                    for name in events:
+                        bus.publish(GameEvent(name, state.tick, player.x, player.y, state.score))
+        
+        if audio:
+            with profiler.scope("audio"):
+                audio.update()
+        
+        draw_scene(screen, state, background, interpolation, timestep.alpha)
+        overlay.draw(screen)
+        
+        with profiler.scope("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
+        meter.end_frame()
+        timestep.advance(clock.tick(render_fps) / 1000)
+    
+    meter.stop()
+    if recorder:
+        recorder.save(record_path, state_checksum(state))
+        print(f"Recorded {recorder.ticks} ticks to {record_path}")
+    event_log.close()
+    close_level(level)
+    print("Events: " + ", ".join(f"{count} {kind}" for kind, count in sorted(event_counts.counts.items())))
+    print(meter.summary())
+    if audio:
+        audio.report()
     
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # platformer_v2.py [--level FILE] [--fps N] [--record FILE | --replay FILE]
+    # --fps caps the drawing rate (0 for none); physics stays at FPS ticks per second
+    args = sys.argv[1:]
+    level_path = None
+    render_fps = RENDER_FPS
+    if len(args) >= 2 and args[0] == "--level":
+        level_path = args[1]
+        args = args[2:]
+    if len(args) >= 2 and args[0] == "--fps":
+        render_fps = int(args[1])
+        args = args[2:]
+    if len(args) == 2 and args[0] == "--replay":
+        sys.exit(0 if replay_main(args[1], level_path) else 1)
+    elif len(args) == 2 and args[0] == "--record":
+        main(record_path=args[1], level_path=level_path, render_fps=render_fps)
+    else:
+        main(level_path=level_path, render_fps=render_fps)
@@ -0,0 +1,303 @@
+import gc
+import json
+import os
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+import pygame
+
+from text_cache import GlyphAtlas
+
+perf_counter = time.perf_counter
+
+
+class Scope:
+    """Reusable timer for one named phase; use as `with profiler.scope("name"):`"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, perf_counter())
+        return False
+
+
+class NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SCOPE = NullScope()
+
+
+class Profiler:
+    """Named scoped timers with rolling per-frame statistics and Chrome trace export.
+
+    Time spent in each scope is summed per frame; end_frame() pushes the totals
+    into a rolling window. While tracing, every scope is also kept as a
+    trace event that can be opened in chrome://tracing or Perfetto.
+    """
+
+    def __init__(self, window=240, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.scopes = {}
+        self.history = {}
+        self.current = {}
+        self.order = []
+        self.frame_start = None
+        self.tracing = False
+        self.trace_events = []
+        self.epoch = perf_counter()
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = self.scopes[name] = Scope(self, name)
+            self.history[name] = deque(maxlen=self.window)
+            self.current[name] = 0.0
+            self.order.append(name)
+        return scope
+
+    def add(self, name, start, end):
+        self.current[name] += end - start
+        if self.tracing:
+            self.trace_events.append((name, start, end))
+
+    def end_frame(self):
+        """Close the frame that started at the previous end_frame()"""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        if self.frame_start is not None:
+            self.add_frame_total(now - self.frame_start)
+            if self.tracing:
+                self.trace_events.append(("frame", self.frame_start, now))
+        self.frame_start = now
+        for name in self.order:
+            self.history[name].append(self.current[name])
+            self.current[name] = 0.0
+
+    def add_frame_total(self, seconds):
+        if "frame" not in self.history:
+            self.history["frame"] = deque(maxlen=self.window)
+        self.history["frame"].append(seconds)
+
+    def stats(self, name):
+        """(mean, p50, p95, p99) of the rolling window in milliseconds"""
+        samples = self.history.get(name)
+        if not samples:
+            return (0.0, 0.0, 0.0, 0.0)
+        values = np.fromiter(samples, dtype=np.float64, count=len(samples)) * 1000
+        p50, p95, p99 = np.percentile(values, (50, 95, 99))
+        return (values.mean(), p50, p95, p99)
+
+    def report(self):
+        names = (["frame"] if "frame" in self.history else []) + self.order
+        return [(name,) + self.stats(name) for name in names]
+
+    def start_trace(self):
+        self.trace_events = []
+        self.tracing = True
+
+    def stop_trace(self, path):
+        """Write the captured scopes as Chrome trace-event JSON"""
+        self.tracing = False
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": "frame" if name == "frame" else "phase",
+                "ph": "X",
+                "ts": (start - self.epoch) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": 0 if name == "frame" else 1,
+            }
+            for name, start, end in self.trace_events
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        self.trace_events = []
+        return len(events)
+
+
+class AllocationMeter:
+    """Per-frame allocation pressure: what makes the garbage collector stop the game.
+
+    objects is the growth of the collector's generation 0 count over a frame,
+    i.e. container objects (lists, tuples, dicts, instances) created and still
+    alive; each time the count passes the threshold a collection runs, and
+    collections/pause show how many did and how long they took. With
+    trace=True, tracemalloc also measures the bytes allocated at the frame's
+    peak, at a large cost in speed.
+    """
+
+    def __init__(self, window=240, trace=False):
+        self.window = window
+        self.trace = trace
+        self.history = {name: deque(maxlen=window) for name in ("objects", "collections", "pause", "kb")}
+        self.running = False
+        self.mark = 0
+        self.objects = 0
+        self.collections = 0
+        self.pause = 0.0
+        self.gc_start = 0.0
+        self.total_collections = 0
+        self.max_pause = 0.0
+
+    def start(self):
+        if self.running:
+            return
+        gc.callbacks.append(self.on_gc)
+        if self.trace:
+            tracemalloc.start()
+        self.running = True
+        self.begin()
+
+    def stop(self):
+        if not self.running:
+            return
+        gc.callbacks.remove(self.on_gc)
+        if self.trace:
+            tracemalloc.stop()
+        self.running = False
+
+    def begin(self):
+        self.mark = gc.get_count()[0]
+        self.objects = self.collections = 0
+        self.pause = 0.0
+        if self.trace:
+            tracemalloc.reset_peak()
+            self.traced = tracemalloc.get_traced_memory()[0]
+
+    def on_gc(self, phase, info):
+        # A collection resets the count, so what the frame added so far is banked first
+        if phase == "start":
+            self.objects += gc.get_count()[0] - self.mark
+            self.gc_start = perf_counter()
+        else:
+            pause = perf_counter() - self.gc_start
+            self.pause += pause
+            self.collections += 1
+            self.total_collections += 1
+            self.max_pause = max(self.max_pause, pause)
+            self.mark = gc.get_count()[0]
+
+    def end_frame(self):
+        """Close the frame that started at the previous end_frame() (or start())"""
+        if not self.running:
+            return
+        history = self.history
+        history["objects"].append(self.objects + gc.get_count()[0] - self.mark)
+        history["collections"].append(self.collections)
+        history["pause"].append(self.pause)
+        if self.trace:
+            history["kb"].append((tracemalloc.get_traced_memory()[1] - self.traced) / 1024)
+        self.begin()
+
+    def stats(self, name):
+        """(mean, p50, p95, max) of the rolling window; pause in milliseconds"""
+        samples = self.history[name]
+        if not samples:
+            return (0.0, 0.0, 0.0, 0.0)
+        values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+        if name == "pause":
+            values *= 1000
+        p50, p95 = np.percentile(values, (50, 95))
+        return (values.mean(), p50, p95, values.max())
+
+    def report(self):
+        """Rows for ProfilerOverlay, labelled with their unit"""
+        rows = [("objects/frame",) + self.stats("objects"), ("gc pause ms",) + self.stats("pause")]
+        if self.trace:
+            rows.append(("alloc KB/frame",) + self.stats("kb"))
+        return rows
+
+    def summary(self):
+        mean, _, p95, worst = self.stats("objects")
+        return (f"Allocations over the last {len(self.history['objects'])} frames: {mean:.1f} objects/frame "
+                f"(p95 {p95:.0f}, max {worst:.0f}); {self.total_collections} collections in all, "
+                f"longest pause {self.max_pause * 1000:.2f} ms")
+
+
+class ProfilerOverlay:
+    """On-screen table of the profiler's rolling statistics, redrawn a few times a second"""
+
+    def __init__(self, profiler, font, refresh_frames=15, meter=None):
+        self.profiler = profiler
+        self.meter = meter
+        self.font = font
+        self.refresh_frames = refresh_frames
+        self.visible = False
+        self.frames = 0
+        self.surface = None
+        # Numbers change on every refresh, so they are assembled from pre-rendered glyphs
+        self.digits = GlyphAtlas(font, (255, 255, 255))
+        self.labels = {}
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.frames = 0
+
+    def draw(self, screen, position=(10, 90)):
+        if not self.visible:
+            return
+        if self.surface is None or self.frames % self.refresh_frames == 0:
+            self.surface = self.render()
+        self.frames += 1
+        screen.blit(self.surface, position)
+
+    def render(self):
+        rows = [("phase", "avg", "p50", "p95", "p99")]
+        for name, mean, p50, p95, p99 in self.profiler.report():
+            rows.append((name,) + tuple(f"{value:.2f}" for value in (mean, p50, p95, p99)))
+        if self.meter is not None:
+            # Same columns, except the last is the window's worst frame
+            for name, mean, p50, p95, worst in self.meter.report():
+                rows.append((name,) + tuple(f"{value:.2f}" for value in (mean, p50, p95, worst)))
+        if self.profiler.tracing:
+            rows.append((f"tracing, {len(self.profiler.trace_events)} events",))
+
+        # Right-aligned number columns, so proportional fonts line up too
+        name_width = max(self.font.size(row[0])[0] for row in rows) + 12
+        column_width = self.font.size("000.00")[0] + 8
+        height = self.font.get_linesize()
+        surface = pygame.Surface((name_width + column_width * 4 + 8, height * len(rows) + 8), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        for i, row in enumerate(rows):
+            y = 4 + i * height
+            # The tracing line changes every refresh, so it is not worth caching
+            name = self.label(row[0]) if len(row) > 1 else self.font.render(row[0], True, (255, 255, 255))
+            surface.blit(name, (4, y))
+            for j, cell in enumerate(row[1:]):
+                cell_width = self.digits.size(cell)[0] if i else self.label(cell).get_width()
+                x = 4 + name_width + column_width * (j + 1) - cell_width
+                if i:
+                    self.digits.draw(surface, cell, (x, y))
+                else:
+                    surface.blit(self.label(cell), (x, y))
+        return surface
+
+    def label(self, text):
+        surface = self.labels.get(text)
+        if surface is None:
+            surface = self.labels[text] = self.font.render(text, True, (255, 255, 255))
+        return surface
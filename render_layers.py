@@ -0,0 +1,131 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TiledLayer:
+    """Static world larger than the screen, baked lazily one tile at a time.
+
+    paint(surface, area) draws the part of the world inside area (a world
+    Rect) onto a tile-sized surface. Only tiles under the view are baked,
+    and the least recently drawn ones are dropped beyond capacity, so memory
+    stays bounded however wide the level is.
+    """
+
+    def __init__(self, tile_size, paint, capacity=8):
+        self.tile_width, self.tile_height = tile_size
+        self.paint = paint
+        self.capacity = capacity
+        self.tiles = OrderedDict()
+        self.bakes = 0
+
+    def invalidate(self):
+        self.tiles.clear()
+
+    def tile(self, tx, ty):
+        surface = self.tiles.get((tx, ty))
+        if surface is not None:
+            self.tiles.move_to_end((tx, ty))
+            return surface
+
+        surface = pygame.Surface((self.tile_width, self.tile_height))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        self.paint(surface, pygame.Rect(tx * self.tile_width, ty * self.tile_height,
+                                        self.tile_width, self.tile_height))
+        self.bakes += 1
+        self.tiles[(tx, ty)] = surface
+        if len(self.tiles) > self.capacity:
+            self.tiles.popitem(last=False)
+        return surface
+
+    def draw(self, screen, view):
+        """Blit the tiles under view (a world Rect) with view's top-left at the screen origin"""
+        width, height = self.tile_width, self.tile_height
+        for ty in range(view.top // height, (view.bottom - 1) // height + 1):
+            for tx in range(view.left // width, (view.right - 1) // width + 1):
+                screen.blit(self.tile(tx, ty), (tx * width - view.x, ty * height - view.y))
+
+
+class DirtyRenderer:
+    """Pushes only the changed parts of the screen with pygame.display.update(rects).
+
+    The canvas holds the background plus anything drawn persistently onto it
+    (mark() copies a changed canvas region to the screen). Sprites drawn
+    with blit()/add() are transient: begin() wipes last frame's ones by
+    copying the canvas back over them. present() sends the regions touched
+    this frame, or flips the whole display when they cover more than
+    max_dirty of it, where one big copy is cheaper than many small ones.
+    """
+
+    def __init__(self, screen, paint, max_dirty=0.35):
+        self.screen = screen
+        self.paint = paint
+        self.max_dirty = max_dirty
+        self.canvas = pygame.Surface(screen.get_size())
+        if pygame.display.get_surface() is not None:
+            self.canvas = self.canvas.convert()
+        self.screen_area = screen.get_width() * screen.get_height()
+        self.sprites = []
+        self.dirty = []
+        self.full = True
+        self.paint(self.canvas)
+
+        self.frames = 0
+        self.full_updates = 0
+        self.pixels = 0
+
+    def repaint(self, rect=None):
+        """Redraw the background inside rect (everything by default), e.g. after a coin is taken"""
+        if rect is None:
+            self.paint(self.canvas)
+            self.screen.blit(self.canvas, (0, 0))
+            self.full = True
+            return
+        self.canvas.set_clip(rect)
+        self.paint(self.canvas)
+        self.canvas.set_clip(None)
+        self.mark(rect)
+
+    def mark(self, rect):
+        """Show a region of the canvas that was drawn on; call before drawing this frame's sprites"""
+        rect = self.screen.blit(self.canvas, rect, rect)
+        if not self.full:
+            self.dirty.append(rect)
+
+    def begin(self):
+        if self.full:
+            self.screen.blit(self.canvas, (0, 0))
+        else:
+            blit = self.screen.blit
+            canvas = self.canvas
+            for rect in self.sprites:
+                blit(canvas, rect, rect)
+            self.dirty.extend(self.sprites)
+        # Both lists are emptied in place and reused every frame
+        self.sprites.clear()
+
+    def blit(self, surface, position):
+        rect = self.screen.blit(surface, position)
+        self.sprites.append(rect)
+        return rect
+
+    def add(self, rect):
+        """Record a transient sprite drawn straight onto the screen, e.g. the Rect pygame.draw returns"""
+        self.sprites.append(rect)
+        return rect
+
+    def present(self):
+        dirty = self.dirty
+        dirty.extend(self.sprites)
+        area = sum(rect.width * rect.height for rect in dirty)
+        self.frames += 1
+        if self.full or area > self.max_dirty * self.screen_area:
+            pygame.display.flip()
+            self.full_updates += 1
+            self.pixels += self.screen_area
+        else:
+            pygame.display.update(dirty)
+            self.pixels += area
+        dirty.clear()
+        self.full = False
@@ -0,0 +1,124 @@
+import struct
+from collections import namedtuple
+
+# Input bits, one byte per tick before run-length encoding
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+RESTART = 8
+
+MAGIC = b"MRPL"
+VERSION = 1
+
+# magic, version, level hash, final state checksum, seed, ticks, number of runs
+HEADER = struct.Struct("<4sB3x20s20sQII")
+
+Replay = namedtuple('Replay', ['level_hash', 'checksum', 'seed', 'ticks', 'runs'])
+
+
+class ReplayError(Exception):
+    pass
+
+
+def input_mask(inputs):
+    """Pack the four input flags of a tick into a bitmask"""
+    return (
+        (LEFT if inputs.left else 0)
+        | (RIGHT if inputs.right else 0)
+        | (JUMP if inputs.jump else 0)
+        | (RESTART if inputs.restart else 0)
+    )
+
+
+def mask_flags(mask):
+    """Unpack a bitmask into (left, right, jump, restart)"""
+    return (bool(mask & LEFT), bool(mask & RIGHT), bool(mask & JUMP), bool(mask & RESTART))
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated replay")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recorder:
+    """Collects per-tick inputs as (mask, run length) pairs while a game is played"""
+
+    def __init__(self, level_hash, seed=0):
+        self.level_hash = level_hash
+        self.seed = seed
+        self.runs = []
+        self.ticks = 0
+
+    def record(self, inputs):
+        mask = input_mask(inputs)
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.ticks += 1
+
+    def replay(self, checksum):
+        return Replay(self.level_hash, checksum, self.seed, self.ticks, [tuple(run) for run in self.runs])
+
+    def save(self, path, checksum):
+        save(path, self.replay(checksum))
+
+
+def save(path, replay):
+    body = bytearray()
+    for mask, length in replay.runs:
+        body.append(mask)
+        write_varint(body, length)
+    header = HEADER.pack(
+        MAGIC, VERSION, replay.level_hash, replay.checksum, replay.seed, replay.ticks, len(replay.runs)
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(body)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ReplayError(f"{path} is too short to be a replay")
+    magic, version, level_hash, checksum, seed, ticks, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError(f"{path} is not a replay file")
+    if version != VERSION:
+        raise ReplayError(f"{path} has unsupported replay version {version}")
+
+    runs = []
+    pos = HEADER.size
+    for _ in range(count):
+        if pos >= len(data):
+            raise ReplayError("truncated replay")
+        mask = data[pos]
+        length, pos = read_varint(data, pos + 1)
+        runs.append((mask, length))
+    if sum(length for _, length in runs) != ticks:
+        raise ReplayError(f"{path} run lengths do not add up to {ticks} ticks")
+
+    return Replay(level_hash, checksum, seed, ticks, runs)
+
+
+def iter_masks(replay):
+    """One input bitmask per tick"""
+    for mask, length in replay.runs:
+        for _ in range(length):
+            yield mask
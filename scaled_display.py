@@ -0,0 +1,110 @@
+"""Resolution-independent drawing: a logical canvas scaled up to whatever panel the game runs on.
+
+Games lay themselves out in logical pixels on a base size, say 1080x1920.
+The logical view keeps the panel's aspect ratio by growing the base in
+one direction, so nothing is letterboxed and nothing falls off the edge;
+controls are placed against its edges with anchored(). Frames are drawn
+at logical size times the render scale. ScaledDisplay.open() makes that
+the size of a pygame.SCALED window, so SDL's renderer stretches it to the
+panel and the CPU only ever touches render pixels; a ScaledDisplay over an
+ordinary surface stretches in software instead.
+"""
+import os
+
+import pygame
+
+
+def anchored(view, size, left=None, right=None, top=None, bottom=None):
+    """Rect of size placed by its distance from the edges of view (a (width, height) in logical px).
+
+    Give left or right, and top or bottom; a missing pair centres the rect on that axis.
+    """
+    width, height = size
+    if left is not None:
+        x = left
+    elif right is not None:
+        x = view[0] - right - width
+    else:
+        x = (view[0] - width) // 2
+    if top is not None:
+        y = top
+    elif bottom is not None:
+        y = view[1] - bottom - height
+    else:
+        y = (view[1] - height) // 2
+    return pygame.Rect(x, y, width, height)
+
+
+def layout(panel, base, render_scale):
+    """(logical size, render pixels per logical pixel, render size) for a panel of the given size"""
+    fit = min(panel[0] / base[0], panel[1] / base[1])
+    size = (round(panel[0] / fit), round(panel[1] / fit))
+    # Never more pixels than the panel has
+    scale = min(render_scale, fit)
+    return size, scale, (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+
+
+class ScaledDisplay:
+    """Logical canvas at least base in size, drawn at render_scale and stretched to the panel.
+
+    render_scale is render pixels per logical pixel: 1.0 draws at the logical
+    size, 0.5 at a quarter of the pixels for slow devices. smooth filters
+    the stretch instead of repeating pixels. panel is the physical size,
+    the display surface's own by default.
+    """
+
+    def __init__(self, display, base=(1080, 1920), render_scale=1.0, smooth=False, panel=None):
+        self.display = display
+        self.smooth = smooth
+        self.size, self.scale, size = layout(panel or display.get_size(), base, render_scale)
+        # A display already at render size (a SCALED window, or full resolution) is drawn on directly
+        self.direct = size == display.get_size()
+        self.surface = display if self.direct else pygame.Surface(size)
+
+    @classmethod
+    def open(cls, base=(1080, 1920), render_scale=1.0, smooth=False, flags=pygame.FULLSCREEN):
+        """Full-screen window at render size, stretched to the panel by SDL (pygame.SCALED) if smaller"""
+        panel = pygame.display.get_desktop_sizes()[0]
+        _, _, size = layout(panel, base, render_scale)
+        if size != tuple(panel):
+            # Read by SDL when the SCALED renderer is created
+            os.environ["SDL_RENDER_SCALE_QUALITY"] = "linear" if smooth else "nearest"
+            flags |= pygame.SCALED
+        display = pygame.display.set_mode(size, flags)
+        return cls(display, base, render_scale, smooth, panel)
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def rect(self, rect, out=None):
+        """Logical rect in render pixels, edges rounded so neighbouring rects still meet.
+
+        Written into the Rect out if given, so a draw loop can reuse one.
+        """
+        s = self.scale
+        left, top, width, height = rect
+        x0, y0 = round(left * s), round(top * s)
+        width, height = round((left + width) * s) - x0, round((top + height) * s) - y0
+        if out is None:
+            return pygame.Rect(x0, y0, width, height)
+        out.update(x0, y0, width, height)
+        return out
+
+    def to_logical(self, x, y):
+        """Logical position of a display pixel, e.g. a mouse position (SCALED windows report render pixels)"""
+        width, height = self.display.get_size()
+        return x * self.size[0] / width, y * self.size[1] / height
+
+    def present(self):
+        """Stretch the frame onto the display if SDL does not; the caller flips"""
+        if self.direct:
+            return
+        if self.smooth:
+            pygame.transform.smoothscale(self.surface, self.display.get_size(), self.display)
+        else:
+            pygame.transform.scale(self.surface, self.display.get_size(), self.display)
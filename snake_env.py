@@ -0,0 +1,136 @@
+"""Many independent Snake boards advanced together with NumPy, for training and evaluating agents.
+
+The rules are those of snake_game.py: the snake starts in the middle heading
+right, reversing is ignored, running into a wall or into the body (tail
+included) ends the game, and food eaten makes the snake one cell longer on
+the next move. Every board steps on every call; there is no window or clock.
+
+    env = SnakeEnv(4096, seed=1)
+    rewards, dones = env.step(actions)   # actions: one of RIGHT/DOWN/LEFT/UP per board
+
+Finished boards are reset at the end of the step that finished them; their
+final score is left in last_score.
+"""
+import numpy as np
+
+from snake_game import GRID_HEIGHT, GRID_WIDTH
+
+RIGHT, DOWN, LEFT, UP = range(4)
+DX = np.array([1, 0, -1, 0])
+DY = np.array([0, 1, 0, -1])
+
+
+class SnakeEnv:
+    """count Snake boards as arrays, one row per board.
+
+    grid[b, cell] is 1 where the body of board b is, with cells numbered
+    y * width + x. body[b] is a ring buffer of the body cells from tail[b]
+    to head[b], so a move writes one cell and, unless growing, drops one.
+    """
+
+    FOOD_REWARD = 1.0
+    DEATH_REWARD = -1.0
+    FOOD_TRIES = 4  # random draws before scanning a crowded board for its free cells
+
+    def __init__(self, count, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.arange(count)
+        cell_type = np.int16 if self.cells <= np.iinfo(np.int16).max else np.int32
+
+        self.grid = np.zeros((count, self.cells), dtype=np.uint8)
+        self.body = np.zeros((count, self.cells), dtype=cell_type)
+        self.head = np.zeros(count, dtype=np.int64)
+        self.tail = np.zeros(count, dtype=np.int64)
+        self.direction = np.zeros(count, dtype=np.int64)
+        self.grow = np.zeros(count, dtype=bool)
+        self.food = np.zeros(count, dtype=np.int64)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.steps = np.zeros(count, dtype=np.int64)
+        self.last_score = np.zeros(count, dtype=np.int64)
+        self.reset()
+
+    def reset(self, boards=None):
+        """Start the given boards (all by default) over"""
+        boards = self.boards if boards is None else np.asarray(boards, dtype=np.int64)
+        start = (self.height // 2) * self.width + self.width // 2
+        self.grid[boards] = 0
+        self.grid[boards, start] = 1
+        self.body[boards, 0] = start
+        self.head[boards] = 0
+        self.tail[boards] = 0
+        self.direction[boards] = RIGHT
+        self.grow[boards] = False
+        self.score[boards] = 0
+        self.steps[boards] = 0
+        self.food[boards] = self.place_food(boards)
+
+    def lengths(self):
+        return (self.head - self.tail) % self.cells + 1
+
+    def place_food(self, boards):
+        """A uniformly chosen free cell on each board, or -1 where the board is full"""
+        food = self.rng.integers(0, self.cells, len(boards))
+        taken = self.grid[boards, food] != 0
+        for _ in range(self.FOOD_TRIES):
+            if not taken.any():
+                return food
+            retry = taken.nonzero()[0]
+            food[retry] = self.rng.integers(0, self.cells, len(retry))
+            taken[retry] = self.grid[boards[retry], food[retry]] != 0
+        # Nearly full boards: pick among the free cells directly
+        for i in taken.nonzero()[0].tolist():
+            free = np.flatnonzero(self.grid[boards[i]] == 0)
+            food[i] = self.rng.choice(free) if len(free) else -1
+        return food
+
+    def step(self, actions=None):
+        """Move every snake one cell; returns (rewards, dones), one per board.
+
+        actions are directions (RIGHT, DOWN, LEFT or UP); None keeps each
+        snake going the way it faces.
+        """
+        boards = self.boards
+        width = self.width
+        if actions is not None:
+            actions = np.asarray(actions)
+            self.direction = np.where(actions != (self.direction + 2) % 4, actions, self.direction)
+
+        head = self.body[boards, self.head].astype(np.int64)
+        x = head % width + DX[self.direction]
+        y = head // width + DY[self.direction]
+        dead = (x < 0) | (x >= width) | (y < 0) | (y >= self.height)
+        cell = np.where(dead, 0, y * width + x)
+        dead |= self.grid[boards, cell] != 0
+
+        rows = (~dead).nonzero()[0]
+        new = cell[rows]
+        self.head[rows] = (self.head[rows] + 1) % self.cells
+        self.body[rows, self.head[rows]] = new
+        self.grid[rows, new] = 1
+        shrink = rows[~self.grow[rows]]
+        self.grid[shrink, self.body[shrink, self.tail[shrink]]] = 0
+        self.tail[shrink] = (self.tail[shrink] + 1) % self.cells
+        self.grow[rows] = False
+
+        eaten = new == self.food[rows]
+        ate = rows[eaten]
+        self.grow[ate] = True
+        self.score[ate] += 1
+        food = self.place_food(ate)
+        self.food[ate] = food
+        self.steps += 1
+
+        rewards = np.zeros(self.count, dtype=np.float32)
+        rewards[ate] = self.FOOD_REWARD
+        rewards[dead] = self.DEATH_REWARD
+        dones = dead
+        dones[ate[food < 0]] = True  # board filled: nothing left to eat
+        if dones.any():
+            finished = dones.nonzero()[0]
+            self.last_score[finished] = self.score[finished]
+            self.reset(finished)
+        return rewards, dones
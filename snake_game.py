@@ -1,6 +1,8 @@
 import pygame
 import random
 import sys
+from collections import deque
+from render_layers import DirtyRenderer
 
 pygame.init()
 
@@ -16,26 +18,77 @@ GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 
+def cell_rect(position):
+    return pygame.Rect(position[0] * CELL_SIZE, position[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+class Board:
+    """Which grid cells are taken, with O(1) updates, lookups and free-cell sampling.
+
+    free lists every free cell number; slot[cell] is where that cell sits in
+    free, or -1 while it is taken, so taking or releasing a cell is a swap
+    with the end of the list.
+    """
+    
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        self.free = list(range(width * height))
+        self.slot = list(range(width * height))
+    
+    def __contains__(self, position):
+        return self.slot[position[1] * self.width + position[0]] < 0
+    
+    def occupy(self, position):
+        cell = position[1] * self.width + position[0]
+        i = self.slot[cell]
+        last = self.free.pop()
+        if last != cell:
+            self.free[i] = last
+            self.slot[last] = i
+        self.slot[cell] = -1
+    
+    def release(self, position):
+        cell = position[1] * self.width + position[0]
+        self.slot[cell] = len(self.free)
+        self.free.append(cell)
+    
+    def random_free(self):
+        """A uniformly chosen free cell, or None when the board is full"""
+        if not self.free:
+            return None
+        y, x = divmod(self.free[random.randrange(len(self.free))], self.width)
+        return (x, y)
+
 class Snake:
-    def __init__(self):
-        self.positions = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        # Head first; the board mirrors the body for O(1) collision checks
+        self.positions = deque([(width // 2, height // 2)])
+        self.board = Board(width, height)
+        self.board.occupy(self.positions[0])
         self.direction = (1, 0)
         self.grow = False
+        # Cell the tail left on the last move, if any
+        self.vacated = None
         
     def move(self):
+        self.vacated = None
         head = self.positions[0]
         new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
         
-        if new_head[0] < 0 or new_head[0] >= GRID_WIDTH or new_head[1] < 0 or new_head[1] >= GRID_HEIGHT:
+        if new_head[0] < 0 or new_head[0] >= self.width or new_head[1] < 0 or new_head[1] >= self.height:
             return False
         
-        if new_head in self.positions:
+        if new_head in self.board:
             return False
         
-        self.positions.insert(0, new_head)
+        self.positions.appendleft(new_head)
+        self.board.occupy(new_head)
         
         if not self.grow:
-            self.positions.pop()
+            self.vacated = self.positions.pop()
+            self.board.release(self.vacated)
         else:
             self.grow = False
             
@@ -50,31 +103,41 @@ class Snake:
     
     def draw(self, screen):
         for position in self.positions:
-            rect = pygame.Rect(position[0] * CELL_SIZE, position[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, GREEN, rect)
-            pygame.draw.rect(screen, BLACK, rect, 1)
+            self.draw_segment(screen, position)
+    
+    def draw_segment(self, screen, position):
+        rect = cell_rect(position)
+        pygame.draw.rect(screen, GREEN, rect)
+        pygame.draw.rect(screen, BLACK, rect, 1)
+        return rect
 
 class Food:
-    def __init__(self):
-        self.position = self.generate_position()
+    def __init__(self, position=None):
+        self.position = self.generate_position() if position is None else position
     
     def generate_position(self):
         return (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
     
     def draw(self, screen):
-        rect = pygame.Rect(self.position[0] * CELL_SIZE, self.position[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        rect = cell_rect(self.position)
         pygame.draw.rect(screen, RED, rect)
+        return rect
 
 class Game:
-    def __init__(self):
+    def __init__(self, dirty=False):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Snake Game")
         self.clock = pygame.time.Clock()
         self.snake = Snake()
-        self.food = Food()
+        self.food = Food(self.snake.board.random_free())
         self.score = 0
         self.font = pygame.font.Font(None, 36)
         self.game_over = False
+        # Optional dirty-rect mode: the snake stays on a canvas and only changed cells are pushed
+        self.renderer = DirtyRenderer(self.screen, self.paint_background) if dirty else None
+        self.redraw = True
+        self.shown_head = None
+        self.shown_food = None
         
     def handle_events(self):
         for event in pygame.event.get():
@@ -105,10 +168,21 @@ class Game:
             if self.snake.positions[0] == self.food.position:
                 self.snake.grow_snake()
                 self.score += 10
-                while self.food.position in self.snake.positions:
-                    self.food.position = self.food.generate_position()
+                # Pick straight from the free cells rather than retrying random ones
+                position = self.snake.board.random_free()
+                if position is None:
+                    self.game_over = True
+                else:
+                    self.food.position = position
+    
+    def paint_background(self, surface):
+        surface.fill(BLACK)
     
     def draw(self):
+        if self.renderer:
+            self.draw_dirty()
+            return
+        
         self.screen.fill(BLACK)
         
         if not self.game_over:
@@ -130,11 +204,50 @@ class Game:
         
         pygame.display.flip()
     
+    def draw_dirty(self):
+        """Same picture as the full redraw, but a tick only touches the head, the tail and the food"""
+        renderer = self.renderer
+        canvas = renderer.canvas
+        
+        if self.redraw or self.game_over != (self.shown_head is None):
+            # Start, restart and game over change the whole picture
+            renderer.repaint()
+            if self.game_over:
+                game_over_text = self.font.render("Game Over!", True, WHITE)
+                restart_text = self.font.render("Press SPACE to restart or ESC to quit", True, WHITE)
+                canvas.blit(game_over_text, game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 30)))
+                canvas.blit(restart_text, restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 30)))
+                self.shown_head = self.shown_food = None
+            else:
+                self.snake.draw(canvas)
+                self.food.draw(canvas)
+                self.shown_head = self.snake.positions[0]
+                self.shown_food = self.food.position
+            renderer.mark(canvas.get_rect())
+            self.redraw = False
+        elif not self.game_over:
+            if self.snake.vacated is not None:
+                renderer.repaint(cell_rect(self.snake.vacated))
+                self.snake.vacated = None
+            head = self.snake.positions[0]
+            if head != self.shown_head:
+                renderer.mark(self.snake.draw_segment(canvas, head))
+                self.shown_head = head
+            if self.food.position != self.shown_food:
+                renderer.mark(self.food.draw(canvas))
+                self.shown_food = self.food.position
+        
+        renderer.begin()
+        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+        renderer.blit(score_text, (10, 10))
+        renderer.present()
+    
     def restart_game(self):
         self.snake = Snake()
-        self.food = Food()
+        self.food = Food(self.snake.board.random_free())
         self.score = 0
         self.game_over = False
+        self.redraw = True
     
     def run(self):
         running = True
@@ -148,5 +261,6 @@ class Game:
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
+    # snake_game.py [--dirty]: redraw and push only the cells that changed
+    game = Game(dirty="--dirty" in sys.argv[1:])
     game.run()
\ No newline at end of file
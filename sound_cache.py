@@ -0,0 +1,82 @@
+import glob
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pygame
+
+import synth
+
+# Bump when synth.py changes in a way that alters the rendered samples
+CACHE_VERSION = 1
+
+CACHE_DIR = os.environ.get(
+    "MARIO_SOUND_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sound_cache"),
+)
+
+
+class SoundCache:
+    """Content-addressed store of rendered PCM, one .npy file per sound"""
+
+    def __init__(self, directory=CACHE_DIR, sample_rate=synth.SAMPLE_RATE):
+        self.directory = directory
+        # The rate sounds are rendered at, not whatever the mixer happens to run at
+        self.sample_rate = sample_rate
+        self.timings = []
+
+    def key(self, name, params):
+        """Hash of everything that influences the rendered samples"""
+        blob = json.dumps(
+            [CACHE_VERSION, name, params, self.sample_rate],
+            sort_keys=True, default=list,
+        )
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+    def path(self, name, params):
+        return os.path.join(self.directory, f"{name}-{self.key(name, params)}.npy")
+
+    def get(self, name, params, render):
+        """Return cached PCM for name/params, calling render(params) on a miss"""
+        start = time.perf_counter()
+        path = self.path(name, params)
+
+        try:
+            pcm = np.load(path, mmap_mode="r")
+            hit = True
+        except (OSError, ValueError):
+            pcm = render(params)
+            self.store(name, path, pcm)
+            hit = False
+
+        self.timings.append((name, hit, time.perf_counter() - start))
+        return pcm
+
+    def store(self, name, path, pcm):
+        """Write the entry atomically and drop stale entries of the same sound"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for old in glob.glob(os.path.join(self.directory, f"{name}-*.npy")):
+                os.remove(old)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, pcm)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # A read-only cache only costs us the next startup
+            print(f"Could not write sound cache entry {path}: {e}")
+
+    def report(self):
+        for name, hit, seconds in self.timings:
+            print(f"Sound cache {'hit ' if hit else 'miss'} {name}: {seconds * 1000:.1f} ms")
+
+
+def cached_sound(cache, name, params, render):
+    """Build a pygame Sound from render(params), going through cache if given"""
+    if cache is None:
+        pcm = render(params)
+    else:
+        pcm = cache.get(name, params, render)
+    return pygame.sndarray.make_sound(pcm)
@@ -0,0 +1,109 @@
+class SpatialHash:
+    """Uniform grid over world coordinates for broadphase collision queries.
+
+    Items can be any object (pygame.Rect included); each is stored with the
+    rect it occupies. Static items are inserted once, moving items call
+    move() after they update and are only re-bucketed when they cross cells.
+    Queries return overlapping items in insertion order.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, item):
+        return id(item) in self.entries
+
+    def __iter__(self):
+        for _, item, _, _ in sorted(self.entries.values(), key=lambda entry: entry[0]):
+            yield item
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            max(rect.left, rect.right - 1) // size,
+            max(rect.top, rect.bottom - 1) // size,
+        )
+
+    def insert(self, item, rect=None):
+        """Add item occupying rect (defaults to item.rect, or item itself for a Rect)"""
+        if rect is None:
+            rect = getattr(item, "rect", item)
+        key = id(item)
+        if key in self.entries:
+            self.remove(item)
+        cells = self.cell_range(rect)
+        self.entries[key] = (self.counter, item, rect, cells)
+        self.counter += 1
+        self.add_to_cells(key, cells)
+
+    def remove(self, item):
+        key = id(item)
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.remove_from_cells(key, entry[3])
+
+    def move(self, item, rect=None):
+        """Update the bucket of an item whose rect changed"""
+        key = id(item)
+        order, item, old_rect, old_cells = self.entries[key]
+        if rect is None:
+            rect = old_rect
+        cells = self.cell_range(rect)
+        if cells != old_cells:
+            self.remove_from_cells(key, old_cells)
+            self.add_to_cells(key, cells)
+        self.entries[key] = (order, item, rect, cells)
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+
+    def add_to_cells(self, key, cells):
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is None:
+                    bucket = self.cells[(cx, cy)] = set()
+                bucket.add(key)
+
+    def remove_from_cells(self, key, cells):
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells[(cx, cy)]
+                bucket.discard(key)
+                if not bucket:
+                    del self.cells[(cx, cy)]
+
+    def query_rect(self, rect):
+        """Items whose rect overlaps rect"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return self.ordered(key for key in found if self.entries[key][2].colliderect(rect))
+
+    def query_point(self, x, y):
+        """Items whose rect contains the point"""
+        size = self.cell_size
+        bucket = self.cells.get((int(x // size), int(y // size)))
+        if not bucket:
+            return []
+        return self.ordered(key for key in bucket if self.entries[key][2].collidepoint(x, y))
+
+    def ordered(self, keys):
+        entries = [self.entries[key] for key in keys]
+        entries.sort(key=lambda entry: entry[0])
+        return [entry[1] for entry in entries]
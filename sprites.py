@@ -0,0 +1,92 @@
+import pygame
+
+EMPTY = {}
+
+class PixelSprite:
+    """Pixel-art sprite described as layers of (part, pixel list), colored by a palette"""
+
+    def __init__(self, layers, pixel_size=2, offset=(0, 0)):
+        self.layers = layers
+        self.pixel_size = pixel_size
+        self.offset = offset
+
+    def size(self):
+        max_x = max(px for _, pixels in self.layers for px, _ in pixels)
+        max_y = max(py for _, pixels in self.layers for _, py in pixels)
+        return (
+            self.offset[0] + (max_x + 1) * self.pixel_size,
+            self.offset[1] + (max_y + 1) * self.pixel_size,
+        )
+
+    def colors(self, palette):
+        return tuple(palette[part] for part, _ in self.layers)
+
+    def render(self, palette):
+        surface = pygame.Surface(self.size(), pygame.SRCALPHA)
+        size = self.pixel_size
+        off_x, off_y = self.offset
+
+        for part, pixels in self.layers:
+            color = palette[part]
+            for px, py in pixels:
+                surface.fill(color, (off_x + px * size, off_y + py * size, size, size))
+
+        return surface
+
+
+class PaintedSprite:
+    """Sprite drawn by a function onto a transparent surface of fixed size"""
+
+    def __init__(self, size, paint):
+        self.size = size
+        self.paint = paint
+
+    def colors(self, palette):
+        return tuple(sorted(palette.items())) if palette else ()
+
+    def render(self, palette):
+        surface = pygame.Surface(self.size, pygame.SRCALPHA)
+        self.paint(surface, palette)
+        return surface
+
+
+class SpriteCache:
+    """Baked surfaces keyed by sprite and the colors it resolves to.
+
+    Palettes are looked up by identity after their first use, so a get() in
+    the draw loop is two dict hits and allocates nothing; a palette must not
+    be changed once it has been drawn with.
+    """
+
+    def __init__(self):
+        self.surfaces = {}
+        self.resolved = {}
+
+    def get(self, sprite, palette=None):
+        entry = self.resolved.get(id(sprite), EMPTY).get(id(palette))
+        # The palette is kept in the entry, so its id cannot be reused by another one
+        if entry is not None and entry[0] is palette:
+            return entry[1]
+        surface = self.bake(sprite, palette)
+        self.resolved.setdefault(id(sprite), {})[id(palette)] = (palette, surface)
+        return surface
+
+    def bake(self, sprite, palette):
+        # Palette swaps that resolve to the same colors share one surface
+        key = (id(sprite), sprite.colors(palette))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = sprite.render(palette)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.surfaces[key] = surface
+        return surface
+
+    def preload(self, sprite, palettes):
+        """Bake every visual state up front so the first frame doesn't stall"""
+        for palette in palettes:
+            self.get(sprite, palette)
+
+    def clear(self):
+        self.surfaces.clear()
+        self.resolved.clear()
@@ -0,0 +1,121 @@
+import numpy as np
+
+SAMPLE_RATE = 22050
+
+
+def sample_index(frames, start=0):
+    """Absolute sample positions for a block of frames"""
+    return np.arange(start, start + frames, dtype=np.float64)
+
+
+def square_wave(frequency, frames, amplitude=1.0, sample_rate=SAMPLE_RATE):
+    """Retro square wave oscillator"""
+    i = sample_index(frames)
+    return amplitude * np.sign(np.sin(2 * np.pi * frequency * i / sample_rate))
+
+
+def sine_wave(frequency, frames, amplitude=1.0, start=0, sample_rate=SAMPLE_RATE):
+    """Sine oscillator, phase taken from the absolute sample position"""
+    i = sample_index(frames, start)
+    return amplitude * np.sin(2 * np.pi * frequency * i / sample_rate)
+
+
+def sweep(start_freq, end_freq, frames, amplitude=1.0, sample_rate=SAMPLE_RATE):
+    """Sine whose frequency moves linearly from start_freq to end_freq"""
+    i = sample_index(frames)
+    freq = start_freq + (end_freq - start_freq) * (i / frames)
+    return amplitude * np.sin(2 * np.pi * freq * i / sample_rate)
+
+
+def fade_out(frames, depth=1.0):
+    """Linear envelope falling from 1 to 1 - depth over the block"""
+    return 1 - sample_index(frames) / frames * depth
+
+
+def fade_edges(samples, fade_frames):
+    """Fade in/out to prevent clicks (in place)"""
+    if fade_frames > 0:
+        ramp = np.arange(fade_frames) / fade_frames
+        samples[:fade_frames] *= ramp
+        samples[len(samples) - fade_frames:] *= ramp[::-1]
+    return samples
+
+
+def tone(frequency, duration, amplitude=0.15, sample_rate=SAMPLE_RATE):
+    """Square wave note with short fades at both ends"""
+    frames = int(duration * sample_rate)
+    samples = square_wave(frequency, frames, amplitude, sample_rate)
+    return fade_edges(samples, frames // 20)
+
+
+def arpeggio(frequencies, duration, amplitude=1.0, fade_depth=0.0, sample_rate=SAMPLE_RATE):
+    """Split duration evenly between frequencies, each note with its own fade"""
+    frames = int(duration * sample_rate)
+    samples = np.zeros(frames)
+    count = len(frequencies)
+
+    for n, freq in enumerate(frequencies):
+        start_frame = n * frames // count
+        end_frame = (n + 1) * frames // count
+        length = end_frame - start_frame
+        samples[start_frame:end_frame] = (
+            sine_wave(freq, length, amplitude, start_frame, sample_rate)
+            * fade_out(length, fade_depth)
+        )
+
+    return samples
+
+
+def melody_length(melody, notes, sample_rate=SAMPLE_RATE):
+    """Total frames of a melody, skipping notes missing from the table"""
+    return sum(int(duration * sample_rate) for note, duration in melody if note in notes)
+
+
+def render_melody(melody, notes, amplitude=0.15, sample_rate=SAMPLE_RATE):
+    """Render (note, duration) pairs into one preallocated buffer"""
+    samples = np.empty(melody_length(melody, notes, sample_rate))
+    position = 0
+
+    for note, duration in melody:
+        if note in notes:
+            block = tone(notes[note], duration, amplitude, sample_rate)
+            samples[position:position + len(block)] = block
+            position += len(block)
+
+    return samples
+
+
+def stream_melody(melody, notes, chunk_frames, amplitude=0.15, loop=True, sample_rate=SAMPLE_RATE):
+    """Yield the rendered melody in blocks of chunk_frames, rendering one note at a time.
+
+    Blocks join up to exactly the samples render_melody produces; with loop
+    the melody repeats forever. The last block of a finite stream may be short.
+    """
+    if not melody_length(melody, notes, sample_rate):
+        return
+    block = np.empty(chunk_frames)
+    filled = 0
+    while True:
+        for note, duration in melody:
+            if note not in notes:
+                continue
+            samples = tone(notes[note], duration, amplitude, sample_rate)
+            while len(samples):
+                take = min(len(samples), chunk_frames - filled)
+                block[filled:filled + take] = samples[:take]
+                samples = samples[take:]
+                filled += take
+                if filled == chunk_frames:
+                    yield block.copy()
+                    filled = 0
+        if not loop:
+            break
+    if filled:
+        yield block[:filled].copy()
+
+
+def to_pcm(samples):
+    """Convert float samples to interleaved 16-bit stereo frames"""
+    mono = (samples * 32767).astype(np.int16)
+    return np.column_stack((mono, mono))
+
@@ -0,0 +1,11 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# After the drivers are chosen; fonts and the mixer are used as the games use them
+import pygame
+
+pygame.init()
@@ -0,0 +1,79 @@
+import gc
+import random
+
+import pygame
+
+import platformer_v2
+from profiler import AllocationMeter
+from sprites import SpriteCache
+from timestep import FixedTimestep
+
+
+class Node:
+    # Not lists: freed lists go to a free list, which the collector's count never sees
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def test_meter_counts_what_a_frame_keeps_across_collections():
+    meter = AllocationMeter()
+    kept = []
+    gc.collect()
+    meter.start()
+    try:
+        # Fewer than a collection's worth of temporaries, all gone by the end of the frame
+        temporaries = [Node(i) for i in range(300)]
+        del temporaries
+        meter.end_frame()
+        kept.extend(Node(i) for i in range(5000))
+        meter.end_frame()
+    finally:
+        meter.stop()
+    dropped_objects, kept_objects = meter.history["objects"]
+    assert dropped_objects < 10
+    # The count is net of anything else freed meanwhile
+    assert 4900 <= kept_objects < 5100
+    assert meter.history["collections"][1] > 0
+
+
+def test_sprite_cache_hits_allocate_nothing():
+    cache = SpriteCache()
+    palette, same_colors = dict(platformer_v2.PLAYER_PALETTE), dict(platformer_v2.PLAYER_PALETTE)
+    surface = cache.get(platformer_v2.PLAYER_SPRITE, palette)
+    assert cache.get(platformer_v2.PLAYER_SPRITE, same_colors) is surface
+    gc.disable()
+    try:
+        before = gc.get_count()[0]
+        for _ in range(1000):
+            cache.get(platformer_v2.PLAYER_SPRITE, palette)
+        assert gc.get_count()[0] == before
+    finally:
+        gc.enable()
+
+
+def test_game_frames_keep_nothing_once_warmed_up():
+    random.seed(0)
+    rng = random.Random(1)
+    state = platformer_v2.new_game()
+    background = platformer_v2.create_background(state)
+    screen = pygame.Surface((platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT))
+    timestep = FixedTimestep(platformer_v2.FPS)
+    interpolation = platformer_v2.Interpolation(state)
+    meter = AllocationMeter(window=600)
+    inputs = platformer_v2.NO_INPUT
+    for frame in range(1200):
+        if frame == 600:
+            meter.start()
+        timestep.advance(1 / 144)
+        for _ in range(timestep.steps()):
+            if rng.random() < 0.05:
+                inputs = platformer_v2.REPLAY_INPUTS[rng.randrange(8)]
+            interpolation.capture(state)
+            state, _ = platformer_v2.step(state, inputs)
+        platformer_v2.draw_scene(screen, state, background, interpolation, timestep.alpha)
+        meter.end_frame()
+    meter.stop()
+    mean, _, _, _ = meter.stats("objects")
+    assert mean < 0.1
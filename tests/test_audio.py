@@ -0,0 +1,25 @@
+import pygame
+
+import synth
+from audio import AudioEngine, open_mixer
+
+
+def test_open_mixer_reopens_a_mixer_opened_at_other_settings():
+    pygame.mixer.quit()
+    pygame.mixer.init(frequency=44100, size=-16, channels=2)
+    try:
+        assert open_mixer(synth.SAMPLE_RATE, 128) == (synth.SAMPLE_RATE, -16, 2)
+    finally:
+        pygame.mixer.quit()
+
+
+def test_open_mixer_before_pygame_init():
+    pygame.mixer.quit()
+    open_mixer(synth.SAMPLE_RATE, 256)
+    pygame.init()
+    try:
+        assert pygame.mixer.get_init() == (synth.SAMPLE_RATE, -16, 2)
+        # The output buffer is counted at the rate the mixer really runs at
+        assert AudioEngine(4, 256).output_latency == 256 / synth.SAMPLE_RATE
+    finally:
+        pygame.mixer.quit()
@@ -0,0 +1,16 @@
+import batch_sim
+import level_gen
+
+
+def test_results_do_not_depend_on_the_worker_count():
+    seeds = range(6)
+    alone = batch_sim.run_batch(seeds, 600, workers=1)
+    pooled = batch_sim.run_batch(seeds, 600, workers=2)
+    assert alone == pooled
+    assert [result.seed for result in pooled] == list(seeds)
+    assert len(set(alone)) > 1
+
+
+def test_generated_levels_run_in_workers():
+    results = batch_sim.run_batch(range(3), 300, workers=2, level_factory=level_gen.build_level)
+    assert results == batch_sim.run_batch(range(3), 300, workers=1, level_factory=level_gen.build_level)
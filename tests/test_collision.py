@@ -0,0 +1,27 @@
+import pygame
+
+import collision
+
+
+def test_time_of_impact_of_a_fall_onto_a_thin_platform():
+    platform = pygame.Rect(0, 100, 200, 20)
+    # Crosses the whole platform in one move; only the path shows the hit
+    assert collision.time_of_impact((50, 40, 30, 40), 0, 200, platform) == 0.1
+
+
+def test_time_of_impact_misses():
+    platform = pygame.Rect(0, 100, 200, 20)
+    assert collision.time_of_impact((300, 40, 30, 40), 0, 200, platform) is None
+    assert collision.time_of_impact((50, 40, 30, 40), 0, 10, platform) is None
+    # Already overlapping: moving out, not in
+    assert collision.time_of_impact((50, 90, 30, 40), 0, 10, platform) is None
+
+
+def test_first_hit_takes_the_nearest_target():
+    near, far = pygame.Rect(0, 100, 200, 20), pygame.Rect(0, 200, 200, 20)
+    assert collision.first_hit((50, 0, 30, 40), 0, 300, [far, near]) == (0.2, near)
+    assert collision.first_hit((50, 0, 30, 40), 0, 30, [far, near]) == (1.0, None)
+
+
+def test_swept_rect_covers_both_ends():
+    assert collision.swept_rect((10.5, 20, 30, 40), 5, -10) == pygame.Rect(10, 10, 36, 50)
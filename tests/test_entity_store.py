@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+import pygame
+
+from entity_store import CoinStore, EnemyStore
+
+
+def random_enemies(rng, count):
+    enemies = []
+    for _ in range(count):
+        left = rng.randrange(0, 3000)
+        enemies.append((left + rng.randrange(0, 200), rng.randrange(0, 600), left, left + rng.randrange(60, 400)))
+    return enemies
+
+
+def make_store(enemies):
+    x, y, left, right = zip(*enemies)
+    count = len(enemies)
+    return EnemyStore(x, y, [25] * count, [25] * count, [2] * count, left, right)
+
+
+def test_patrols_match_stepping_each_enemy():
+    rng = random.Random(0)
+    enemies = random_enemies(rng, 200)
+    store, by_rows = make_store(enemies), make_store(enemies)
+    # What Enemy.update did for one enemy at a time
+    xs = [float(x) for x, _, _, _ in enemies]
+    velocities = [2.0] * len(enemies)
+    for tick in range(500):
+        for i, (_, _, left, right) in enumerate(enemies):
+            xs[i] += velocities[i]
+            if xs[i] <= left or xs[i] >= right - 25:
+                velocities[i] *= -1
+        store.update()
+        by_rows.update(np.arange(len(enemies)))
+        assert store.x.tolist() == xs
+        assert by_rows.x.tolist() == xs
+
+
+def test_overlap_queries_match_rect_tests():
+    rng = random.Random(1)
+    enemies = make_store(random_enemies(rng, 300))
+    enemies.defeat(5)
+    coins = CoinStore([rng.randrange(0, 3000) for _ in range(400)], [rng.randrange(0, 600) for _ in range(400)],
+                      [20] * 400, [20] * 400)
+    coins.collect(np.array([3, 7]))
+    for _ in range(300):
+        # Small rects hit the scalar coin path, wide ones the array path
+        rect = pygame.Rect(rng.randrange(-100, 3100), rng.randrange(-100, 700),
+                           rng.choice([30, 800]), rng.choice([40, 600]))
+        expected = [i for i in range(len(enemies.x)) if i != 5 and rect.colliderect(
+            pygame.Rect(round(enemies.x[i]), enemies.top[i], 25, 25))]
+        assert enemies.overlapping(rect).tolist() == expected
+        expected = [i for i in range(400) if i not in (3, 7) and rect.colliderect(
+            pygame.Rect(coins.x[i], coins.y[i], 20, 20))]
+        assert coins.overlapping(rect).tolist() == expected
+    assert coins.collected_count == 2
@@ -0,0 +1,57 @@
+import threading
+
+from event_bus import COIN, JUMP, AsyncSink, EventBus, EventCounter, GameEvent
+
+
+def event(kind, tick=0):
+    return GameEvent(kind, tick, 100.0, 200.0, 0)
+
+
+def test_handlers_only_get_the_kinds_they_subscribed_to():
+    bus = EventBus()
+    counter = bus.subscribe(EventCounter())
+    coins = []
+    bus.subscribe(coins.append, kinds=(COIN,))
+    bus.publish(event(JUMP))
+    bus.publish(event(COIN))
+    assert counter.counts == {JUMP: 1, COIN: 1}
+    bus.unsubscribe(counter)
+    bus.publish(event(COIN))
+    assert counter.counts == {JUMP: 1, COIN: 1}
+    assert bus.published == 3
+    assert [e.kind for e in coins] == [COIN, COIN]
+
+
+def test_sink_writes_every_event_in_order_and_samples_by_kind():
+    batches = []
+    sink = AsyncSink(batches.append, batch_size=8, flush_interval=0.05, sample={JUMP: 3})
+    for tick in range(40):
+        sink(event(JUMP if tick % 2 else COIN, tick))
+    sink.close()
+    written = [e.tick for batch in batches for e in batch]
+    coins = list(range(0, 40, 2))
+    jumps = list(range(1, 40, 2))[::3]
+    assert written == sorted(coins + jumps)
+    assert all(len(batch) <= 8 for batch in batches)
+    assert (sink.written, sink.lost) == (len(written), 0)
+
+
+def test_a_full_queue_loses_events_instead_of_blocking():
+    writing, release = threading.Event(), threading.Event()
+    batches = []
+
+    def stuck(batch):
+        writing.set()
+        release.wait()
+        batches.append(batch)
+
+    sink = AsyncSink(stuck, batch_size=1, capacity=4)
+    sink(event(COIN, 0))
+    assert writing.wait(2.0)
+    # The writer holds the first event; four more fit in the queue
+    for tick in range(1, 20):
+        sink(event(COIN, tick))
+    assert sink.lost == 15
+    release.set()
+    sink.close()
+    assert [e.tick for batch in batches for e in batch] == [0, 1, 2, 3, 4]
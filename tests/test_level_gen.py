@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import level_gen
+import levels
+import platformer_v2
+
+
+@pytest.mark.parametrize("width", [810, 1234, 2401])
+def test_widths_off_the_ground_grid_generate(width):
+    # Ground stretches are multiples of 40, so the last one gets clipped to the level width
+    for seed in range(150):
+        level = level_gen.generate(seed, width=width)
+        assert level_gen.reachable(level)
+        assert (level.platforms['width'] >= 20).all()
+
+
+def test_generation_is_seeded():
+    first, second = level_gen.generate(7), level_gen.generate(7)
+    for name in ("platforms", "enemies", "coins"):
+        assert (getattr(first, name) == getattr(second, name)).all()
+
+
+def level_with_ledge(rise, gap):
+    """Ground ending at x = 130, and a ledge rise px higher starting gap px past it"""
+    ground = platformer_v2.Platform(0, 500, 130, 40)
+    ledge = platformer_v2.Platform(130 + gap, 500 - rise, 100, 20)
+    return ground, ledge
+
+
+def lands_on_ledge(rise, gap):
+    """Jump from the last x that stands on the ground and steer right until over the ledge, through step()"""
+    ground, ledge = level_with_ledge(rise, gap)
+    state = platformer_v2.GameState([ground, ledge], [], [platformer_v2.Coin(700, 300)])
+    player = state.player
+    player.teleport(ground.rect.right - 1, ground.rect.top - player.height)
+    state, _ = platformer_v2.step(state, platformer_v2.NO_INPUT)
+    for _ in range(120):
+        steer = player.x + player.width <= ledge.rect.left
+        state, _ = platformer_v2.step(state, platformer_v2.Inputs(False, steer, True, False))
+        if player.on_ground and player.y + player.height == ledge.rect.top:
+            return True
+    return False
+
+
+@pytest.mark.parametrize("gap", [0, 80, 120, 140])
+def test_solver_reaches_ledges_exactly_as_high_and_far_as_the_player_jumps(gap):
+    reached = []
+    for rise in range(120, 200):
+        platforms = np.array([(*platform.rect, 0) for platform in level_with_ledge(rise, gap)], dtype=levels.PLATFORM)
+        level = levels.Level(platforms, np.zeros(0, dtype=levels.ENEMY), np.zeros(0, dtype=levels.COIN))
+        reach = level_gen.solve(level, spawn=(100, 459))
+        assert bool(reach.platforms[1]) == lands_on_ledge(rise, gap), rise
+        reached.append(bool(reach.platforms[1]))
+    assert any(reached) and not all(reached)
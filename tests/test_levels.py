@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+
+import levels
+import platformer_v2
+import replay
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    path = str(tmp_path / "platformer_v2.lvl")
+    levels.compile_level(levels.load_text(levels.level_path("platformer_v2.txt")), path)
+    return path
+
+
+def test_compiled_level_round_trips(compiled):
+    text = levels.load_text(levels.level_path("platformer_v2.txt"))
+    loaded = levels.load(compiled)
+    for expected, records in zip(text, loaded):
+        assert np.array_equal(expected, records)
+    with levels.LevelFile(compiled) as level_file:
+        assert level_file.digest == levels.digest(text)
+
+
+def test_level_file_closes_its_map(compiled):
+    with levels.LevelFile(compiled) as level_file:
+        assert len(level_file.platforms) > 0
+    assert level_file.map.closed
+    level_file = platformer_v2.load_level(compiled)
+    platformer_v2.new_game(level_file)
+    platformer_v2.close_level(level_file)
+    assert level_file.map.closed
+
+
+def test_text_and_compiled_forms_hash_the_same(compiled):
+    text_state = platformer_v2.new_game()
+    with platformer_v2.load_level(compiled) as level_file:
+        compiled_state = platformer_v2.new_game(level_file)
+    assert text_state.level_hash == compiled_state.level_hash
+
+
+def record(path, ticks=3000):
+    random.seed(0)
+    rng = random.Random(1)
+    state = platformer_v2.new_game()
+    recorder = replay.Recorder(state.level_hash, seed=0)
+    inputs = platformer_v2.NO_INPUT
+    for _ in range(ticks):
+        if rng.random() < 0.05:
+            inputs = platformer_v2.REPLAY_INPUTS[rng.randrange(8)]
+        recorder.record(inputs)
+        state, _ = platformer_v2.step(state, inputs)
+    recorder.save(path, platformer_v2.state_checksum(state))
+    return state
+
+
+def test_replay_recorded_on_text_form_verifies_on_compiled_form(compiled, tmp_path):
+    path = str(tmp_path / "game.replay")
+    recorded = record(path)
+    with levels.LevelFile(compiled) as level_file:
+        state, ok = platformer_v2.play_replay(path, level_file)
+    assert ok
+    assert (state.tick, state.score) == (recorded.tick, recorded.score)
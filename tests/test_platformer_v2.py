@@ -0,0 +1,76 @@
+import random
+
+import pygame
+
+import platformer_v2
+from camera import Camera
+from platformer_v2 import NO_INPUT, Coin, GameState, Inputs, Platform, step
+from spatial import SpatialHash
+
+
+def spawn_level():
+    """Ground, a platform just above the spawn point and a coin far out of reach"""
+    return GameState([Platform(0, 560, 800, 40), Platform(90, 70, 100, 20)], [], [Coin(700, 300)])
+
+
+def test_respawn_does_not_land_on_platforms_between_death_and_spawn():
+    state = spawn_level()
+    player = state.player
+    player.x, player.y = 100, 0
+    player.rect.topleft = (100, 0)
+    player.die()
+    events = []
+    while "respawn" not in events:
+        state, events = step(state, NO_INPUT)
+    assert (player.x, player.y) == (100, 100)
+    assert player.rect.topleft == (100, 100)
+    state, _ = step(state, NO_INPUT)
+    assert player.y > 100
+    assert not player.on_ground
+
+
+def test_restart_does_not_land_on_platforms_between_player_and_spawn():
+    state = spawn_level()
+    player = state.player
+    player.x, player.y = 100, 0
+    player.rect.topleft = (100, 0)
+    state.game_won = True
+    state, _ = step(state, Inputs(False, False, False, True))
+    assert player.y > 100
+    assert not player.on_ground
+
+
+def test_fast_falls_land_on_thin_platforms():
+    """Dropped from any height, with gravity scaled as for ticks down to a sixteenth of FPS, the player never falls through"""
+    platform = pygame.Rect(300, 2000, 200, 20)
+    platforms = SpatialHash()
+    platforms.insert(platform)
+    camera = Camera(platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT, pygame.Rect(0, 0, 800, 4000))
+    for scale in (1, 4, 16):
+        for height in range(0, 1950, 25):
+            player = platformer_v2.Player(platform.x + 50, platform.top - 40 - height)
+            player.gravity *= scale * scale
+            while not player.on_ground and player.y < platform.bottom:
+                player.update(platforms, NO_INPUT, [], camera)
+            assert player.on_ground, (scale, height)
+            assert player.rect.bottom == platform.top
+
+
+def test_drawing_at_alpha_one_matches_drawing_the_last_tick():
+    random.seed(0)
+    rng = random.Random(1)
+    state = platformer_v2.new_game()
+    background = platformer_v2.create_background(state)
+    interpolation = platformer_v2.Interpolation(state)
+    size = (platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT)
+    inputs = NO_INPUT
+    for tick in range(1500):
+        if rng.random() < 0.05:
+            inputs = platformer_v2.REPLAY_INPUTS[rng.randrange(8)]
+        interpolation.capture(state)
+        state, _ = step(state, inputs)
+        if tick % 50 == 0:
+            blended, plain = pygame.Surface(size), pygame.Surface(size)
+            platformer_v2.draw_scene(blended, state, background, interpolation, 1.0)
+            platformer_v2.draw_scene(plain, state, background)
+            assert pygame.image.tobytes(blended, "RGB") == pygame.image.tobytes(plain, "RGB"), tick
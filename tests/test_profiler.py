@@ -0,0 +1,43 @@
+import json
+import time
+
+from profiler import NULL_SCOPE, Profiler
+
+
+def test_scopes_are_summed_per_frame():
+    profiler = Profiler(window=10)
+    profiler.end_frame()
+    for _ in range(3):
+        with profiler.scope("update"):
+            time.sleep(0.002)
+    profiler.end_frame()
+    (update,) = profiler.history["update"]
+    (frame,) = profiler.history["frame"]
+    assert 0.006 <= update <= frame
+    assert [row[0] for row in profiler.report()] == ["frame", "update"]
+
+
+def test_disabled_profiler_hands_out_the_shared_null_scope():
+    profiler = Profiler(enabled=False)
+    assert profiler.scope("update") is NULL_SCOPE
+    profiler.end_frame()
+    assert profiler.history == {}
+
+
+def test_trace_is_written_as_chrome_trace_events(tmp_path):
+    profiler = Profiler()
+    profiler.end_frame()
+    profiler.start_trace()
+    for _ in range(2):
+        with profiler.scope("sprites"):
+            pass
+        profiler.end_frame()
+    path = str(tmp_path / "trace.json")
+    assert profiler.stop_trace(path) == 4
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    assert [event["name"] for event in events] == ["sprites", "frame", "sprites", "frame"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    frame, sprites = events[1], events[2]
+    # The second frame's scope starts after the first frame closed (to float rounding)
+    assert sprites["ts"] >= frame["ts"] + frame["dur"] - 1e-3
@@ -0,0 +1,77 @@
+import random
+
+import pygame
+
+import platformer_v2
+from render_layers import DirtyRenderer, TiledLayer
+
+
+def immediate(state, view):
+    surface = pygame.Surface(view.size)
+    platformer_v2.draw_sky(surface, view.top, state.camera.world.bottom)
+    for platform in state.platforms:
+        platform.draw(surface, (-view.x, -view.y))
+    return surface
+
+
+def test_background_tiles_match_drawing_the_view_directly():
+    # Views straddling tile edges show no seams between the tiles
+    level = ([platformer_v2.Platform(0, 560, 2400, 40), platformer_v2.Platform(700, 400, 260, 20, 1),
+              platformer_v2.Platform(1550, 300, 120, 20, 2)], [], [platformer_v2.Coin(100, 100)])
+    state = platformer_v2.new_game(level)
+    background = platformer_v2.create_background(state)
+    for x in (0, 390, 777, 1200, 1600):
+        view = pygame.Rect(x, 0, platformer_v2.SCREEN_WIDTH, platformer_v2.SCREEN_HEIGHT)
+        tiled = pygame.Surface(view.size)
+        background.draw(tiled, view)
+        assert pygame.image.tobytes(tiled, "RGB") == pygame.image.tobytes(immediate(state, view), "RGB"), x
+
+
+def test_tiles_are_baked_once_and_evicted_least_recently_drawn_first():
+    painted = []
+    layer = TiledLayer((100, 100), lambda surface, area: painted.append(area.topleft), capacity=2)
+    screen = pygame.Surface((100, 100))
+    for x in (0, 0, 100, 0, 200, 100):
+        layer.draw(screen, pygame.Rect(x, 0, 100, 100))
+    assert painted == [(0, 0), (100, 0), (200, 0), (100, 0)]
+
+
+def test_dirty_updates_show_the_same_frames_as_full_redraws(monkeypatch):
+    rng = random.Random(0)
+    screen = pygame.display.set_mode((320, 240))
+    # What the viewer sees: only flip() and update(rects) change it
+    shown = pygame.Surface(screen.get_size())
+    monkeypatch.setattr(pygame.display, "flip", lambda: shown.blit(screen, (0, 0)))
+    monkeypatch.setattr(pygame.display, "update", lambda rects: [shown.blit(screen, rect, rect) for rect in rects])
+
+    coins = [pygame.Rect(rng.randrange(300), rng.randrange(220), 12, 12) for _ in range(30)]
+    sprites = [pygame.Rect(rng.randrange(300), rng.randrange(220), 20, 20) for _ in range(4)]
+
+    def paint_background(surface):
+        surface.fill((255, 255, 255))
+        for coin in coins:
+            pygame.draw.rect(surface, (255, 200, 0), coin)
+
+    def draw_sprites(surface, add):
+        for i, sprite in enumerate(sprites):
+            add(pygame.draw.rect(surface, (60 * i, 0, 200), sprite))
+
+    renderer = DirtyRenderer(screen, paint_background)
+    expected = pygame.Surface(screen.get_size())
+    for frame in range(300):
+        for sprite in sprites:
+            # Mostly small steps, now and then a jump across the screen
+            step = 40 if rng.random() < 0.05 else 4
+            sprite.move_ip(rng.randint(-step, step), rng.randint(-step, step))
+            sprite.clamp_ip(screen.get_rect())
+        if coins and rng.random() < 0.1:
+            coin = coins.pop(rng.randrange(len(coins)))
+            renderer.repaint(coin)
+        renderer.begin()
+        draw_sprites(screen, renderer.add)
+        renderer.present()
+
+        paint_background(expected)
+        draw_sprites(expected, lambda rect: rect)
+        assert pygame.image.tobytes(shown, "RGB") == pygame.image.tobytes(expected, "RGB"), frame
+    assert renderer.full_updates < renderer.frames
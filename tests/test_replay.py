@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+import platformer_v2
+import replay
+
+
+def test_runs_round_trip_through_a_file(tmp_path):
+    rng = random.Random(0)
+    masks = []
+    for _ in range(60):
+        # Runs past 127 ticks need a second varint byte, past 16383 a third
+        masks += [rng.randrange(16)] * rng.choice([1, 2, 127, 128, 5000, 20000])
+    recorder = replay.Recorder(b"L" * 20, seed=7)
+    for mask in masks:
+        recorder.record(platformer_v2.REPLAY_INPUTS[mask])
+    path = str(tmp_path / "masks.replay")
+    recorder.save(path, b"C" * 20)
+
+    loaded = replay.load(path)
+    assert (loaded.level_hash, loaded.checksum, loaded.seed, loaded.ticks) == (b"L" * 20, b"C" * 20, 7, len(masks))
+    assert list(replay.iter_masks(loaded)) == masks
+
+
+def test_truncated_replay_is_rejected(tmp_path):
+    path = str(tmp_path / "short.replay")
+    recorder = replay.Recorder(b"L" * 20)
+    for mask in (1, 2, 4):
+        recorder.record(platformer_v2.REPLAY_INPUTS[mask])
+    recorder.save(path, b"C" * 20)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-1])
+    with pytest.raises(replay.ReplayError):
+        replay.load(path)
+
+
+def record_game(path, ticks=2000, checksum=None):
+    random.seed(3)
+    rng = random.Random(4)
+    state = platformer_v2.new_game()
+    recorder = replay.Recorder(state.level_hash, seed=3)
+    inputs = platformer_v2.NO_INPUT
+    for _ in range(ticks):
+        if rng.random() < 0.05:
+            inputs = platformer_v2.REPLAY_INPUTS[rng.randrange(8)]
+        recorder.record(inputs)
+        state, _ = platformer_v2.step(state, inputs)
+    recorder.save(path, checksum or platformer_v2.state_checksum(state))
+    return state
+
+
+def test_recorded_game_replays_to_the_same_state(tmp_path):
+    path = str(tmp_path / "game.replay")
+    recorded = record_game(path)
+    state, ok = platformer_v2.play_replay(path)
+    assert ok
+    assert (state.tick, state.score, state.player.x, state.player.y) == (
+        recorded.tick, recorded.score, recorded.player.x, recorded.player.y)
+
+
+def test_wrong_checksum_and_wrong_level_are_reported(tmp_path):
+    path = str(tmp_path / "game.replay")
+    record_game(path, checksum=b"\0" * 20)
+    assert not platformer_v2.play_replay(path)[1]
+    other_level = ([platformer_v2.Platform(0, 560, 800, 40)], [], [platformer_v2.Coin(700, 300)])
+    with pytest.raises(replay.ReplayError):
+        platformer_v2.play_replay(path, other_level)
@@ -0,0 +1,34 @@
+import pygame
+
+from scaled_display import ScaledDisplay, anchored, layout
+
+
+def rectwall_buttons(view):
+    """RectWall's buttons, placed as RectWall places them"""
+    return [anchored(view, (100, 100), left=50, bottom=320), anchored(view, (100, 100), left=250, bottom=320),
+            anchored(view, (100, 100), right=280, bottom=320), anchored(view, (100, 100), right=110, bottom=320)]
+
+
+def test_buttons_keep_their_spots_on_the_base_view_and_stay_on_other_shapes():
+    assert rectwall_buttons((1080, 1920)) == [(50, 1500, 100, 100), (250, 1500, 100, 100),
+                                              (700, 1500, 100, 100), (870, 1500, 100, 100)]
+    for panel in ((720, 1280), (1080, 2400), (1440, 1800), (1920, 1080), (2160, 3840)):
+        view, _, _ = layout(panel, (1080, 1920), 1.0)
+        assert view[0] >= 1080 and view[1] >= 1920
+        for button in rectwall_buttons(view):
+            assert pygame.Rect((0, 0), view).contains(button), (panel, button)
+
+
+def test_layout_keeps_the_panel_aspect_and_never_renders_more_than_it_has():
+    assert layout((1080, 1920), (1080, 1920), 1.0) == ((1080, 1920), 1.0, (1080, 1920))
+    assert layout((2160, 3840), (1080, 1920), 0.5) == ((1080, 1920), 0.5, (540, 960))
+    assert layout((1080, 2400), (1080, 1920), 1.0) == ((1080, 2400), 1.0, (1080, 2400))
+    assert layout((540, 960), (1080, 1920), 1.0) == ((1080, 1920), 0.5, (540, 960))
+
+
+def test_neighbouring_rects_still_meet_at_any_scale():
+    display = pygame.Surface((333, 592))
+    scaled = ScaledDisplay(display, render_scale=1.0)
+    left, right = scaled.rect((0, 0, 517, 10)), scaled.rect((517, 0, 300, 10))
+    assert left.right == right.left
+    assert scaled.to_logical(333, 592) == (1080, 1920)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from snake_env import DX, DY, SnakeEnv
+from snake_game import Snake
+
+
+def body_cells(env, board):
+    """Body of a board from tail to head, as cell numbers"""
+    length = env.lengths()[board]
+    return [int(env.body[board, (env.tail[board] + i) % env.cells]) for i in range(length)]
+
+
+def test_env_matches_snake_game_in_lockstep():
+    """Every board follows the rules of snake_game.Snake step for step, given the same food"""
+    width, height, count = 8, 6, 64
+    env = SnakeEnv(count, width, height, seed=3)
+    snakes = [Snake(width, height) for _ in range(count)]
+    scores = [0] * count
+    rng = np.random.default_rng(5)
+    finished = 0
+    for _ in range(600):
+        actions = rng.integers(0, 4, count)
+        food = env.food.copy()
+        rewards, dones = env.step(actions)
+        for b in range(count):
+            snake = snakes[b]
+            snake.change_direction((int(DX[actions[b]]), int(DY[actions[b]])))
+            alive = snake.move()
+            head = snake.positions[0]
+            ate = alive and head[1] * width + head[0] == food[b]
+            if ate:
+                snake.grow_snake()
+                scores[b] += 1
+            assert dones[b] == (not alive or (ate and not snake.board.free))
+            assert rewards[b] == (env.DEATH_REWARD if not alive else env.FOOD_REWARD if ate else 0.0)
+            if dones[b]:
+                assert env.last_score[b] == scores[b]
+                snakes[b] = Snake(width, height)
+                scores[b] = 0
+                finished += 1
+                continue
+            assert env.score[b] == scores[b]
+            assert (DX[env.direction[b]], DY[env.direction[b]]) == snake.direction
+            assert body_cells(env, b) == [y * width + x for x, y in reversed(snake.positions)]
+    assert finished > count
+
+
+def test_food_lands_on_a_free_cell():
+    env = SnakeEnv(256, 6, 4, seed=1)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        env.step(rng.integers(0, 4, 256))
+        on_board = env.food >= 0
+        assert (env.grid[env.boards[on_board], env.food[on_board]] == 0).all()
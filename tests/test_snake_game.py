@@ -0,0 +1,50 @@
+import random
+
+from snake_game import Board, Snake
+
+
+def assert_board_matches(snake):
+    board = snake.board
+    taken = set(snake.positions)
+    cells = {(x, y) for x in range(snake.width) for y in range(snake.height)}
+    assert len(taken) == len(snake.positions)
+    assert {(cell % board.width, cell // board.width) for cell in board.free} == cells - taken
+    assert all(board.slot[cell] == i for i, cell in enumerate(board.free))
+    assert all(position in board for position in taken)
+
+
+def test_board_mirrors_the_body_through_moves_and_growth():
+    rng = random.Random(0)
+    for game in range(20):
+        snake = Snake(7, 5)
+        while True:
+            snake.change_direction(rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)]))
+            if rng.random() < 0.2:
+                snake.grow_snake()
+            if not snake.move():
+                break
+            assert_board_matches(snake)
+            free = snake.board.random_free()
+            assert free is None or free not in snake.board
+
+
+def test_moving_into_the_tail_cell_is_a_collision():
+    # A 2x2 loop: the head would enter the cell the tail is about to leave
+    snake = Snake(4, 4)
+    for direction in ((0, 1), (-1, 0), (0, -1)):
+        snake.grow_snake()
+        snake.change_direction(direction)
+        assert snake.move()
+    assert len(snake.positions) == 4
+    snake.change_direction((1, 0))
+    assert not snake.move()
+
+
+def test_a_full_board_has_no_free_cell():
+    board = Board(3, 2)
+    for x in range(3):
+        for y in range(2):
+            board.occupy((x, y))
+    assert board.random_free() is None
+    board.release((1, 1))
+    assert board.random_free() == (1, 1)
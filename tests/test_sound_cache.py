@@ -0,0 +1,24 @@
+import numpy as np
+
+from sound_cache import SoundCache
+
+PARAMS = {'start_freq': 300, 'end_freq': 600, 'duration': 0.2}
+
+
+def render(params):
+    return np.full((10, 2), params['start_freq'], dtype=np.int16)
+
+
+def test_key_follows_render_parameters_and_rate(tmp_path):
+    cache = SoundCache(str(tmp_path))
+    assert cache.key("jump", PARAMS) == SoundCache(str(tmp_path)).key("jump", dict(PARAMS))
+    assert cache.key("jump", PARAMS) != cache.key("jump", dict(PARAMS, end_freq=700))
+    assert cache.key("jump", PARAMS) != SoundCache(str(tmp_path), sample_rate=44100).key("jump", PARAMS)
+
+
+def test_second_get_is_a_hit_with_the_same_samples(tmp_path):
+    cache = SoundCache(str(tmp_path))
+    first = cache.get("jump", PARAMS, render)
+    second = cache.get("jump", PARAMS, lambda params: None)
+    assert [hit for _, hit, _ in cache.timings] == [False, True]
+    assert np.array_equal(first, second)
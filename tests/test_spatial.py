@@ -0,0 +1,37 @@
+import random
+
+import pygame
+
+from spatial import SpatialHash
+
+
+def random_rects(rng, count):
+    return [pygame.Rect(rng.randrange(-500, 2000), rng.randrange(-500, 1000),
+                        rng.randrange(1, 300), rng.randrange(1, 120)) for _ in range(count)]
+
+
+def test_queries_match_a_linear_scan_in_insertion_order():
+    rng = random.Random(0)
+    rects = random_rects(rng, 400)
+    grid = SpatialHash(cell_size=64)
+    for rect in rects:
+        grid.insert(rect)
+    for area in random_rects(rng, 200):
+        assert grid.query_rect(area) == [rect for rect in rects if rect.colliderect(area)]
+    for _ in range(200):
+        x, y = rng.randrange(-500, 2200), rng.randrange(-500, 1100)
+        assert grid.query_point(x, y) == [rect for rect in rects if rect.collidepoint(x, y)]
+
+
+def test_moved_items_keep_their_order_and_leave_their_old_cells():
+    grid = SpatialHash(cell_size=64)
+    first, second = pygame.Rect(0, 0, 10, 10), pygame.Rect(500, 0, 10, 10)
+    grid.insert(first)
+    grid.insert(second)
+    second.x = 5
+    grid.move(second)
+    assert grid.query_rect(pygame.Rect(0, 0, 20, 20)) == [first, second]
+    assert grid.query_rect(pygame.Rect(490, 0, 40, 20)) == []
+    grid.remove(first)
+    assert grid.query_point(6, 6) == [second]
+    assert list(grid) == [second]
@@ -0,0 +1,63 @@
+import numpy as np
+
+import platformer_v2
+import synth
+
+
+def test_streamed_melody_matches_the_rendered_one():
+    melody, notes = platformer_v2.MUSIC['melody'], platformer_v2.MUSIC['notes']
+    blocks = list(synth.stream_melody(melody, notes, 1000, loop=False))
+    assert all(len(block) == 1000 for block in blocks[:-1])
+    assert np.array_equal(np.concatenate(blocks), synth.render_melody(melody, notes))
+
+
+# The per-sample loops platformer_v2 used before synth, for the claim that output is unchanged
+
+def loop_sweep(params, sample_rate=synth.SAMPLE_RATE):
+    frames = int(params['duration'] * sample_rate)
+    data = np.zeros(frames)
+    for i in range(frames):
+        freq = params['start_freq'] + (params['end_freq'] - params['start_freq']) * (i / frames)
+        data[i] = params['amplitude'] * np.sin(2 * np.pi * freq * i / sample_rate)
+        data[i] *= (1 - i / frames) * params['fade']
+    return data
+
+
+def loop_arpeggio(params, sample_rate=synth.SAMPLE_RATE):
+    frames = int(params['duration'] * sample_rate)
+    data = np.zeros(frames)
+    frequencies = params['frequencies']
+    for i, freq in enumerate(frequencies):
+        start_frame = i * frames // len(frequencies)
+        end_frame = (i + 1) * frames // len(frequencies)
+        for j in range(start_frame, end_frame):
+            data[j] = params['amplitude'] * np.sin(2 * np.pi * freq * j / sample_rate)
+            data[j] *= (1 - (j - start_frame) / (end_frame - start_frame) * params['fade_depth'])
+    return data
+
+
+def loop_tone(frequency, duration, sample_rate=synth.SAMPLE_RATE):
+    frames = int(duration * sample_rate)
+    data = np.zeros(frames)
+    for i in range(frames):
+        data[i] = 0.15 * np.sign(np.sin(2 * np.pi * frequency * i / sample_rate))
+    fade_frames = frames // 20
+    for i in range(fade_frames):
+        data[i] *= i / fade_frames
+        data[frames - 1 - i] *= i / fade_frames
+    return data
+
+
+def test_sound_effects_match_the_per_sample_loops():
+    for params, render, loop in ((platformer_v2.JUMP_SOUND, platformer_v2.render_sweep, loop_sweep),
+                                 (platformer_v2.DEATH_SOUND, platformer_v2.render_sweep, loop_sweep),
+                                 (platformer_v2.COIN_SOUND, platformer_v2.render_arpeggio, loop_arpeggio),
+                                 (platformer_v2.ENEMY_DEFEAT_SOUND, platformer_v2.render_arpeggio, loop_arpeggio)):
+        expected = synth.to_pcm(loop(params)).astype(np.int32)
+        assert np.abs(render(params).astype(np.int32) - expected).max() <= 1
+
+
+def test_melody_notes_match_the_per_sample_loop():
+    notes = platformer_v2.MUSIC['notes']
+    for note, duration in (('E5', 0.3), ('G4', 0.9), ('C4', 0.6)):
+        assert np.abs(synth.tone(notes[note], duration) - loop_tone(notes[note], duration)).max() < 1e-12
@@ -0,0 +1,28 @@
+import pygame
+
+from text_cache import FontRegistry, GlyphAtlas, TextCache
+
+
+def test_fonts_are_loaded_once_per_size():
+    fonts = FontRegistry()
+    assert fonts.get(24) is fonts.get(24)
+    assert fonts.get(24) is not fonts.get(36)
+
+
+def test_repeated_text_is_a_hit_and_the_oldest_is_evicted():
+    cache = TextCache(capacity=2)
+    score = cache.render("Score: 0", 36, (0, 0, 0))
+    assert cache.render("Score: 0", 36, (0, 0, 0)) is score
+    cache.render("Coins: 0/3", 36, (0, 0, 0))
+    cache.render("Score: 0", 36, (0, 0, 0))
+    cache.render("Score: 10", 36, (0, 0, 0))
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert list(cache.surfaces) == [("Score: 0", 36, (0, 0, 0), True, None), ("Score: 10", 36, (0, 0, 0), True, None)]
+
+
+def test_glyph_atlas_draws_text_as_wide_as_its_size():
+    atlas = GlyphAtlas(FontRegistry().get(18), (255, 255, 255))
+    screen = pygame.Surface((200, 40))
+    width, height = atlas.size("12.5 ms")
+    assert atlas.draw(screen, "12.5 ms", (10, 5)) == 10 + width
+    assert height == atlas.font.get_height()
@@ -0,0 +1,63 @@
+import random
+
+import pygame
+
+from touch_input import ActionInput
+
+SIZE = (400, 100)
+
+
+def finger(kind, finger_id, x, y):
+    return pygame.event.Event(kind, finger_id=finger_id, x=x / SIZE[0], y=y / SIZE[1], touch_id=0)
+
+
+def buttons():
+    actions = ActionInput(SIZE)
+    for i, action in enumerate(("left", "right", "jump", "fire")):
+        actions.add_control((i * 100, 0, 100, 100), action)
+    actions.bind_key(pygame.K_LEFT, "left")
+    return actions
+
+
+def test_a_sliding_finger_moves_its_action():
+    actions = buttons()
+    actions.handle(finger(pygame.FINGERDOWN, 1, 50, 50))
+    assert actions.held == {"left"}
+    actions.handle(finger(pygame.FINGERMOTION, 1, 150, 50))
+    assert actions.held == {"right"}
+    actions.handle(finger(pygame.FINGERUP, 1, 150, 50))
+    assert actions.held == set()
+
+
+def test_an_action_is_held_while_any_finger_or_key_is_on_it():
+    actions = buttons()
+    actions.handle(finger(pygame.FINGERDOWN, 1, 20, 50))
+    actions.handle(finger(pygame.FINGERDOWN, 2, 80, 50))
+    actions.handle(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LEFT))
+    actions.handle(finger(pygame.FINGERUP, 1, 20, 50))
+    actions.handle(finger(pygame.FINGERUP, 2, 80, 50))
+    assert actions.held == {"left"}
+    actions.handle(pygame.event.Event(pygame.WINDOWFOCUSLOST))
+    assert actions.held == set()
+    # The key is released somewhere else; its KEYUP is ignored
+    actions.handle(pygame.event.Event(pygame.KEYUP, key=pygame.K_LEFT))
+    assert actions.held == set()
+
+
+def test_held_set_matches_rebuilding_it_from_every_finger():
+    rng = random.Random(0)
+    actions = buttons()
+    down = {}
+    for _ in range(3000):
+        finger_id = rng.randrange(5)
+        x, y = rng.randrange(-50, 450), rng.randrange(-20, 120)
+        if finger_id in down and rng.random() < 0.3:
+            actions.handle(finger(pygame.FINGERUP, finger_id, x, y))
+            del down[finger_id]
+        else:
+            kind = pygame.FINGERMOTION if finger_id in down else pygame.FINGERDOWN
+            actions.handle(finger(kind, finger_id, x, y))
+            down[finger_id] = (x, y)
+        rebuilt = {("left", "right", "jump", "fire")[x // 100]
+                   for x, y in down.values() if 0 <= x < 400 and 0 <= y < 100}
+        assert actions.held == rebuilt
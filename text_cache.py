@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class FontRegistry:
+    """Fonts loaded once per (name, size) and shared by everyone"""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size, name=None):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+
+class GlyphAtlas:
+    """One pre-rendered surface per character, for counters that change every frame"""
+
+    def __init__(self, font, color, antialias=True, chars="0123456789/-:. "):
+        self.glyphs = {char: font.render(char, antialias, color) for char in chars}
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+
+    def glyph(self, char):
+        surface = self.glyphs.get(char)
+        if surface is None:
+            surface = self.glyphs[char] = self.font.render(char, self.antialias, self.color)
+        return surface
+
+    def size(self, text):
+        return sum(self.glyph(char).get_width() for char in text), self.font.get_height()
+
+    def draw(self, screen, text, position):
+        """Blit text glyph by glyph; returns the x just past the last glyph"""
+        x, y = position
+        for char in text:
+            surface = self.glyph(char)
+            screen.blit(surface, (x, y))
+            x += surface.get_width()
+        return x
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, size, color, antialias)"""
+
+    def __init__(self, fonts=None, capacity=256):
+        self.fonts = fonts or FontRegistry()
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, antialias=True, name=None):
+        key = (text, size, color, antialias, name)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size, name).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
@@ -0,0 +1,41 @@
+class FixedTimestep:
+    """Accumulator that turns variable frame times into a whole number of fixed ticks.
+
+    The frontend calls advance() with the real time of each frame and runs
+    steps() physics ticks; rendering rate and physics rate stay independent.
+    """
+
+    def __init__(self, rate=60, max_steps=5):
+        self.rate = rate
+        self.dt = 1 / rate
+        # Clamp long stalls (window drags, loading) instead of spiralling to catch up
+        self.max_frame_time = self.dt * max_steps
+        self.accumulator = 0.0
+
+    def advance(self, seconds):
+        self.accumulator += min(seconds, self.max_frame_time)
+
+    def steps(self):
+        """Number of ticks due; consumes them from the accumulator"""
+        count = int(self.accumulator // self.dt)
+        self.accumulator -= count * self.dt
+        return count
+
+    @property
+    def alpha(self):
+        """Fraction of a tick left over, for blending between physics states"""
+        return self.accumulator / self.dt
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+def lerp(previous, current, alpha, snap=None):
+    """previous moved alpha of the way to current, for drawing between two ticks.
+
+    A move longer than snap (a respawn, say) is a jump, not motion, and is
+    drawn where it ended. Works on NumPy arrays when snap is None.
+    """
+    if snap is not None and abs(current - previous) > snap:
+        return current
+    return previous + (current - previous) * alpha
@@ -0,0 +1,144 @@
+"""Held actions from keys and on-screen touch controls.
+
+Controls are rects bound to an action name, kept in a SpatialHash, so a
+touch finds its control with one bucket lookup however many controls there
+are. Each finger remembers the control it is on, so lifting it, or sliding
+it onto another control, only touches that finger's entry. A bound key is
+one more holder of its action, so the game reads a single set of held
+actions whatever they come from.
+
+Latency is measured per event, from the moment handle() sees it to the
+frame_presented() call after the next flip, i.e. until its effect is on
+screen. Time spent in the SDL queue before pygame.event.get() is not seen.
+"""
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+from spatial import SpatialHash
+
+
+class Control:
+    __slots__ = ("rect", "action")
+
+    def __init__(self, rect, action):
+        self.rect = pygame.Rect(rect)
+        self.action = action
+
+
+class ActionInput:
+    """Which actions are held, kept up to date one event at a time.
+
+    held is the set of actions with at least one finger or key on them.
+    size is the surface touch positions are scaled to.
+    """
+
+    def __init__(self, size, cell_size=128, latency_window=1000):
+        self.size = size
+        self.controls = SpatialHash(cell_size)
+        self.keymap = {}
+        self.fingers = {}
+        self.keys = set()
+        self.holders = {}
+        self.held = set()
+        self.pending = []
+        self.latencies = deque(maxlen=latency_window)
+        self.events = 0
+
+    def add_control(self, rect, action):
+        """Control for action over rect; where controls overlap, the one added last is on top"""
+        control = Control(rect, action)
+        self.controls.insert(control)
+        return control
+
+    def remove_control(self, control):
+        for finger, on in list(self.fingers.items()):
+            if on is control:
+                self.fingers[finger] = None
+                self.release(control.action)
+        self.controls.remove(control)
+
+    def bind_key(self, key, action):
+        self.keymap[key] = action
+
+    def hit(self, x, y):
+        """Topmost control under (x, y) in surface pixels, or None"""
+        controls = self.controls.query_point(x, y)
+        return controls[-1] if controls else None
+
+    def position(self, event):
+        """Touch position in surface pixels; finger events are normalised to 0..1"""
+        return event.x * self.size[0], event.y * self.size[1]
+
+    def press(self, action):
+        count = self.holders.get(action, 0)
+        self.holders[action] = count + 1
+        if not count:
+            self.held.add(action)
+
+    def release(self, action):
+        count = self.holders[action] - 1
+        self.holders[action] = count
+        if not count:
+            self.held.discard(action)
+
+    def handle(self, event):
+        """Update the held actions from event; True if it was an input event"""
+        kind = event.type
+        if kind == pygame.FINGERDOWN or kind == pygame.FINGERMOTION:
+            # A finger that slides off one control and onto another moves its action with it
+            control = self.hit(*self.position(event))
+            old = self.fingers.get(event.finger_id)
+            if control is not old:
+                if old is not None:
+                    self.release(old.action)
+                if control is not None:
+                    self.press(control.action)
+            self.fingers[event.finger_id] = control
+        elif kind == pygame.FINGERUP:
+            control = self.fingers.pop(event.finger_id, None)
+            if control is not None:
+                self.release(control.action)
+        elif kind == pygame.KEYDOWN:
+            action = self.keymap.get(event.key)
+            if action is None or event.key in self.keys:
+                return False
+            self.keys.add(event.key)
+            self.press(action)
+        elif kind == pygame.KEYUP:
+            if event.key not in self.keys:
+                return False
+            self.keys.discard(event.key)
+            self.release(self.keymap[event.key])
+        elif kind == pygame.WINDOWFOCUSLOST:
+            # Key releases go to whichever window has focus now
+            for key in self.keys:
+                self.release(self.keymap[key])
+            self.keys.clear()
+            return False
+        else:
+            return False
+        self.events += 1
+        self.pending.append(time.perf_counter())
+        return True
+
+    def frame_presented(self):
+        """Call after each flip: every event handled since the last one is now on screen"""
+        if self.pending:
+            now = time.perf_counter()
+            self.latencies.extend(now - handled for handled in self.pending)
+            self.pending.clear()
+
+    def latency_stats(self):
+        """(mean, 95th percentile, max) event-to-screen latency in seconds"""
+        if not self.latencies:
+            return (0.0,) * 3
+        values = np.fromiter(self.latencies, dtype=np.float64)
+        return float(values.mean()), float(np.percentile(values, 95)), float(values.max())
+
+    def report(self):
+        mean, p95, worst = self.latency_stats()
+        print(f"Input: {self.events} events, {len(self.controls)} controls; latency to screen "
+              f"mean {mean * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms, max {worst * 1000:.2f} ms")